@@ -1,5 +1,3 @@
-from pathlib import Path
-from typing import Any
 from app_model.types import (
     KeyBindingRule,
     KeyCode,
@@ -9,12 +7,8 @@ from app_model.types import (
 )
 from himena.consts import StandardTypes, MenuId
 from himena.widgets import MainWindow
-from himena.io import get_readers, get_writers, ReaderTuple
-from himena.types import (
-    ClipboardDataModel,
-    WidgetDataModel,
-    ReaderFunction,
-)
+from himena.io import get_readers, get_writers, _read_and_update_source
+from himena.types import ClipboardDataModel, WidgetDataModel
 from himena._app_model._context import AppContext as _ctx
 from himena._app_model.actions._registry import ACTIONS, SUBMENUS
 
@@ -28,14 +22,6 @@ SAVE_SCR_SHOT = "01_save-screenshot"
 EXIT_GROUP = "99_exit"
 
 
-def _read_and_update_source(reader: ReaderTuple, source: Path) -> WidgetDataModel:
-    """Update the `method` attribute if it is not set."""
-    model = reader.read(source)
-    if model.method is None:
-        model = model._with_source(source=source, plugin=reader.plugin)
-    return model
-
-
 @ACTIONS.append_from_fn(
     id="open-file",
     title="Open File(s) ...",
@@ -46,22 +32,13 @@ def _read_and_update_source(reader: ReaderTuple, source: Path) -> WidgetDataMode
     ],
     keybindings=[StandardKeyBinding.Open],
 )
-def open_file_from_dialog(ui: MainWindow) -> list[WidgetDataModel]:
+def open_file_from_dialog(ui: MainWindow) -> None:
     """Open file(s). Multiple files will be opened as separate sub-windows."""
     file_paths = ui.exec_file_dialog(mode="rm")
     if file_paths is None or len(file_paths) == 0:
         return None
-    reader_path_sets: list[tuple[ReaderFunction, Any]] = []
-    for file_path in file_paths:
-        readers_matched = get_readers(file_path)
-        reader_path_sets.append((readers_matched[0], file_path))
-    out = [
-        _read_and_update_source(reader, file_path)
-        for reader, file_path in reader_path_sets
-    ]
-    ui._recent_manager.append_recent_files(file_paths)
-    ui._recent_manager.update_menu()
-    return out
+    ui.read_files_async(file_paths)
+    return None
 
 
 @ACTIONS.append_from_fn(
@@ -100,9 +77,8 @@ def save_from_dialog(ui: MainWindow) -> None:
     """Save (overwrite) the current sub-window as a file."""
     fd, sub_win = ui._provide_file_output()
     if save_path := sub_win.save_behavior.get_save_path(ui, fd):
-        writers = get_writers(fd)
-        writers[0](fd, save_path)  # run save function
-        sub_win.update_default_save_path(save_path)
+        get_writers(fd)  # check writer exists before starting the job
+        ui._save_models_async([(sub_win, fd, save_path)])
     return None
 
 
@@ -118,9 +94,29 @@ def save_as_from_dialog(ui: MainWindow) -> None:
     """Save the current sub-window as a new file."""
     fd, sub_win = ui._provide_file_output()
     if save_path := sub_win.save_behavior.get_save_path(ui, fd):
-        writers = get_writers(fd)
-        writers[0](fd, save_path)
-        sub_win.update_default_save_path(save_path)
+        get_writers(fd)
+        ui._save_models_async([(sub_win, fd, save_path)])
+    return None
+
+
+@ACTIONS.append_from_fn(
+    id="save-all",
+    title="Save All Modified",
+    menus=[{"id": MenuId.FILE, "group": WRITE_GROUP}],
+    enablement=_ctx.num_sub_windows > 0,
+)
+def save_all_modified(ui: MainWindow) -> None:
+    """Save all the modified sub-windows in parallel."""
+    items = []
+    for sub_win in ui.iter_windows():
+        if not (sub_win.is_exportable and sub_win.is_modified):
+            continue
+        fd = sub_win.to_model()
+        if save_path := sub_win.save_behavior.get_save_path(ui, fd):
+            get_writers(fd)
+            items.append((sub_win, fd, save_path))
+    if items:
+        ui._save_models_async(items)
     return None
 
 
@@ -30,7 +30,7 @@ class LocalReaderMethod(MethodDescriptor):
     def get_model(self, app: "Application") -> "WidgetDataModel[Any]":
         """Get model by importing the reader plugin and actually read the file(s)."""
         from importlib import import_module
-        from himena.io import PluginInfo
+        from himena.io import PluginInfo, ReaderTuple, _read_and_update_source
         from himena.types import WidgetDataModel
 
         if self.plugin is None:
@@ -40,14 +40,10 @@ class LocalReaderMethod(MethodDescriptor):
         mod = import_module(mod_name)
         reader_provider = getattr(mod, func_name)
         reader = reader_provider(self.path)
-        model = reader(self.path)
+        plugin = PluginInfo(module=mod_name, name=func_name)
+        model = _read_and_update_source(ReaderTuple(reader, 0, plugin), self.path)
         if not isinstance(model, WidgetDataModel):
             raise ValueError(f"Expected to return a WidgetDataModel but got {model}")
-        if model.method is None:
-            model = model._with_source(
-                source=self.path,
-                plugin=PluginInfo(module=mod_name, name=func_name),
-            )
         return model
 
 
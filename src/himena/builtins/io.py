@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import itertools
+import math
 from pathlib import Path
-from typing import TYPE_CHECKING
-from himena.io import register_writer_provider
-from himena.types import WidgetDataModel
+from typing import Iterator, Sequence, TYPE_CHECKING
+from himena.io import register_incremental_writer, register_writer_provider
+from himena.types import (
+    FileStamp,
+    LazyValue,
+    ReaderChunk,
+    ReaderMetadata,
+    TableChanges,
+    TableMeta,
+    WidgetDataModel,
+)
 from himena.consts import StandardTypes, BasicTextFileTypes, ConventionalTextFileNames
 from himena import register_reader_provider
 
@@ -11,14 +21,17 @@ if TYPE_CHECKING:
     import numpy as np
 
 
-def _read_text(file_path: Path) -> WidgetDataModel:
+_TEXT_CHUNK_SIZE_HINT = 1 << 20  # characters
+_TABLE_CHUNK_ROWS = 10000
+
+
+def _read_text(file_path: Path) -> Iterator[ReaderChunk]:
     """Read text file."""
     with open(file_path) as f:
-        return WidgetDataModel(
-            value=f.read(),
-            type=StandardTypes.TEXT,
-            source=Path(file_path),
-        )
+        lines = f.readlines(_TEXT_CHUNK_SIZE_HINT)
+        yield ReaderChunk("".join(lines), type=StandardTypes.TEXT)
+        while lines := f.readlines(_TEXT_CHUNK_SIZE_HINT):
+            yield ReaderChunk("".join(lines), type=StandardTypes.TEXT)
 
 
 def _read_simple_image(file_path: Path) -> WidgetDataModel:
@@ -34,35 +47,280 @@ def _read_simple_image(file_path: Path) -> WidgetDataModel:
     )
 
 
-def _read_csv(file_path: Path) -> WidgetDataModel:
-    """Read CSV file."""
-    import csv
+def _iter_table_chunks(
+    file_path: Path,
+    delimiter: str,
+) -> Iterator[ReaderChunk | ReaderMetadata]:
+    """
+    Read a delimited text file as chunks of columns.
 
-    with open(file_path) as f:
-        reader = csv.reader(f)
-        data = list(reader)
+    Each chunk is a dict of column names to arrays. Column types (int, float, bool or
+    str) are inferred from the first chunk and kept in the following chunks as long
+    as the values can be parsed, except that integers may become floats. Blank lines
+    are skipped.
+    """
+    import csv
+    import numpy as np
 
-    return WidgetDataModel(
-        value=data,
-        type=StandardTypes.TABLE,
+    source = FileStamp.of(file_path)
+    has_header = _sniff_csv_header(file_path)
+    yield ReaderMetadata(
+        extension_default=file_path.suffix,
+        additional_data=TableMeta(header=has_header, source=source),
     )
+    with open(file_path, newline="") as f:
+        header = next(csv.reader([f.readline()], delimiter=delimiter), [])
+        if not has_header:
+            f.seek(0)
+            header = []
+        dtypes: list[np.dtype] = []
+        n_chunks = 0
+        # lines without quotes are split by str methods, which is much faster than
+        # csv.reader. Once a quote is found, the rest of the file is parsed by
+        # csv.reader to correctly handle quoted delimiters and line breaks.
+        rows_iter: Iterator[list[str]] | None = None
+        while True:
+            if rows_iter is None:
+                if not (lines := list(itertools.islice(f, _TABLE_CHUNK_ROWS))):
+                    break
+                if '"' in (block := "".join(lines)):
+                    rows_iter = filter(
+                        None, csv.reader(itertools.chain(lines, f), delimiter=delimiter)
+                    )
+                    continue
+                if (columns := _split_columns(block, delimiter)) is None:
+                    rows = filter(None, csv.reader(lines, delimiter=delimiter))
+                    columns = list(itertools.zip_longest(*rows, fillvalue=""))
+                if not columns:
+                    continue  # only blank lines
+            else:
+                if not (rows := list(itertools.islice(rows_iter, _TABLE_CHUNK_ROWS))):
+                    break
+                columns = list(itertools.zip_longest(*rows, fillvalue=""))
+            arrays = [
+                _parse_column(column, dtypes[i] if i < len(dtypes) else None)
+                for i, column in enumerate(columns)
+            ]
+            dtypes[len(dtypes) :] = [arr.dtype for arr in arrays[len(dtypes) :]]
+            names = _column_names(header, len(arrays))
+            yield ReaderChunk(dict(zip(names, arrays)), type=StandardTypes.TABLE)
+            n_chunks += 1
+        if n_chunks == 0:
+            names = _column_names(header, len(header))
+            yield ReaderChunk(
+                {name: np.array([], dtype=np.str_) for name in names},
+                type=StandardTypes.TABLE,
+            )
 
 
-def _read_tsv(file_path: Path) -> WidgetDataModel:
-    """Read TSV file."""
+def _split_columns(block: str, delimiter: str) -> list[list[str]] | None:
+    """
+    Split lines into columns, or return None if the number of cells differs.
+
+    Lines are split at the same line breaks as csv.reader, and blank lines are skipped.
+    """
+    lines = block.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lines[-1] == "":
+        lines.pop()  # the last line was terminated
+    if "" in lines:
+        lines = list(filter(None, lines))
+    if not lines:
+        return []
+    counts = set(map(str.count, lines, itertools.repeat(delimiter)))
+    if len(counts) != 1:
+        return None
+    ncols = counts.pop() + 1
+    cells = delimiter.join(lines).split(delimiter)
+    return [cells[i::ncols] for i in range(ncols)]
+
+
+def _sniff_csv_header(file_path: Path) -> bool:
     import csv
+    from himena.io import read_header
 
-    with open(file_path) as f:
-        reader = csv.reader(f, delimiter="\t")
-        data = list(reader)
+    sample = read_header(file_path).decode("utf-8", errors="ignore")
+    if (last := sample.rfind("\n")) > 0:
+        sample = sample[:last]  # the last line may be incomplete
+    try:
+        return csv.Sniffer().has_header(sample)
+    except csv.Error:
+        return False
+
+
+def _column_names(header: list[str], ncols: int) -> list[str]:
+    names: list[str] = []
+    for i in range(max(ncols, len(header))):
+        name = header[i] if i < len(header) else ""
+        if name == "" or name in names:
+            name = f"{name}_{i}" if name else str(i)
+        names.append(name)
+    return names
+
+
+def _parse_column(values: Sequence[str], dtype: np.dtype | None) -> np.ndarray:
+    """
+    Convert a column of strings to an array of the given or inferred dtype.
+
+    Each type is tried by converting the whole column at once, and the column is kept
+    as strings if none of them applies. The original text of the numbers is not kept,
+    as the rows that were not edited are copied from the file when the table is saved
+    (see `_write_csv`).
+    """
+    import numpy as np
+
+    if dtype is None:
+        kinds = "ifb"
+    elif dtype.kind == "i":
+        kinds = "if"  # such as empty cells in the following chunks
+    elif dtype.kind in "fb":
+        kinds = dtype.kind
+    else:
+        kinds = ""
+    for kind in kinds:
+        try:
+            if kind == "i":
+                return np.array(values, dtype=np.int64)
+            elif kind == "f":
+                return _parse_float_column(values)
+            elif kind == "b":
+                if set(values) <= {"True", "False"} and (len(values) > 0 or dtype):
+                    return np.array(values) == "True"
+        except (ValueError, OverflowError):
+            pass
+    return np.array(values, dtype=np.str_)
+
+
+def _parse_float_column(values: Sequence[str]) -> np.ndarray:
+    import numpy as np
+
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        if "" not in values:
+            raise
+    # empty cells are parsed as NaN, unless all the cells are empty
+    strings = np.array(values, dtype=np.str_)
+    if (empty := strings == "").all():
+        raise ValueError("All the values are empty.")
+    return np.where(empty, "nan", strings).astype(np.float64)
+
+
+def _read_csv(file_path: Path) -> Iterator[ReaderChunk | ReaderMetadata]:
+    """Read CSV file."""
+    yield from _iter_table_chunks(file_path, delimiter=",")
+
+
+def _read_tsv(file_path: Path) -> Iterator[ReaderChunk | ReaderMetadata]:
+    """Read TSV file."""
+    yield from _iter_table_chunks(file_path, delimiter="\t")
 
+
+def _array_model(value, extension: str) -> WidgetDataModel:
+    """Data model of an array, as a table if 1D or structured, otherwise an image."""
+    if value.dtype.names is not None and value.ndim == 1:
+        # columns of a structured array are views of the original array
+        value = {name: value[name] for name in value.dtype.names}
+        typ = StandardTypes.TABLE
+    elif value.ndim == 1:
+        typ = StandardTypes.TABLE
+    else:
+        typ = StandardTypes.IMAGE
     return WidgetDataModel(
-        value=data,
-        type=StandardTypes.TABLE,
+        value=value,
+        type=typ,
+        extension_default=extension,
+        extensions=[".npy", ".npz"],
     )
 
 
-@register_reader_provider
+def _read_npy(file_path: Path) -> WidgetDataModel:
+    """Read NPY file as a memory-mapped array."""
+    import numpy as np
+
+    return _array_model(np.load(file_path, mmap_mode="r"), ".npy")
+
+
+def _read_npz(file_path: Path) -> WidgetDataModel:
+    """Read NPZ file. Each array is loaded when it is accessed."""
+    members = {
+        name: LazyValue(
+            _NpzMemberLoader(file_path, name),
+            shape=shape,
+            dtype=dtype,
+            nbytes=None if shape is None else math.prod(shape) * dtype.itemsize,
+        )
+        for name, (shape, dtype) in _npz_member_headers(file_path).items()
+    }
+    if len(members) == 0:
+        raise ValueError(f"{file_path.name} does not contain any array.")
+    if len(members) == 1:
+        (value,) = members.values()
+        if value.shape is None:
+            value = value.compute()
+        return _array_model(value, ".npz")
+    if all(member.ndim == 1 for member in members.values()):
+        # same as a table of columns
+        if len({member.shape for member in members.values()}) == 1:
+            return WidgetDataModel(
+                value=members,
+                type=StandardTypes.TABLE,
+                extension_default=".npz",
+                extensions=[".npz"],
+            )
+    raise ValueError(
+        f"{file_path.name} contains multiple arrays that cannot be shown as a table. "
+        f"Arrays: {list(members)}"
+    )
+
+
+class _NpzMemberLoader:
+    def __init__(self, path: Path, name: str):
+        self._path = path
+        self._name = name
+
+    def __call__(self):
+        import numpy as np
+
+        with np.load(self._path) as npz:
+            return npz[self._name]
+
+
+def _npz_member_headers(file_path: Path) -> dict[str, tuple[tuple | None, np.dtype]]:
+    """Read the shapes and dtypes of the NPZ members without loading the arrays."""
+    import zipfile
+    from numpy.lib import format as npformat
+
+    out = {}
+    with zipfile.ZipFile(file_path) as zf:
+        for info in zf.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            name = info.filename[:-4]
+            with zf.open(info) as f:
+                version = npformat.read_magic(f)
+                if version == (1, 0):
+                    shape, _, dtype = npformat.read_array_header_1_0(f)
+                elif version == (2, 0):
+                    shape, _, dtype = npformat.read_array_header_2_0(f)
+                else:  # shape will be determined after loading
+                    shape, dtype = None, None
+            out[name] = (shape, dtype)
+    return out
+
+
+@register_reader_provider(
+    suffixes=[
+        *BasicTextFileTypes,
+        ".csv",
+        ".tsv",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".npy",
+        ".npz",
+        *ConventionalTextFileNames,
+    ]
+)
 def default_reader_provider(file_path: Path | list[Path]):
     """Get default reader."""
     if isinstance(file_path, list):
@@ -75,6 +333,10 @@ def default_reader_provider(file_path: Path | list[Path]):
         return _read_tsv
     elif file_path.suffix in {".png", ".jpg", ".jpeg"}:
         return _read_simple_image
+    elif file_path.suffix == ".npy":
+        return _read_npy
+    elif file_path.suffix == ".npz":
+        return _read_npz
     elif file_path.name in ConventionalTextFileNames:
         return _read_text
     return None
@@ -88,22 +350,218 @@ def _write_text(model: WidgetDataModel[str], path: Path) -> None:
 
 
 def _write_csv(model: WidgetDataModel[list[list[str]]], path: Path) -> None:
-    """Write CSV file."""
+    """
+    Write CSV file.
+
+    If the columns were not changed and the file the table was last read from or
+    saved to was not changed since, the saved rows that were not edited are copied
+    from that file as they are, so that the text of the numbers, quotes and blank
+    lines are kept. Only the edited and new rows are formatted.
+    """
     import csv
 
-    with open(path, "w") as f:
-        writer = csv.writer(f)
-        writer.writerows(model.value)
+    if path.suffix in (".npy", ".npz"):
+        return _write_array(model, path)
+    value = model.value
+    meta = model.additional_data
+    has_header = isinstance(value, dict) and (
+        not isinstance(meta, TableMeta) or meta.header
+    )
+    delimiter = _csv_delimiter(path)
+    with open(path, "w", newline="") as f:
+        if (
+            isinstance(meta, TableMeta)
+            and (changes := meta.changes) is not None
+            and not changes.structure_changed
+            and changes.nrows_saved > 0
+            and (saved := changes.saved_file) is not None
+            and _csv_delimiter(saved.path) == delimiter
+            and saved.matches(saved.path)
+        ):
+            with open(saved.path, newline="") as src:
+                terminator = _line_terminator(src.readline())
+                src.seek(0)
+                writer = csv.writer(f, delimiter=delimiter, lineterminator=terminator)
+                if has_header:
+                    f.write(src.readline())
+                terminated = _copy_saved_rows(src, f, writer, value, changes)
+            if _table_nrows(value) > changes.nrows_saved:
+                if not terminated:
+                    f.write(terminator)  # the last line was not terminated
+                writer.writerows(_csv_rows(value, changes.nrows_saved))
+        else:
+            writer = csv.writer(f, delimiter=delimiter)
+            if has_header:
+                writer.writerow(value.keys())
+            writer.writerows(_csv_rows(value))
+    return None
+
+
+def _copy_saved_rows(src, dst, writer, value, changes: TableChanges) -> bool:
+    """
+    Copy the saved rows of a CSV file from `src` to `dst`, rewriting the edited rows.
+
+    Blank lines are copied as they are. Return False if the last line copied from
+    `src` was not terminated.
+    """
+    edited = iter(changes.edited_rows)
+    start, stop = next(edited, (-1, -1))
+    rows: Iterator = iter(())
+    row = 0
+    terminated = True
+    for text, is_row in _iter_records(src, writer.dialect.delimiter):
+        if is_row and start <= row < stop:
+            if row == start:
+                rows = _csv_rows(value, start, stop)
+            writer.writerow(next(rows))
+            terminated = True
+        else:
+            dst.write(text)
+            terminated = text.endswith(("\n", "\r"))
+        if is_row:
+            row += 1
+            if row == stop:
+                start, stop = next(edited, (-1, -1))
+    if row != changes.nrows_saved:
+        raise ValueError(f"Expected {changes.nrows_saved} rows in the file, got {row}.")
+    return terminated
+
+
+def _iter_records(f, delimiter: str) -> Iterator[tuple[str, bool]]:
+    """
+    Iterate over the text of the records of a CSV file and whether each is a row.
+
+    csv.reader takes the lines of one record at a time, so the records are the same
+    as the rows read by `_iter_table_chunks`. Blank lines are not rows.
+    """
+    import csv
+
+    lines: list[str] = []
+
+    def _recorded_lines():
+        for line in f:
+            lines.append(line)
+            yield line
+
+    for cells in csv.reader(_recorded_lines(), delimiter=delimiter):
+        yield "".join(lines), bool(cells)
+        lines.clear()
+
+
+def _line_terminator(line: str) -> str:
+    """The line terminator of the line, or the default of csv.writer if none."""
+    for terminator in ("\r\n", "\n", "\r"):
+        if line.endswith(terminator):
+            return terminator
+    return "\r\n"
+
+
+@register_incremental_writer(_write_csv)
+def _append_csv(model: WidgetDataModel, path: Path) -> bool:
+    """
+    Append the rows added after the last save to the end of the CSV file.
+
+    Rows of a CSV file have variable length, so the file is updated in place only if
+    rows were appended and none of the saved rows or columns were changed. The file
+    must also be the one the table was last read from or saved to, with the same size
+    and modification time, otherwise it may have other content.
+    """
+    import csv
+
+    meta = model.additional_data
+    if (
+        path.suffix in (".npy", ".npz")
+        or not isinstance(meta, TableMeta)
+        or (changes := meta.changes) is None
+        or not changes.is_append_only()
+        or (nsaved := changes.nrows_saved) == 0
+        or changes.saved_file is None
+        or not changes.saved_file.matches(path)
+        or _table_nrows(value := model.value) < nsaved
+    ):
+        return False
+    with open(path, "rb") as f:
+        f.seek(max(f.seek(0, 2) - 2, 0))
+        tail = f.read().decode("latin-1")
+    terminator = _line_terminator(tail)
+    with open(path, "a", newline="") as f:
+        if not tail.endswith(("\n", "\r")):
+            f.write(terminator)  # the last line was not terminated
+        delimiter = _csv_delimiter(path)
+        writer = csv.writer(f, delimiter=delimiter, lineterminator=terminator)
+        writer.writerows(_csv_rows(value, nsaved))
+    return True
+
+
+def _csv_delimiter(path: Path) -> str:
+    return "\t" if path.suffix == ".tsv" else ","
+
+
+def _table_nrows(value) -> int:
+    if isinstance(value, dict):
+        return max((len(column) for column in value.values()), default=0)
+    return len(value)
+
+
+def _csv_rows(value, start: int = 0, stop: int | None = None) -> Iterator:
+    """Iterate over the rows of a table value as lists of cells."""
+    if isinstance(value, dict):
+        columns = [_column_to_list(column[start:stop]) for column in value.values()]
+        return zip(*columns)
+    elif (ndim := getattr(value, "ndim", None)) == 1:
+        return ([each] for each in _column_to_list(value[start:stop]))
+    elif ndim == 2:
+        return map(_column_to_list, value[start:stop])
+    return iter(value[start:stop])
+
+
+def _column_to_list(column) -> list:
+    import numpy as np
+
+    column = np.asarray(column)
+    if column.dtype.kind == "f" and (isnan := np.isnan(column)).any():
+        # NaN is written as an empty cell, as it is read
+        column = column.astype(object)
+        column[isnan] = ""
+    # tolist() converts numpy scalars to Python objects at once
+    return column.tolist()
 
 
 def _write_image(model: WidgetDataModel[np.ndarray], path: Path) -> None:
     """Write image file."""
     from PIL import Image
 
+    if path.suffix in (".npy", ".npz"):
+        return _write_array(model, path)
     Image.fromarray(model.value).save(path)
     return None
 
 
+def _write_array(model: WidgetDataModel, path: Path) -> None:
+    """Write NPY or NPZ file."""
+    import numpy as np
+
+    value = model.raw_value
+    if path.suffix == ".npz":
+        if isinstance(value, dict):
+            np.savez(path, **{k: np.asarray(v) for k, v in value.items()})
+        else:
+            np.savez(path, np.asarray(value))
+    elif isinstance(value, dict):
+        # columns are saved as a structured array
+        columns = {k: np.asarray(v) for k, v in value.items()}
+        arr = np.empty(
+            len(next(iter(columns.values()), ())),
+            dtype=[(k, v.dtype) for k, v in columns.items()],
+        )
+        for k, v in columns.items():
+            arr[k] = v
+        np.save(path, arr)
+    else:
+        np.save(path, np.asarray(value))
+    return None
+
+
 @register_writer_provider
 def default_writer_provider(model: WidgetDataModel):
     """Get default writer."""
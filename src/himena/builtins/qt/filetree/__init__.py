@@ -17,5 +17,5 @@ def make_file_tree_widget(ui):
     from himena.builtins.qt.filetree._widget import QWorkspaceWidget
 
     filetree = QWorkspaceWidget()
-    filetree.fileDoubleClicked.connect(ui.read_file)
+    filetree.fileDoubleClicked.connect(ui.read_file_async)
     return filetree
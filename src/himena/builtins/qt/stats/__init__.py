@@ -0,0 +1,23 @@
+"""Builtin column statistics plugin."""
+
+from himena.plugins import get_plugin_interface
+
+__himena_plugin__ = get_plugin_interface("tools")
+
+
+@__himena_plugin__.register_dock_widget(
+    title="Column statistics",
+    area="right",
+    keybindings=["Ctrl+Shift+T"],
+    singleton=True,
+    command_id="builtins:column-stats",
+)
+def install_column_stats(ui):
+    """Statistics of the columns of the current table."""
+    from himena.builtins.qt.stats._widget import QColumnStatsWidget
+
+    widget = QColumnStatsWidget()
+    ui.events.window_activated.connect(widget.set_window)
+    if (win := ui.current_window) is not None:
+        widget.set_window(win)
+    return widget
@@ -0,0 +1,262 @@
+"""
+Per-column statistics computed block by block.
+
+Statistics of each block of rows are cached, so that only the blocks containing
+edited or appended rows are scanned again. The statistics of blocks are mergeable:
+mean and variance are combined with the parallel algorithm, and the number of unique
+values is counted with a "k minimum values" sketch of the hashes of the values.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+import numpy as np
+
+BLOCK_ROWS = 1 << 16
+HIST_BINS = 32
+SKETCH_SIZE = 1024  # unique count is exact below this number
+
+
+class BlockStats(NamedTuple):
+    """Statistics of a block of rows."""
+
+    size: int
+    nulls: int
+    min: float
+    max: float
+    mean: float
+    m2: float  # sum of squared differences from the mean
+    sketch: np.ndarray  # smallest hashes of the unique values
+    hist: np.ndarray | None = None
+    hist_range: tuple[float, float] | None = None
+
+
+class ColumnStats(NamedTuple):
+    """Statistics of a column. Numeric fields are None for non-numeric columns."""
+
+    count: int
+    nulls: int
+    min: float | None
+    max: float | None
+    mean: float | None
+    std: float | None  # sample standard deviation
+    unique: int
+    unique_exact: bool
+    hist: np.ndarray | None
+    hist_range: tuple[float, float] | None
+
+
+def is_numeric(values: np.ndarray) -> bool:
+    return values.dtype.kind in "biuf"
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    # finalizer of splitmix64, to spread similar values over the whole range
+    with np.errstate(over="ignore"):
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return h ^ (h >> np.uint64(31))
+
+
+def _hash_values(values: np.ndarray) -> np.ndarray:
+    """64-bit hashes of the values as an unsigned integer array."""
+    kind = values.dtype.kind
+    if kind == "f":
+        # +0.0 and -0.0 are the same value
+        bits = (values.astype(np.float64) + 0.0).view(np.uint64)
+    elif kind in "biu":
+        bits = values.astype(np.int64).view(np.uint64)
+    else:
+        hashes = map(hash, values.tolist())
+        bits = np.fromiter(hashes, dtype=np.int64, count=values.size).view(np.uint64)
+    return _mix64(bits)
+
+
+def _null_mask(values: np.ndarray) -> np.ndarray:
+    kind = values.dtype.kind
+    if kind == "f":
+        return np.isnan(values)
+    if kind in "biu":
+        return np.zeros(values.shape, dtype=bool)
+    if kind == "O":
+        return np.equal(values, None) | np.equal(values, "")
+    return values == values.dtype.type()
+
+
+def _histogram(values: np.ndarray, hist_range: tuple[float, float]) -> np.ndarray:
+    return np.histogram(values, bins=HIST_BINS, range=hist_range)[0]
+
+
+def block_stats(
+    values: np.ndarray,
+    hist_range: tuple[float, float] | None = None,
+) -> BlockStats:
+    """Compute the statistics of a block."""
+    nulls = _null_mask(values)
+    valid = values[~nulls] if nulls.any() else values
+    sketch = np.unique(_hash_values(valid))[:SKETCH_SIZE]
+    if not is_numeric(values) or valid.size == 0:
+        nan = float("nan")
+        return BlockStats(values.size, int(nulls.sum()), nan, nan, nan, 0.0, sketch)
+    x = valid.astype(np.float64, copy=False)
+    mean = float(x.mean())
+    m2 = float(np.square(x - mean).sum())
+    hist = None if hist_range is None else _histogram(x, hist_range)
+    return BlockStats(
+        values.size,
+        int(nulls.sum()),
+        float(x.min()),
+        float(x.max()),
+        mean,
+        m2,
+        sketch,
+        hist,
+        hist_range,
+    )
+
+
+def merge_stats(blocks: list[BlockStats], numeric: bool) -> ColumnStats:
+    """Merge the statistics of blocks into the statistics of the column."""
+    sizes = np.array([b.size for b in blocks], dtype=np.int64)
+    nulls = np.array([b.nulls for b in blocks], dtype=np.int64)
+    counts = sizes - nulls
+    count = int(counts.sum())
+    sketch = np.unique(np.concatenate([b.sketch for b in blocks] or [[]]))
+    sketch = sketch[:SKETCH_SIZE].astype(np.uint64)
+    if sketch.size < SKETCH_SIZE:
+        unique, exact = int(sketch.size), True
+    else:
+        # the k-th smallest of uniformly distributed hashes is about k / unique
+        unique, exact = round((SKETCH_SIZE - 1) / (float(sketch[-1]) / 2.0**64)), False
+    if not numeric or count == 0:
+        return ColumnStats(
+            count, int(nulls.sum()), None, None, None, None, unique, exact, None, None
+        )
+    has_values = counts > 0
+    means = np.array([b.mean for b in blocks])[has_values]
+    m2s = np.array([b.m2 for b in blocks])[has_values]
+    weights = counts[has_values]
+    mean = float((means * weights).sum() / count)
+    m2 = float(m2s.sum() + (weights * np.square(means - mean)).sum())
+    vmin = min(b.min for b, ok in zip(blocks, has_values) if ok)
+    vmax = max(b.max for b, ok in zip(blocks, has_values) if ok)
+    hist_range = _hist_range(vmin, vmax)
+    if all(b.hist_range == hist_range for b, ok in zip(blocks, has_values) if ok):
+        hist = sum(b.hist for b, ok in zip(blocks, has_values) if ok)
+    else:
+        hist = None
+    return ColumnStats(
+        count,
+        int(nulls.sum()),
+        vmin,
+        vmax,
+        mean,
+        (m2 / (count - 1)) ** 0.5 if count > 1 else float("nan"),
+        unique,
+        exact,
+        hist,
+        hist_range,
+    )
+
+
+def _hist_range(vmin: float, vmax: float) -> tuple[float, float]:
+    if vmin == vmax:
+        return vmin - 0.5, vmax + 0.5
+    return vmin, vmax
+
+
+def update_column(
+    values: np.ndarray,
+    blocks: list[BlockStats | None],
+) -> tuple[list[BlockStats], ColumnStats]:
+    """
+    Update the statistics of the blocks and merge them.
+
+    Blocks that are None or whose size does not match `values` are computed again.
+    If the range of the values changed, histograms of the other blocks are updated
+    as well.
+    """
+    values = np.asarray(values)
+    nrows = values.shape[0]
+    blocks = list(blocks[: -(-nrows // BLOCK_ROWS)])
+    numeric = is_numeric(values)
+    for i, start in enumerate(range(0, nrows, BLOCK_ROWS)):
+        block = values[start : start + BLOCK_ROWS]
+        if i >= len(blocks):
+            blocks.append(block_stats(block))
+        elif blocks[i] is None or blocks[i].size != block.size:
+            blocks[i] = block_stats(block, blocks[i] and blocks[i].hist_range)
+    stats = merge_stats(blocks, numeric)
+    if numeric and stats.hist is None and stats.hist_range is not None:
+        # only happens when the range of the values changed
+        for i, start in enumerate(range(0, nrows, BLOCK_ROWS)):
+            if blocks[i].hist_range != stats.hist_range:
+                block = values[start : start + BLOCK_ROWS]
+                x = block[~_null_mask(block)].astype(np.float64, copy=False)
+                hist = _histogram(x, stats.hist_range)
+                blocks[i] = blocks[i]._replace(hist=hist, hist_range=stats.hist_range)
+        stats = merge_stats(blocks, numeric)
+    return blocks, stats
+
+
+class ColumnStatsCache:
+    """
+    Cache of the block statistics of each column of a table.
+
+    Computation is done by `update_column` in a worker with a copy of the blocks
+    returned by `begin`. Rows invalidated during the computation are invalidated
+    again when the result is stored by `finish`.
+    """
+
+    def __init__(self):
+        self._blocks: dict[int, list[BlockStats | None]] = {}
+        self._stats: dict[int, ColumnStats] = {}
+        self._running: dict[int, list[tuple[int, int]] | None] = {}
+
+    def get(self, column: int) -> ColumnStats | None:
+        """Statistics of the column, or None if it has to be computed."""
+        return self._stats.get(column)
+
+    def invalidate(self, column: int, ranges: Iterable[tuple[int, int]]) -> None:
+        """Invalidate the blocks that contain the (start, stop) row ranges."""
+        ranges = list(ranges)
+        self._stats.pop(column, None)
+        if (running := self._running.get(column)) is not None:
+            running.extend(ranges)
+        if (blocks := self._blocks.get(column)) is None:
+            return None
+        for start, stop in ranges:
+            first = start // BLOCK_ROWS
+            last = min(-(-stop // BLOCK_ROWS), len(blocks))
+            blocks[first:last] = [None] * max(last - first, 0)
+        return None
+
+    def invalidate_all(self) -> None:
+        """Invalidate all the columns."""
+        self._blocks.clear()
+        self._stats.clear()
+        for column in self._running:
+            self._running[column] = None  # discard the results
+        return None
+
+    def begin(self, column: int) -> list[BlockStats | None]:
+        """Start computing the column and return a copy of its blocks."""
+        self._running[column] = []
+        return list(self._blocks.get(column, []))
+
+    def finish(
+        self,
+        column: int,
+        blocks: list[BlockStats],
+        stats: ColumnStats,
+    ) -> None:
+        """Store the result of `update_column`."""
+        invalidated = self._running.pop(column, None)
+        if invalidated is None:
+            return None
+        self._blocks[column] = list(blocks)
+        if invalidated:
+            self.invalidate(column, invalidated)
+        else:
+            self._stats[column] = stats
+        return None
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+import math
+import weakref
+from qtpy import QtWidgets as QtW, QtCore, QtGui
+from himena.builtins.qt.widgets.table import QDefaultTableWidget, QTableDataModel
+from himena.builtins.qt.stats._stats import (
+    ColumnStats,
+    ColumnStatsCache,
+    update_column,
+)
+from himena.widgets._jobs import get_executor
+
+_HEADERS = ["Column", "Count", "Nulls", "Min", "Max", "Mean", "Std", "Unique"]
+_UPDATE_DELAY_MS = 200  # edits in this interval are computed at once
+
+
+def _format_number(value: float | None) -> str:
+    if value is None or math.isnan(value):
+        return ""
+    return f"{value:.6g}"
+
+
+class QHistogram(QtW.QWidget):
+    """Bar plot of the histogram of a column."""
+
+    def __init__(self, parent: QtW.QWidget | None = None):
+        super().__init__(parent)
+        self._counts: list[int] = []
+        self.setMinimumHeight(60)
+
+    def set_stats(self, stats: ColumnStats | None) -> None:
+        if stats is None or stats.hist is None:
+            self._counts = []
+            self.setToolTip("")
+        else:
+            self._counts = stats.hist.tolist()
+            lo, hi = stats.hist_range
+            self.setToolTip(f"{lo:.6g} - {hi:.6g}")
+        self.update()
+        return None
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        if not self._counts or (vmax := max(self._counts)) == 0:
+            return None
+        painter = QtGui.QPainter(self)
+        rect = self.rect().adjusted(2, 2, -2, -2)
+        width = rect.width() / len(self._counts)
+        color = self.palette().color(QtGui.QPalette.ColorRole.Highlight)
+        for i, count in enumerate(self._counts):
+            height = rect.height() * count / vmax
+            bar = QtCore.QRectF(
+                rect.left() + i * width,
+                rect.bottom() - height,
+                max(width - 1, 1),
+                height,
+            )
+            painter.fillRect(bar, color)
+        painter.end()
+        return None
+
+
+class QColumnStatsWidget(QtW.QWidget):
+    """
+    Statistics of the columns of the current table.
+
+    Statistics are computed block by block in a worker and cached for each table.
+    When cells are edited or rows are appended, only the blocks of the changed rows
+    in the changed columns are computed again.
+    """
+
+    _computed = QtCore.Signal(object, int, object)
+
+    def __init__(self, parent: QtW.QWidget | None = None):
+        super().__init__(parent)
+        self._caches: weakref.WeakKeyDictionary[QTableDataModel, ColumnStatsCache] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._table: QTableDataModel | None = None
+        self._ncols = 0
+        self._future: Future | None = None
+        self._stats_table = QtW.QTableWidget(0, len(_HEADERS))
+        self._stats_table.setHorizontalHeaderLabels(_HEADERS)
+        self._stats_table.setEditTriggers(
+            QtW.QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self._stats_table.setSelectionBehavior(
+            QtW.QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self._stats_table.verticalHeader().setVisible(False)
+        self._stats_table.currentCellChanged.connect(self._update_histogram)
+        self._histogram = QHistogram()
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(_UPDATE_DELAY_MS)
+        self._update_timer.timeout.connect(self._start_update)
+        self._computed.connect(self._on_computed)
+        layout = QtW.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._stats_table)
+        layout.addWidget(self._histogram)
+
+    def table(self) -> QTableDataModel | None:
+        """The table whose statistics are shown."""
+        return self._table
+
+    def set_table(self, table: QTableDataModel | None) -> None:
+        """Show the statistics of the table."""
+        if table is self._table:
+            return None
+        if self._table is not None:
+            self._table.rowsChanged.disconnect(self._on_rows_changed)
+        self._table = table
+        if table is not None:
+            table.rowsChanged.connect(self._on_rows_changed)
+            if table not in self._caches:
+                self._caches[table] = ColumnStatsCache()
+            self._ncols = table.columnCount()
+        self._refresh()
+        self._start_update()
+        return None
+
+    def set_window(self, win) -> None:
+        """Show the statistics of the table in the sub-window, if any."""
+        if isinstance(widget := win.widget, QDefaultTableWidget):
+            self.set_table(widget.model())
+        else:
+            self.set_table(None)
+        return None
+
+    def _on_rows_changed(self, ranges: list[tuple[int, int]], columns: list[int]):
+        cache = self._caches[self._table]
+        if self._table.columnCount() != self._ncols:
+            self._ncols = self._table.columnCount()
+            cache.invalidate_all()
+            self._refresh()
+        else:
+            for column in columns:
+                cache.invalidate(column, ranges)
+        self._update_timer.start()
+        return None
+
+    def _start_update(self) -> None:
+        if (table := self._table) is None:
+            return None
+        if self._future is not None and not self._future.done():
+            self._update_timer.start()  # try again after the running job
+            return None
+        cache = self._caches[table]
+        tasks = [
+            (column, table.column_values(column), cache.begin(column))
+            for column in range(table.columnCount())
+            if cache.get(column) is None
+        ]
+        if not tasks:
+            return None
+
+        def _compute():
+            for column, values, blocks in tasks:
+                result = update_column(values, blocks)
+                try:
+                    self._computed.emit(table, column, result)
+                except RuntimeError:
+                    return  # widget already deleted
+
+        self._future = get_executor("thread").submit(_compute)
+        return None
+
+    def _on_computed(self, table: QTableDataModel, column: int, result) -> None:
+        if (cache := self._caches.get(table)) is None:
+            return None
+        cache.finish(column, *result)
+        if table is self._table:
+            self._refresh_row(column)
+            if self._stats_table.currentRow() == column:
+                self._update_histogram(column)
+        return None
+
+    def _refresh(self) -> None:
+        table = self._table
+        ncols = 0 if table is None else table.columnCount()
+        self._stats_table.setRowCount(ncols)
+        for column in range(ncols):
+            self._refresh_row(column)
+        self._update_histogram(self._stats_table.currentRow())
+        return None
+
+    def _refresh_row(self, column: int) -> None:
+        table = self._table
+        if column >= self._stats_table.rowCount():
+            self._stats_table.setRowCount(table.columnCount())
+        name = table.headerData(column, QtCore.Qt.Orientation.Horizontal)
+        stats = self._caches[table].get(column)
+        if stats is None:
+            texts = [name] + ["..."] * (len(_HEADERS) - 1)
+        else:
+            unique = str(stats.unique) if stats.unique_exact else f"~{stats.unique}"
+            texts = [
+                name,
+                str(stats.count),
+                str(stats.nulls),
+                _format_number(stats.min),
+                _format_number(stats.max),
+                _format_number(stats.mean),
+                _format_number(stats.std),
+                unique,
+            ]
+        for i, text in enumerate(texts):
+            self._stats_table.setItem(column, i, QtW.QTableWidgetItem(text))
+        return None
+
+    def _update_histogram(self, row: int, *_) -> None:
+        if self._table is None or row < 0:
+            return self._histogram.set_stats(None)
+        return self._histogram.set_stats(self._caches[self._table].get(row))
+
+    def stats(self, column: int) -> ColumnStats | None:
+        """Cached statistics of the column of the current table."""
+        if self._table is None:
+            return None
+        return self._caches[self._table].get(column)
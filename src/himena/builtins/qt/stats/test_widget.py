@@ -0,0 +1,65 @@
+import numpy as np
+from pytestqt.qtbot import QtBot
+from himena.builtins.qt.stats import _stats
+from himena.builtins.qt.stats._widget import QColumnStatsWidget
+from himena.builtins.qt.widgets import QDefaultTableWidget
+from himena.types import WidgetDataModel
+
+
+def test_block_stats_merge(monkeypatch):
+    monkeypatch.setattr(_stats, "BLOCK_ROWS", 100)
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=1050)
+    values[[3, 500]] = np.nan
+    blocks, stats = _stats.update_column(values, [])
+    valid = values[~np.isnan(values)]
+    assert len(blocks) == 11
+    assert (stats.count, stats.nulls) == (1048, 2)
+    assert np.isclose(stats.mean, valid.mean())
+    assert np.isclose(stats.std, valid.std(ddof=1))
+    assert (stats.min, stats.max) == (valid.min(), valid.max())
+    assert stats.hist.sum() == 1048
+    assert not stats.unique_exact
+    assert abs(stats.unique - 1048) < 1048 * 0.1
+
+    # only the blocks of the edited rows are computed again
+    values[250] = 100.0
+    blocks[2] = None
+    computed = []
+    block_stats = _stats.block_stats
+    monkeypatch.setattr(
+        _stats, "block_stats", lambda x, r=None: computed.append(x) or block_stats(x, r)
+    )
+    blocks, stats = _stats.update_column(values, blocks)
+    assert len(computed) == 1
+    assert stats.max == 100.0
+    assert stats.hist.sum() == 1048  # histograms follow the new range
+
+    blocks, stats = _stats.update_column(np.array(["a", "b", "", "a"]), [])
+    assert (stats.count, stats.nulls, stats.unique, stats.mean) == (3, 1, 2, None)
+
+
+def test_column_stats_widget(qtbot: QtBot):
+    table_widget = QDefaultTableWidget.from_model(
+        WidgetDataModel(
+            value={"x": np.arange(10), "name": np.array(list("aabbccddee"))},
+            type="table",
+        )
+    )
+    qtbot.add_widget(table_widget)
+    widget = QColumnStatsWidget()
+    qtbot.add_widget(widget)
+    widget.set_table(table_widget.model())
+    qtbot.waitUntil(lambda: widget.stats(1) is not None)
+    assert widget.stats(0).mean == 4.5
+    assert widget.stats(1).unique == 5
+    assert widget._stats_table.item(0, 4).text() == "9"
+
+    table = table_widget.model()
+    table.setData(table.index(0, 0), "100")
+    assert widget.stats(0) is None and widget.stats(1) is not None
+    qtbot.waitUntil(lambda: widget.stats(0) is not None)
+    assert widget.stats(0).max == 100
+    table_widget.append_rows({"x": np.array([-1]), "name": np.array(["f"])})
+    qtbot.waitUntil(lambda: widget.stats(1) is not None and widget.stats(1).unique == 6)
+    assert widget.stats(0).min == -1
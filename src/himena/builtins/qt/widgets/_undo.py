@@ -0,0 +1,194 @@
+"""Memory-bounded undo/redo journal used by the default widgets."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+import copy
+import time
+from typing import Any, Generic, Iterable, TypeVar
+
+_S = TypeVar("_S")
+
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_COALESCE_SECONDS = 0.5
+
+
+def set_default_undo_limit(max_bytes: int) -> None:
+    """Set the memory limit of the undo journals created afterward."""
+    global _DEFAULT_MAX_BYTES
+
+    if max_bytes < 0:
+        raise ValueError(f"max_bytes must be non-negative, got {max_bytes}.")
+    _DEFAULT_MAX_BYTES = max_bytes
+    return None
+
+
+class UndoableEdit(ABC, Generic[_S]):
+    """
+    An edit that consists of segments of changed ranges.
+
+    Each segment stores the old values of the changed range only. Reverting a
+    segment returns the segment that redoes it, so that an edit and its inverse
+    never exist at the same time.
+    """
+
+    def __init__(self, target: Any, segments: Iterable[_S]):
+        self._target = target
+        self._segments = list(segments)
+        self._nbytes = sum(self._segment_nbytes(seg) for seg in self._segments)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated number of bytes used by this edit."""
+        return self._nbytes
+
+    @abstractmethod
+    def _revert_segment(self, segment: _S) -> _S:
+        """Revert the segment and return the segment that redoes it."""
+
+    @abstractmethod
+    def _segment_nbytes(self, segment: _S) -> int:
+        """Estimated number of bytes of the segment."""
+
+    def _finish_revert(self) -> None:
+        """Called after all the segments are reverted."""
+
+    def _merge_segment(self, last: _S, segment: _S) -> _S | None:
+        """Merge two consecutive segments into one if possible."""
+        return None
+
+    def revert(self) -> UndoableEdit[_S]:
+        """Revert this edit and return the edit that redoes it."""
+        inverse = [self._revert_segment(seg) for seg in reversed(self._segments)]
+        self._finish_revert()
+        out = copy.copy(self)
+        out._segments = inverse
+        out._nbytes = sum(self._segment_nbytes(seg) for seg in inverse)
+        return out
+
+    def merge(self, other: UndoableEdit) -> bool:
+        """Merge an edit that was made just after this edit."""
+        if type(other) is not type(self) or other._target is not self._target:
+            return False
+        for segment in other._segments:
+            if self._segments and (
+                merged := self._merge_segment(self._segments[-1], segment)
+            ) is not None:
+                self._nbytes -= self._segment_nbytes(self._segments[-1])
+                self._segments[-1] = merged
+                self._nbytes += self._segment_nbytes(merged)
+            else:
+                self._segments.append(segment)
+                self._nbytes += self._segment_nbytes(segment)
+        return True
+
+
+class UndoJournal:
+    """
+    Undo/redo stacks with a memory limit.
+
+    When the total size of the edits exceeds `max_bytes`, the oldest edits are
+    dropped. Edits pushed within `coalesce_seconds` of each other are merged into
+    one undo step.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        coalesce_seconds: float = _COALESCE_SECONDS,
+    ):
+        if max_bytes is None:
+            max_bytes = _DEFAULT_MAX_BYTES
+        self._max_bytes = max_bytes
+        self._coalesce_seconds = coalesce_seconds
+        self._undo_stack: deque[UndoableEdit] = deque()
+        self._redo_stack: deque[UndoableEdit] = deque()
+        self._nbytes = 0
+        self._last_push = -float("inf")
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(undo={len(self._undo_stack)}, "
+            f"redo={len(self._redo_stack)}, nbytes={self._nbytes})"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated number of bytes used by the edits."""
+        return self._nbytes
+
+    @property
+    def max_bytes(self) -> int:
+        """Memory limit of the journal."""
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Update the memory limit and drop the edits over it."""
+        self._max_bytes = max_bytes
+        self._evict()
+        return None
+
+    def can_undo(self) -> bool:
+        return len(self._undo_stack) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo_stack) > 0
+
+    def push(self, edit: UndoableEdit) -> None:
+        """Record an edit that has just been made."""
+        for each in self._redo_stack:
+            self._nbytes -= each.nbytes
+        self._redo_stack.clear()
+        now = time.monotonic()
+        last = self._undo_stack[-1] if self._undo_stack else None
+        if now - self._last_push < self._coalesce_seconds and last is not None:
+            nbytes_old = last.nbytes
+            if last.merge(edit):
+                self._nbytes += last.nbytes - nbytes_old
+            else:
+                self._append(self._undo_stack, edit)
+        else:
+            self._append(self._undo_stack, edit)
+        self._last_push = now
+        self._evict()
+        return None
+
+    def undo(self) -> bool:
+        """Undo the last edit. Return False if there is nothing to undo."""
+        return self._move(self._undo_stack, self._redo_stack)
+
+    def redo(self) -> bool:
+        """Redo the last undone edit. Return False if there is nothing to redo."""
+        return self._move(self._redo_stack, self._undo_stack)
+
+    def clear(self) -> None:
+        """Clear all the edits."""
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        self._nbytes = 0
+        return None
+
+    def _append(self, stack: deque[UndoableEdit], edit: UndoableEdit) -> None:
+        stack.append(edit)
+        self._nbytes += edit.nbytes
+        return None
+
+    def _move(self, src: deque[UndoableEdit], dst: deque[UndoableEdit]) -> bool:
+        if not src:
+            return False
+        edit = src.pop()
+        self._nbytes -= edit.nbytes
+        self._append(dst, edit.revert())
+        self._last_push = -float("inf")  # never merge with an undone edit
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # the oldest edits are the bottom of the undo stack, then the bottom of the
+        # redo stack (the farthest redo)
+        while self._nbytes > self._max_bytes and self._undo_stack:
+            self._nbytes -= self._undo_stack.popleft().nbytes
+        while self._nbytes > self._max_bytes and self._redo_stack:
+            self._nbytes -= self._redo_stack.popleft().nbytes
+        return None
@@ -1,15 +1,236 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections import deque
+from concurrent.futures import Future
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Hashable
 from qtpy import QtWidgets as QtW
 from qtpy import QtGui, QtCore
 from superqt import QLabeledSlider
 from himena.consts import StandardTypes
+from himena.qt._utils import qsignal_blocker
 from himena.types import WidgetDataModel
+from himena.widgets._jobs import get_executor
 
 if TYPE_CHECKING:
     import numpy as np
     from numpy.typing import NDArray
+    from himena.io import _ChunkBuffer
+
+_SAMPLE_PIXELS = 1 << 20  # number of pixels sampled to estimate contrast limits
+_SAMPLE_PLANES = 16  # number of planes of a stack the pixels are sampled from
+_CONTRAST_PERCENTILES = (0.1, 99.9)
+_LUT_CHUNK = 1 << 16  # number of pixels converted by a lookup table at once
+_SLICE_CACHE_BYTES = 256 * 1024**2
+_PREFETCH_SLICES = 4  # number of slices rendered ahead in the direction of motion
+_LOADING_DELAY_MS = 100  # loading indicator is shown if fetching takes longer
+_TILED_MIN_PIXELS = 4096 * 4096  # planes larger than this are shown by tiles
+_TILE_SIZE = 512
+_TILE_CACHE_BYTES = 128 * 1024**2
+_PYRAMID_STRIP_ROWS = 1024  # rows of the source read at once to build the pyramid
+_PYRAMID_DELAY_MS = 300  # the pyramid is built once the source stays for this long
+_PYRAMID_CACHE_BYTES = 256 * 1024**2
+_DEFAULT_FPS = 10
+_MAX_FPS = 120
+# 16-bit grayscale images are supported since Qt 5.13
+_HAS_GRAYSCALE16 = hasattr(QtGui.QImage.Format, "Format_Grayscale16")
+
+
+def _is_array_like(value) -> bool:
+    """True if value can be sliced plane by plane without loading it entirely."""
+    return all(hasattr(value, attr) for attr in ("shape", "dtype", "__getitem__"))
+
+
+def _sample_pixels(arr, nspatial: int, planes: int = _SAMPLE_PLANES) -> np.ndarray:
+    """Sample pixels from planes evenly spread over the stack."""
+    import numpy as np
+
+    leading = arr.shape[: len(arr.shape) - nspatial]
+    nplanes = math.prod(leading)
+    indices = np.unique(np.linspace(0, nplanes - 1, min(planes, nplanes)).astype(int))
+    # stride of the spatial axes, so that about _SAMPLE_PIXELS are sampled in total
+    plane_size = math.prod(arr.shape[-nspatial:][:2])
+    per_plane = max(_SAMPLE_PIXELS // indices.size, 1)
+    step = max(math.ceil(math.sqrt(plane_size / per_plane)), 1)
+    strided = (slice(None, None, step),) * 2
+    samples = []
+    for index in indices.tolist():
+        key = np.unravel_index(index, leading) if leading else ()
+        samples.append(np.asarray(arr[tuple(int(i) for i in key) + strided]).ravel())
+    return np.concatenate(samples)
+
+
+def _estimate_contrast_limits(arr, nspatial: int, **kwargs) -> tuple[float, float]:
+    """Estimate the contrast limits from the percentiles of sampled pixels."""
+    import numpy as np
+
+    sample = _sample_pixels(arr, nspatial, **kwargs)
+    if sample.dtype.kind == "f":
+        sample = sample[np.isfinite(sample)]
+    if sample.size == 0:
+        return 0.0, 1.0
+    lo, hi = np.percentile(sample, _CONTRAST_PERCENTILES)
+    lo, hi = float(lo), float(hi)
+    if lo >= hi:
+        hi = lo + 1.0
+    return lo, hi
+
+
+class _SliceCache:
+    """
+    LRU cache of the rendered slices of an image stack.
+
+    Slices are keyed by the slider indices and the contrast limits. Least recently
+    used slices are evicted when the total size exceeds `max_bytes`. The cache is
+    shared with the prefetching worker, so it is guarded by a lock.
+    """
+
+    def __init__(self, max_bytes: int = _SLICE_CACHE_BYTES):
+        self._data: dict[Hashable, NDArray[np.uint8]] = {}
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> NDArray[np.uint8] | None:
+        with self._lock:
+            try:
+                arr = self._data.pop(key)
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data[key] = arr  # move to the end
+            self._hits += 1
+        return arr
+
+    def contains(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def set(self, key: Hashable, arr: NDArray[np.uint8]) -> None:
+        with self._lock:
+            if arr.nbytes > self._max_bytes:
+                return None
+            if (old := self._data.pop(key, None)) is not None:
+                self._nbytes -= old.nbytes
+            self._data[key] = arr
+            self._nbytes += arr.nbytes
+            while self._nbytes > self._max_bytes:
+                self._nbytes -= self._data.pop(next(iter(self._data))).nbytes
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+        return None
+
+
+class _PlaneView:
+    """A plane of an array-like object, indexed only when sliced."""
+
+    def __init__(self, arr, index: tuple[int, ...]):
+        self._arr = arr
+        self._index = index
+        self.shape = tuple(arr.shape[len(index) :])
+        self.dtype = arr.dtype
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self._arr[self._index + key]
+
+
+class _Playback:
+    """
+    State of the playback along an axis of a stack.
+
+    Frames are counted from the start of the playback without wrapping, and the
+    frame due at each moment is determined by the clock, so that playback never
+    falls behind even if frames are dropped.
+    """
+
+    def __init__(
+        self,
+        axis: int,
+        index: tuple[int, ...],
+        size: int,
+        fps: float,
+        limits: tuple[float, float] | None,
+    ):
+        self.axis = axis
+        self.index = index
+        self.size = size
+        self.fps = fps
+        self.limits = limits
+        self.start_time = time.perf_counter()
+        self.shown = index[axis]  # last frame shown
+        self.rendered = index[axis]  # last frame rendered ahead
+        self.render_time = 0.0  # smoothed time needed to render a frame
+        self.shown_times: deque[float] = deque()
+
+    def frame_at(self, t: float) -> int:
+        """Frame that is due at the time."""
+        return self.index[self.axis] + int((t - self.start_time) * self.fps)
+
+    def key(self, frame: int) -> tuple[tuple[int, ...], tuple[float, float] | None]:
+        """Slice cache key of the frame."""
+        index = self.index
+        axis = self.axis
+        return index[:axis] + (frame % self.size,) + index[axis + 1 :], self.limits
+
+    def record_shown(self, frame: int, t: float) -> None:
+        self.shown = frame
+        self.shown_times.append(t)
+        while t - self.shown_times[0] > 1.0:
+            self.shown_times.popleft()
+        return None
+
+    def achieved_fps(self) -> float:
+        """Number of frames shown per second during the last second."""
+        times = self.shown_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+
+class _ArrayQImage(QtGui.QImage):
+    """QImage that shares the buffer of an array and keeps the array alive."""
+
+    def __init__(self, arr: np.ndarray, format: QtGui.QImage.Format):
+        super().__init__(arr, arr.shape[1], arr.shape[0], arr.strides[0], format)
+        self._array = arr
+
+
+def _qimage_format(arr: np.ndarray) -> QtGui.QImage.Format | None:
+    fmt = QtGui.QImage.Format
+    if arr.ndim == 2:
+        if arr.dtype == "uint8":
+            return fmt.Format_Grayscale8
+        if arr.dtype == "uint16" and _HAS_GRAYSCALE16:
+            return fmt.Format_Grayscale16
+    elif arr.ndim == 3 and arr.dtype == "uint8":
+        if arr.shape[2] == 3:
+            return fmt.Format_RGB888
+        if arr.shape[2] == 4:
+            return fmt.Format_RGBA8888
+    return None
+
+
+def _array_to_qimage(val: NDArray[np.uint8 | np.uint16]) -> QtGui.QImage:
+    """
+    Convert a grayscale, RGB or RGBA array to a QImage without copying.
+
+    The rows of the array are used as the scanlines of the image, so only arrays
+    that are not C-contiguous are copied.
+    """
+    import numpy as np
+
+    if (format := _qimage_format(val)) is None:
+        raise ValueError(f"Cannot convert array {val.shape!r} {val.dtype} to QImage.")
+    return _ArrayQImage(np.ascontiguousarray(val), format)
 
 
 class _QImageLabel(QtW.QLabel):
@@ -23,16 +244,14 @@ class _QImageLabel(QtW.QLabel):
         self.set_array(val)
 
     def set_array(self, val: NDArray[np.uint8]):
-        import numpy as np
+        self._pixmap_orig = QtGui.QPixmap.fromImage(_array_to_qimage(val))
+        self._update_pixmap()
 
-        if val.ndim == 2:
-            val = np.stack(
-                [val] * 3 + [np.full(val.shape, 255, dtype=np.uint8)], axis=2
-            )
-        image = QtGui.QImage(
-            val, val.shape[1], val.shape[0], QtGui.QImage.Format.Format_RGBA8888
-        )
-        self._pixmap_orig = QtGui.QPixmap.fromImage(image)
+    def set_smooth(self, smooth: bool) -> None:
+        if smooth:
+            self._transformation = QtCore.Qt.TransformationMode.SmoothTransformation
+        else:
+            self._transformation = QtCore.Qt.TransformationMode.FastTransformation
         self._update_pixmap()
 
     def _update_pixmap(self):
@@ -49,47 +268,767 @@ class _QImageLabel(QtW.QLabel):
         self._update_pixmap()
 
 
+def _downsample(arr: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    """Halve the size of the spatial axes by averaging 2x2 pixels."""
+    import numpy as np
+
+    h, w = arr.shape[0] // 2 * 2, arr.shape[1] // 2 * 2
+    total = arr[0:h:2, 0:w:2].astype(np.uint16)
+    total += arr[1:h:2, 0:w:2]
+    total += arr[0:h:2, 1:w:2]
+    total += arr[1:h:2, 1:w:2]
+    total += 2
+    return (total >> 2).astype(np.uint8)
+
+
+def _build_pyramid(
+    source,
+    render: Callable[[np.ndarray], NDArray[np.uint8]],
+    nlevels: int,
+    cancelled: Callable[[], bool],
+):
+    """Yield (level, array) of the downsampled images from level 1."""
+    import numpy as np
+
+    if nlevels < 2:
+        return
+    # level 1 is built strip by strip so that the source is never loaded at once
+    strips = []
+    for start in range(0, source.shape[0], _PYRAMID_STRIP_ROWS):
+        if cancelled():
+            return
+        strip = render(np.asarray(source[start : start + _PYRAMID_STRIP_ROWS]))
+        strips.append(_downsample(strip))
+    level = np.concatenate(strips, axis=0)
+    yield 1, level
+    for i in range(2, nlevels):
+        if cancelled():
+            return
+        level = _downsample(level)
+        yield i, level
+
+
+def _read_tile(
+    source,
+    render: Callable[[np.ndarray], NDArray[np.uint8]],
+    levels: dict[int, NDArray[np.uint8]],
+    key,
+) -> NDArray[np.uint8]:
+    """Read and render the tile of the key given by `QTiledImageView._tile_key`."""
+    import numpy as np
+
+    _, level, built, ty, tx = key
+    ys = slice(ty * _TILE_SIZE, (ty + 1) * _TILE_SIZE)
+    xs = slice(tx * _TILE_SIZE, (tx + 1) * _TILE_SIZE)
+    if level == 0:
+        arr = render(np.asarray(source[ys, xs]))
+    elif built:
+        arr = levels[level][ys, xs]
+    else:
+        # sample the source with a stride until the level is built
+        step = 1 << level
+        ys = slice(ys.start * step, ys.stop * step, step)
+        xs = slice(xs.start * step, xs.stop * step, step)
+        arr = render(np.asarray(source[ys, xs]))
+    return np.ascontiguousarray(arr)
+
+
+class _QTiledImageItem(QtW.QGraphicsItem):
+    """Graphics item that paints the exposed tiles of a QTiledImageView."""
+
+    def __init__(self, view: QTiledImageView):
+        super().__init__()
+        self._view = view
+        self.setFlag(
+            QtW.QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True
+        )
+
+    def boundingRect(self) -> QtCore.QRectF:
+        height, width = self._view.image_shape()
+        return QtCore.QRectF(0, 0, width, height)
+
+    def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
+        view = self._view
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = view.level_for_scale(lod)
+        scale = 1 << level
+        tile = _TILE_SIZE * scale  # size of a tile in the scene
+        rect = option.exposedRect.intersected(self.boundingRect())
+        if rect.isEmpty():
+            return None
+        for ty in range(int(rect.top() // tile), math.ceil(rect.bottom() / tile)):
+            for tx in range(int(rect.left() // tile), math.ceil(rect.right() / tile)):
+                if (arr := view.ready_tile(level, ty, tx)) is None:
+                    # the tile is being rendered in a worker
+                    target = self.tile_rect(level, ty, tx)
+                    painter.fillRect(target, QtCore.Qt.GlobalColor.darkGray)
+                    continue
+                if arr.size == 0:
+                    continue
+                target = QtCore.QRectF(
+                    tx * tile, ty * tile, arr.shape[1] * scale, arr.shape[0] * scale
+                )
+                painter.drawImage(target, _array_to_qimage(arr))
+        return None
+
+    def tile_rect(self, level: int, ty: int, tx: int) -> QtCore.QRectF:
+        """Rectangle of the tile in the scene."""
+        tile = _TILE_SIZE << level
+        rect = QtCore.QRectF(tx * tile, ty * tile, tile, tile)
+        return rect.intersected(self.boundingRect())
+
+
+class QTiledImageView(QtW.QGraphicsView):
+    """
+    View of a large 2D image that renders only the visible tiles.
+
+    A pyramid of downsampled images is built in a worker, and the tiles are taken
+    from the level that matches the zoom factor, so zooming and panning cost the
+    same regardless of the image size. Until a level is built, its tiles are
+    sampled from the source with a stride. Tiles read from the source are rendered
+    in a worker, and a placeholder is painted until they are ready.
+
+    Building the pyramid reads the whole source, so it is started only when a
+    downsampled level is shown and the source was not changed for a while, such as
+    after scrolling through a stack. Built levels are cached by the key of the
+    source.
+    """
+
+    _level_built = QtCore.Signal(int, int, object)
+    _tile_rendered = QtCore.Signal(object, object)
+
+    def __init__(self, parent: QtW.QWidget | None = None):
+        super().__init__(parent)
+        self.setScene(QtW.QGraphicsScene(self))
+        self._source = None
+        self._render: Callable[[np.ndarray], NDArray[np.uint8]] = lambda x: x
+        self._levels: dict[int, NDArray[np.uint8]] = {}
+        self._tiles = _SliceCache(_TILE_CACHE_BYTES)
+        self._tile_futures: dict[Hashable, Future] = {}
+        self._generation = 0
+        self._build_generation = -1  # generation the pyramid was last built for
+        self._future: Future | None = None
+        self._source_key: Hashable | None = None
+        self._pyramids = _SliceCache(_PYRAMID_CACHE_BYTES)  # (key, level) -> level
+        self._build_timer = QtCore.QTimer(self)
+        self._build_timer.setSingleShot(True)
+        self._build_timer.setInterval(_PYRAMID_DELAY_MS)
+        self._build_timer.timeout.connect(self._start_build)
+        self._fitted = False
+        self._item = _QTiledImageItem(self)
+        self.scene().addItem(self._item)
+        self._level_built.connect(self._on_level_built)
+        self._tile_rendered.connect(self._on_tile_rendered)
+        self.setDragMode(QtW.QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QtW.QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform, True)
+
+    def image_shape(self) -> tuple[int, int]:
+        """(height, width) of the image."""
+        if self._source is None:
+            return 0, 0
+        return tuple(self._source.shape[:2])
+
+    def nlevels(self) -> int:
+        """Number of the levels of the pyramid, including the original image."""
+        size = max(self.image_shape())
+        return max(math.ceil(math.log2(size / _TILE_SIZE)) + 1, 1) if size else 1
+
+    def level_for_scale(self, scale: float) -> int:
+        """Level of the pyramid to show the image at `scale`."""
+        if scale >= 1:
+            return 0
+        return min(int(math.log2(1 / scale)), self.nlevels() - 1)
+
+    def set_source(
+        self,
+        source,
+        render: Callable[[np.ndarray], NDArray[np.uint8]],
+        key: Hashable | None = None,
+    ) -> None:
+        """
+        Set the image to show.
+
+        `source` is an array-like object of shape (height, width[, channels]). Parts
+        of it are converted to uint8 by `render` when they are shown. If `key` is
+        given, the levels of the pyramid are cached with the key and reused when the
+        source of the same key is set again.
+        """
+        self._generation += 1
+        self._build_timer.stop()
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        for future in self._tile_futures.values():
+            future.cancel()
+        self._tile_futures.clear()
+        shape_changed = self.image_shape() != tuple(source.shape[:2])
+        self._item.prepareGeometryChange()
+        self._source = source
+        self._render = render
+        self._source_key = key
+        self._levels = {}
+        if key is not None:
+            for level in range(1, self.nlevels()):
+                if (arr := self._pyramids.get((key, level))) is not None:
+                    self._levels[level] = arr
+        self._tiles.clear()
+        height, width = self.image_shape()
+        self.setSceneRect(0, 0, width, height)
+        if shape_changed:
+            self._fitted = False
+            self._fit()
+        self._item.update()
+        return None
+
+    def clear_cache(self) -> None:
+        """Clear the cached tiles and levels, such as when the source data changed."""
+        self._tiles.clear()
+        self._pyramids.clear()
+        return None
+
+    def set_smooth(self, smooth: bool) -> None:
+        hint = QtGui.QPainter.RenderHint.SmoothPixmapTransform
+        self.setRenderHint(hint, smooth)
+        return None
+
+    def tile(self, level: int, ty: int, tx: int) -> NDArray[np.uint8]:
+        """
+        Rendered tile at (ty, tx) of the level, from the cache if possible.
+
+        Tiles that are not cached are read from the source in the calling thread.
+        """
+        key = self._tile_key(level, ty, tx)
+        if (arr := self._tiles.get(key)) is None:
+            arr = _read_tile(self._source, self._render, self._levels, key)
+            self._tiles.set(key, arr)
+        return arr
+
+    def ready_tile(self, level: int, ty: int, tx: int) -> NDArray[np.uint8] | None:
+        """
+        Rendered tile at (ty, tx) of the level, or None if it is not ready yet.
+
+        Tiles of the built levels are taken from memory. The others need reading the
+        source, so they are rendered in a worker and painted when they are ready.
+        """
+        if level in self._levels:
+            return self.tile(level, ty, tx)
+        if level > 0 and self._build_generation != self._generation:
+            # the pyramid is built if the source stays until the timer fires
+            if not self._build_timer.isActive():
+                self._build_timer.start()
+        key = self._tile_key(level, ty, tx)
+        if (arr := self._tiles.get(key)) is None and key not in self._tile_futures:
+            self._render_tile(key)
+        return arr
+
+    def _tile_key(self, level: int, ty: int, tx: int) -> Hashable:
+        built = level == 0 or level in self._levels
+        return (self._generation, level, built, ty, tx)
+
+    def _render_tile(self, key) -> None:
+        generation, level = key[:2]
+        source, render = self._source, self._render
+
+        def _run():
+            if generation != self._generation or level in self._levels:
+                return None  # outdated
+            arr = _read_tile(source, render, {}, key)
+            self._tiles.set(key, arr)
+            return arr
+
+        def _on_done(future: Future):
+            try:
+                self._tile_rendered.emit(key, future)
+            except RuntimeError:
+                pass  # view already deleted
+
+        self._tile_futures[key] = future = get_executor("thread").submit(_run)
+        future.add_done_callback(_on_done)
+        return None
+
+    def _on_tile_rendered(self, key, future: Future) -> None:
+        if self._tile_futures.get(key) is future:
+            del self._tile_futures[key]
+        if (
+            key[0] != self._generation
+            or future.cancelled()
+            or future.exception() is not None
+            or future.result() is None
+        ):
+            return None
+        _, level, _, ty, tx = key
+        self._item.update(self._item.tile_rect(level, ty, tx))
+        return None
+
+    def _start_build(self) -> None:
+        if self._source is None or self._build_generation == self._generation:
+            return None
+        self._build_generation = generation = self._generation
+        source, render, nlevels = self._source, self._render, self.nlevels()
+
+        def _run():
+            cancelled = lambda: generation != self._generation  # noqa: E731
+            for level, arr in _build_pyramid(source, render, nlevels, cancelled):
+                try:
+                    self._level_built.emit(generation, level, arr)
+                except RuntimeError:
+                    return  # view already deleted
+
+        self._future = get_executor("thread").submit(_run)
+        return None
+
+    def _on_level_built(self, generation: int, level: int, arr) -> None:
+        if generation != self._generation:
+            return None
+        self._levels[level] = arr
+        if self._source_key is not None:
+            self._pyramids.set((self._source_key, level), arr)
+        self._item.update()
+        return None
+
+    def _fit(self) -> None:
+        if not self._fitted and self._source is not None and self.isVisible():
+            self.fitInView(self.sceneRect(), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+            self._fitted = True
+        return None
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        self._fit()
+        return None
+
+    def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        factor = 1.25 ** (event.angleDelta().y() / 120)
+        self.scale(factor, factor)
+        return None
+
+
 class QDefaultImageView(QtW.QWidget):
+    """
+    Viewer of 2D images and stacks of them.
+
+    Images other than uint8 are rescaled to uint8 with contrast limits that are
+    common to the whole stack. The limits are estimated from sampled pixels in a
+    worker, so that the brightness does not change between planes.
+
+    Any array-like object with `shape`, `dtype` and `__getitem__` (such as dask, zarr
+    and h5py arrays) is shown without loading it into memory. Only the planes shown
+    are indexed, in a worker, and a loading indicator is shown if it is slow. Very
+    large planes are shown by `QTiledImageView`, which only indexes visible tiles.
+
+    Stacks can be played along each slider axis at a target frame rate. Frames are
+    rendered ahead in a worker, and frames that are not ready in time are dropped
+    instead of delaying the playback.
+    """
+
+    _contrast_estimated = QtCore.Signal(int, object)
+    _slice_loaded = QtCore.Signal(int, object, object)
+
     def __init__(self, model: WidgetDataModel[NDArray[np.uint8]]):
         import numpy as np
 
         super().__init__()
         layout = QtW.QVBoxLayout(self)
-        arr = np.asarray(model.value)
-        ndim = arr.ndim - 2
-        if arr.shape[-1] in (3, 4):
+        arr = model.raw_value
+        if not _is_array_like(arr) or arr.shape is None:
+            arr = np.asarray(arr)
+        ndim = len(arr.shape) - 2
+        if arr.shape[-1] in (3, 4) and ndim > 0:
             ndim -= 1
         sl_0 = (0,) * ndim
-        self._image_label = _QImageLabel(self.as_image_array(arr[sl_0]))
+        self._arr = arr
+        self._chunk_buffer: _ChunkBuffer | None = None
+        self._nspatial = len(arr.shape) - ndim
+        self._load_generation = 0
+        self._load_future: Future | None = None
+        self._slice_loaded.connect(self._on_slice_loaded)
+        self._tiled = math.prod(arr.shape[ndim : ndim + 2]) > _TILED_MIN_PIXELS
+        self._lut: tuple[Hashable, np.ndarray] | None = None
+        self._contrast_generation = 0
+        self._contrast_future: Future | None = None
+        self._contrast_estimated.connect(self._on_contrast_estimated)
+        self._slice_cache = _SliceCache()
+        self._prefetch_generation = 0
+        self._prefetch_future: Future | None = None
+        plane = _PlaneView(arr, sl_0) if self._tiled else arr[sl_0]
+        if np.dtype(arr.dtype) == np.uint8:
+            self._contrast_limits = None
+        else:
+            # the first plane is shown until the limits of the stack are estimated
+            self._contrast_limits = _estimate_contrast_limits(plane, self._nspatial)
+        self._last_index = sl_0
+        if self._tiled:
+            self._image_label = QTiledImageView()
+            self._image_label.set_source(
+                plane, self._tile_renderer(), key=(sl_0, self._contrast_limits)
+            )
+        else:
+            first = self._render_slice(plane, self._contrast_limits)
+            self._slice_cache.set((sl_0, self._contrast_limits), first)
+            self._image_label = _QImageLabel(first)
         layout.addWidget(self._image_label)
 
         self._sliders: list[QtW.QSlider] = []
+        self._play_buttons: list[QtW.QToolButton] = []
         for i in range(ndim):
             slider = QLabeledSlider(QtCore.Qt.Orientation.Horizontal)
             self._sliders.append(slider)
-            layout.addWidget(slider, alignment=QtCore.Qt.AlignmentFlag.AlignBottom)
-            slider.setRange(0, model.value.shape[i] - 1)
+            slider.setRange(0, arr.shape[i] - 1)
             slider.valueChanged.connect(self._slider_changed)
+            slider.sliderPressed.connect(self.stop)
+            play_button = QtW.QToolButton()
+            play_button.setCheckable(True)
+            play_button.setIcon(self._play_icon(False))
+            play_button.setToolTip("Play along this axis")
+            play_button.toggled.connect(
+                lambda checked, i=i: self._play_toggled(i, checked)
+            )
+            self._play_buttons.append(play_button)
+            row = QtW.QHBoxLayout()
+            row.setContentsMargins(0, 0, 0, 0)
+            row.addWidget(play_button)
+            row.addWidget(slider)
+            layout.addLayout(row)
+        self._playback: _Playback | None = None
+        self._play_generation = 0
+        self._render_ahead_future: Future | None = None
+        self._play_timer = QtCore.QTimer(self)
+        self._play_timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._play_timer.timeout.connect(self._play_next)
+        self._fps_spin_box = QtW.QSpinBox()
+        self._fps_spin_box.setRange(1, _MAX_FPS)
+        self._fps_spin_box.setValue(_DEFAULT_FPS)
+        self._fps_spin_box.setSuffix(" fps")
+        self._fps_spin_box.setToolTip("Target frame rate of the playback")
+        self._fps_spin_box.valueChanged.connect(self._fps_changed)
+        self._fps_label = QtW.QLabel()
+        self._fps_label.setVisible(False)
 
         self._interpolation_check_box = QtW.QCheckBox()
         self._interpolation_check_box.setText("smooth")
         self._interpolation_check_box.setChecked(True)
         self._interpolation_check_box.stateChanged.connect(self._interpolation_changed)
-        layout.addWidget(self._interpolation_check_box)
-        self._arr = arr
+        self._loading_label = QtW.QLabel("Loading ...")
+        self._loading_label.setVisible(False)
+        self._loading_timer = QtCore.QTimer(self)
+        self._loading_timer.setSingleShot(True)
+        self._loading_timer.setInterval(_LOADING_DELAY_MS)
+        self._loading_timer.timeout.connect(self._loading_label.show)
+        footer = QtW.QHBoxLayout()
+        footer.setContentsMargins(0, 0, 0, 0)
+        footer.addWidget(self._interpolation_check_box)
+        footer.addStretch()
+        footer.addWidget(self._loading_label)
+        footer.addWidget(self._fps_label)
+        if self._sliders:
+            footer.addWidget(self._fps_spin_box)
+        else:
+            self._fps_spin_box.setVisible(False)
+        layout.addLayout(footer)
+        if self._sliders:
+            self._start_contrast_estimate()
 
     def _slider_changed(self):
+        import numpy as np
+
         sl = tuple(sl.value() for sl in self._sliders)
-        arr = self.as_image_array(self._arr[sl])
-        self._image_label.set_array(arr)
+        if self._tiled:
+            plane = _PlaneView(self._arr, sl)
+            return self._image_label.set_source(
+                plane, self._tile_renderer(), key=(sl, self._contrast_limits)
+            )
+        self._load_generation += 1
+        key = (sl, self._contrast_limits)
+        if (arr := self._slice_cache.get(key)) is not None:
+            self._show_slice(arr)
+        elif isinstance(self._arr, np.ndarray):
+            self._show_slice(self._get_slice(sl))
+        else:
+            self._load_slice(key)
+        last = self._last_index
+        moved = [i for i, (a, b) in enumerate(zip(sl, last)) if a != b]
+        if moved and self._playback is None:
+            # prefetch ahead along the axis that moved (the playback renders ahead
+            # by itself)
+            axis = moved[0]
+            self._prefetch(sl, axis, 1 if sl[axis] > last[axis] else -1)
+        self._last_index = sl
 
-    def _interpolation_changed(self, checked: bool):
+    def play(self, axis: int = 0) -> None:
+        """Start playing the stack along the axis of the sliders."""
+        if not 0 <= axis < len(self._sliders):
+            raise ValueError(f"Invalid axis {axis} for {len(self._sliders)} sliders.")
+        self._play_generation += 1
+        index = tuple(sl.value() for sl in self._sliders)
+        self._playback = _Playback(
+            axis,
+            index,
+            self._sliders[axis].maximum() + 1,
+            self._fps_spin_box.value(),
+            self._contrast_limits,
+        )
+        for i, button in enumerate(self._play_buttons):
+            with qsignal_blocker(button):
+                button.setChecked(i == axis)
+                button.setIcon(self._play_icon(i == axis))
+        self._fps_label.setText("")
+        self._fps_label.show()
+        self._play_timer.start(max(round(1000 / self._playback.fps), 1))
+        return None
+
+    def stop(self) -> None:
+        """Stop playing the stack."""
+        if self._playback is None:
+            return None
+        self._play_generation += 1
+        self._playback = None
+        self._play_timer.stop()
+        self._fps_label.hide()
+        for button in self._play_buttons:
+            with qsignal_blocker(button):
+                button.setChecked(False)
+                button.setIcon(self._play_icon(False))
+        return None
+
+    def is_playing(self) -> bool:
+        return self._playback is not None
+
+    def _play_icon(self, playing: bool) -> QtGui.QIcon:
+        pixmap = QtW.QStyle.StandardPixmap
+        if playing:
+            return self.style().standardIcon(pixmap.SP_MediaPause)
+        return self.style().standardIcon(pixmap.SP_MediaPlay)
+
+    def _play_toggled(self, axis: int, checked: bool) -> None:
         if checked:
-            tr = QtCore.Qt.TransformationMode.SmoothTransformation
+            self.play(axis)
+        else:
+            self.stop()
+        return None
+
+    def _fps_changed(self, fps: int) -> None:
+        if (playback := self._playback) is not None:
+            self.play(playback.axis)  # restart the clock from the current frame
+        return None
+
+    def _play_next(self) -> None:
+        """Show the latest rendered frame that is due, dropping the others."""
+        playback = self._playback
+        if playback.limits != self._contrast_limits:
+            # rendered frames are outdated
+            return self.play(playback.axis)
+        now = time.perf_counter()
+        due = playback.frame_at(now)
+        if not self._tiled:
+            self._render_ahead()
+        oldest = max(playback.shown, due - _PREFETCH_SLICES - 1)
+        for frame in range(due, oldest, -1):
+            if self._tiled or self._slice_cache.contains(playback.key(frame)):
+                playback.record_shown(frame, now)
+                self._sliders[playback.axis].setValue(frame % playback.size)
+                break
+        self._fps_label.setText(f"{playback.achieved_fps():.1f} fps")
+        return None
+
+    def _render_ahead(self) -> None:
+        """Render the frames that will be due soon in a worker."""
+        if self._render_ahead_future is not None:
+            if not self._render_ahead_future.done():
+                return None
+        generation = self._play_generation
+        playback = self._playback
+
+        def _run():
+            while generation == self._play_generation:
+                now = time.perf_counter()
+                # the frame that will be due when it is rendered
+                ready = playback.frame_at(now + playback.render_time)
+                frame = max(ready, playback.rendered + 1)
+                if frame > ready + _PREFETCH_SLICES:
+                    return
+                key = playback.key(frame)
+                if not self._slice_cache.contains(key):
+                    arr = self._render_slice(self._arr[key[0]], playback.limits)
+                    self._slice_cache.set(key, arr)
+                    elapsed = time.perf_counter() - now
+                    if playback.render_time == 0:
+                        playback.render_time = elapsed
+                    else:
+                        playback.render_time += (elapsed - playback.render_time) / 4
+                playback.rendered = frame
+
+        self._render_ahead_future = get_executor("thread").submit(_run)
+        return None
+
+    def _tile_renderer(self) -> Callable[[np.ndarray], NDArray[np.uint8]]:
+        limits = self._contrast_limits
+        return lambda arr: self._to_uint8(arr, limits)
+
+    def _show_slice(self, arr: NDArray[np.uint8]) -> None:
+        self._loading_timer.stop()
+        self._loading_label.hide()
+        self._image_label.set_array(arr)
+        return None
+
+    def _load_slice(self, key: tuple[tuple[int, ...], tuple[float, float] | None]):
+        """
+        Index and render the slice of an out-of-core array in a worker.
+
+        Only the latest request is loaded. The previous one is cancelled if it has
+        not started yet, and skipped by the worker if the slider moved again.
+        """
+        generation = self._load_generation
+        index, limits = key
+
+        def _run():
+            if generation != self._load_generation:
+                return None  # the slider moved again
+            return self._render_slice(self._arr[index], limits)
+
+        def _on_done(future: Future):
+            try:
+                self._slice_loaded.emit(generation, key, future)
+            except RuntimeError:
+                pass  # viewer already deleted
+
+        if self._load_future is not None:
+            self._load_future.cancel()
+        self._load_future = future = get_executor("thread").submit(_run)
+        future.add_done_callback(_on_done)
+        if not self._loading_timer.isActive() and self._loading_label.isHidden():
+            self._loading_label.setText("Loading ...")
+            self._loading_timer.start()
+        return None
+
+    def _on_slice_loaded(self, generation: int, key, future: Future) -> None:
+        if future.cancelled():
+            return None
+        try:
+            arr = future.result()
+        except Exception as e:
+            if generation == self._load_generation:
+                self._loading_timer.stop()
+                self._loading_label.setText(f"Failed to load: {e}")
+                self._loading_label.show()
+            return None
+        if arr is None:
+            return None  # skipped
+        self._slice_cache.set(key, arr)
+        if generation == self._load_generation:
+            self._show_slice(arr)
+        return None
+
+    def _get_slice(self, index: tuple[int, ...]) -> NDArray[np.uint8]:
+        """Rendered slice at the slider indices, from the cache if possible."""
+        key = (index, self._contrast_limits)
+        if (arr := self._slice_cache.get(key)) is None:
+            arr = self._render_slice(self._arr[index], self._contrast_limits)
+            self._slice_cache.set(key, arr)
+        return arr
+
+    def _prefetch(self, index: tuple[int, ...], axis: int, direction: int) -> None:
+        """Render the next slices along `axis` in a worker."""
+        self._prefetch_generation += 1
+        generation = self._prefetch_generation
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()
+        limits, size = self._contrast_limits, self._arr.shape[axis]
+        keys = []
+        for step in range(1, _PREFETCH_SLICES + 1):
+            if not 0 <= (i := index[axis] + direction * step) < size:
+                break
+            key = (index[:axis] + (i,) + index[axis + 1 :], limits)
+            if not self._slice_cache.contains(key):
+                keys.append(key)
+        if not keys:
+            return None
+
+        def _run():
+            for key in keys:
+                if generation != self._prefetch_generation:
+                    return  # the slider moved again
+                if not self._slice_cache.contains(key):
+                    arr = self._render_slice(self._arr[key[0]], limits)
+                    self._slice_cache.set(key, arr)
+
+        self._prefetch_future = get_executor("thread").submit(_run)
+        return None
+
+    def contrast_limits(self) -> tuple[float, float] | None:
+        """Values mapped to 0 and 255, or None if the image is not rescaled."""
+        return self._contrast_limits
+
+    def set_contrast_limits(self, limits: tuple[float, float] | None) -> None:
+        """
+        Set the contrast limits. Estimation in progress is discarded.
+
+        None is only allowed for uint8 images, to show the values as they are.
+        """
+        import numpy as np
+
+        if limits is None and np.dtype(self._arr.dtype) != np.uint8:
+            raise ValueError("Contrast limits are required for non-uint8 images.")
+        self._contrast_generation += 1
+        if limits is not None:
+            lo, hi = float(limits[0]), float(limits[1])
+            if not lo < hi:
+                raise ValueError(f"Invalid contrast limits: {limits!r}")
+            limits = (lo, hi)
+        self._contrast_limits = limits
+        self._slider_changed()
+        return None
+
+    def _start_contrast_estimate(self) -> None:
+        """Estimate the contrast limits of the whole stack in a worker."""
+        if self._contrast_limits is None:
+            return None
+        self._contrast_generation += 1
+        generation = self._contrast_generation
+        if self._contrast_future is not None:
+            self._contrast_future.cancel()
+        arr, nspatial = self._arr, self._nspatial
+
+        def _on_done(future: Future):
+            if future.cancelled():
+                return
+            try:
+                self._contrast_estimated.emit(generation, future.result())
+            except RuntimeError:
+                pass  # viewer already deleted
+
+        future = get_executor("thread").submit(_estimate_contrast_limits, arr, nspatial)
+        future.add_done_callback(_on_done)
+        self._contrast_future = future
+        return None
+
+    def _on_contrast_estimated(self, generation: int, limits: tuple[float, float]):
+        if generation != self._contrast_generation or limits == self._contrast_limits:
+            return None
+        self._contrast_limits = limits
+        self._slider_changed()
+        return None
+
+    def append_chunk(self, value) -> None:
+        """Append frames streamed from a reader along the first axis."""
+        from himena.io import _ChunkBuffer
+
+        if self._chunk_buffer is None:
+            self._chunk_buffer = _ChunkBuffer()
+        self._arr = self._chunk_buffer.append(self._arr, value)
+        if self._sliders:
+            self._sliders[0].setRange(0, self._arr.shape[0] - 1)
         else:
-            tr = QtCore.Qt.TransformationMode.FastTransformation
-        self._image_label._transformation = tr
-        self._image_label._update_pixmap()
+            # rows of a 2D image
+            self._slice_cache.clear()
+            if self._tiled:
+                self._image_label.clear_cache()
+            self._slider_changed()
+        self._start_contrast_estimate()
+        return None
+
+    def _interpolation_changed(self, checked: bool):
+        self._image_label.set_smooth(bool(checked))
 
     @classmethod
     def from_model(cls, model: WidgetDataModel) -> QDefaultImageView:
@@ -112,19 +1051,118 @@ class QDefaultImageView(QtW.QWidget):
         return 400, 400
 
     def as_image_array(self, arr: np.ndarray) -> NDArray[np.uint8]:
+        """Rescale the plane to uint8 with the contrast limits."""
+        return self._to_uint8(arr, self._contrast_limits)
+
+    def _render_slice(
+        self,
+        arr: np.ndarray,
+        limits: tuple[float, float] | None,
+    ) -> NDArray[np.uint8 | np.uint16]:
+        """Array to be shown for the slice, which may be a 16-bit grayscale image."""
         import numpy as np
 
-        if arr.dtype == "uint8":
+        arr = np.asarray(arr)
+        if (
+            _HAS_GRAYSCALE16
+            and arr.ndim == 2
+            and arr.dtype.kind in "ui"
+            and arr.dtype.itemsize == 2
+            and limits is not None
+        ):
+            if arr.dtype == "uint16" and limits == (0, 65535):
+                # shown as a 16-bit grayscale image without rescaling
+                return np.ascontiguousarray(arr)
+            # the contrast is applied without losing the 16-bit precision
+            lut = self._get_lut(arr.dtype, limits, np.dtype(np.uint16))
+            return _apply_lut(lut, _lut_index(arr))
+        return self._to_uint8(arr, limits)
+
+    def _to_uint8(
+        self,
+        arr: np.ndarray,
+        limits: tuple[float, float] | None,
+    ) -> NDArray[np.uint8]:
+        import numpy as np
+
+        arr = np.asarray(arr)
+        if arr.dtype == "uint8" and limits is None:
             arr0 = arr
-        elif arr.dtype == "uint16":
-            arr0 = (arr / 256).astype("uint8")
-        elif arr.dtype.kind == "f":
-            min_ = arr.min()
-            max_ = arr.max()
-            if min_ < max_:
-                arr0 = ((arr - min_) / (max_ - min_) * 255).astype("uint8")
-            else:
-                arr0 = np.zeros(arr.shape, dtype=np.uint8)
+        elif limits is None:
+            raise ValueError(f"Contrast limits are not set for {arr.dtype} image.")
+        elif arr.dtype.kind in "ui" and arr.dtype.itemsize <= 2:
+            arr0 = _apply_lut(self._get_lut(arr.dtype, limits), _lut_index(arr))
+        elif arr.dtype.kind in "uif":
+            arr0 = _scale_and_clip(arr, *limits)
         else:
             raise ValueError(f"Unsupported data type: {arr.dtype}")
         return np.ascontiguousarray(arr0)
+
+    def _get_lut(
+        self,
+        dtype: np.dtype,
+        limits: tuple[float, float],
+        out_dtype: np.dtype | None = None,
+    ) -> np.ndarray:
+        """
+        Lookup table from every 8/16-bit value to `out_dtype` (uint8 by default),
+        cached for the limits.
+        """
+        import numpy as np
+
+        out_dtype = np.dtype(np.uint8) if out_dtype is None else out_dtype
+        key = (dtype.str, limits, out_dtype.str)
+        # local reference, as the prefetching worker may replace the table
+        if (lut := self._lut) is None or lut[0] != key:
+            info = np.iinfo(dtype)
+            values = np.arange(info.min, info.max + 1, dtype=np.float32)
+            self._lut = lut = key, _scale_and_clip(values, *limits, out_dtype)
+        return lut[1]
+
+
+def _lut_index(arr: np.ndarray) -> np.ndarray:
+    """Index of the lookup table for each value of an 8/16-bit integer array."""
+    import numpy as np
+
+    if arr.dtype.kind == "u":
+        return arr
+    # signed integers are shifted by viewing them as unsigned integers
+    unsigned = arr.view(np.dtype(f"u{arr.dtype.itemsize}"))
+    return unsigned ^ np.array(1 << (arr.dtype.itemsize * 8 - 1), dtype=unsigned.dtype)
+
+
+def _apply_lut(lut: np.ndarray, index: np.ndarray) -> NDArray[np.uint8]:
+    import numpy as np
+
+    # indices are converted to intp in chunks, to keep the temporary array small
+    index = np.ascontiguousarray(index)
+    flat = index.reshape(-1)
+    out = np.empty(flat.size, dtype=lut.dtype)
+    for start in range(0, flat.size, _LUT_CHUNK):
+        stop = start + _LUT_CHUNK
+        np.take(lut, flat[start:stop], out=out[start:stop])
+    return out.reshape(index.shape)
+
+
+def _scale_and_clip(
+    arr: np.ndarray,
+    lo: float,
+    hi: float,
+    dtype: np.dtype | None = None,
+) -> NDArray[np.uint8 | np.uint16]:
+    """
+    Map [lo, hi] to the full range of the unsigned integer `dtype` (uint8 by default)
+    in a single float buffer. NaN is mapped to 0.
+    """
+    import numpy as np
+
+    dtype = np.dtype(np.uint8) if dtype is None else dtype
+    vmax = np.iinfo(dtype).max
+    # float32 is precise enough for 8-bit output only
+    buf = np.empty(arr.shape, dtype=np.float32 if dtype.itemsize == 1 else np.float64)
+    np.subtract(arr, lo, out=buf, casting="unsafe")
+    np.multiply(buf, vmax / (hi - lo), out=buf)
+    # fmax/fmin clip the values and replace NaN at once
+    np.fmax(buf, 0, out=buf)
+    np.fmin(buf, vmax, out=buf)
+    return buf.astype(dtype)
@@ -1,18 +1,1259 @@
 from __future__ import annotations
 
+import ast
+import operator
+import re
+from typing import Any, Callable, Iterable, Sequence, TYPE_CHECKING
 from qtpy import QtWidgets as QtW
 from qtpy import QtGui, QtCore
 from himena.consts import StandardTypes
-from himena.types import WidgetDataModel
+from himena.types import FileStamp, TableChanges, TableMeta, WidgetDataModel
 from himena.qt._qfinderwidget import QTableFinderWidget
+from himena.builtins.qt.widgets._undo import UndoableEdit, UndoJournal
 
+if TYPE_CHECKING:
+    from pathlib import Path
+    import numpy as np
+    from himena.io import _ChunkBuffer
 
-class QDefaultTableWidget(QtW.QTableWidget):
+_DisplayRole = QtCore.Qt.ItemDataRole.DisplayRole
+_EditRole = QtCore.Qt.ItemDataRole.EditRole
+_FETCH_ROWS = 10000  # number of rows exposed to the view per fetch
+_OBJECT_ITEM_BYTES = 64  # rough size of a Python object in an object array
+_BLOCK_ROWS = 4096  # rows of a read-only array copied at once when edited
+
+
+class _TableData:
+    """Interface of the data behind a table model."""
+
+    value: Any
+    nrows: int
+    ncols: int
+
+    def get(self, row: int, column: int) -> Any:
+        raise NotImplementedError
+
+    def set(self, row: int, column: int, text: str) -> bool:
+        """Set a string to the cell. Return False if the string is not valid."""
+        raise NotImplementedError
+
+    def column(self, column: int) -> np.ndarray:
+        """Return the column as a 1D array. Short columns are not padded."""
+        raise NotImplementedError
+
+    def set_column(self, rows: np.ndarray, column: int, texts: list[str]) -> None:
+        """Set strings to the cells at `rows` of the column."""
+        for row, text in zip(rows.tolist(), texts):
+            self.set(row, column, text)
+        return None
+
+    def set_block(self, rows: np.ndarray, column: int, block: list[list[str]]) -> None:
+        """Set each line of `block` to each of `rows`. Invalid strings are ignored."""
+        ncols = min(max(map(len, block), default=0), self.ncols - column)
+        for j in range(ncols):
+            if all(j < len(line) for line in block):
+                self.set_column(rows, column + j, [line[j] for line in block])
+            else:
+                for row, line in zip(rows.tolist(), block):
+                    if j < len(line):
+                        self.set(row, column + j, line[j])
+        return None
+
+    def values(self, rows: np.ndarray, column: int) -> tuple[np.ndarray, np.ndarray]:
+        """Copy of the values at `rows` of the column, with the rows in the column."""
+        import numpy as np
+
+        values = [self.get(row, column) for row in rows.tolist()]
+        return rows, np.array(values, dtype=object)
+
+    def set_values(self, rows: np.ndarray, column: int, values: np.ndarray) -> None:
+        """Restore the values returned by `values`."""
+        raise NotImplementedError
+
+    def full_column(self, column: int) -> np.ndarray:
+        """Return the column padded to `nrows`."""
+        import numpy as np
+
+        values = np.asarray(self.column(column))
+        if (npad := self.nrows - values.shape[0]) == 0:
+            return values
+        if values.dtype.kind == "f":
+            return np.concatenate([values, np.full(npad, np.nan)])
+        return np.concatenate([_as_str_array(values), np.zeros(npad, dtype=str)])
+
+    def export(self) -> Any:
+        """
+        Return the value to be shared outside the table.
+
+        The value is no longer owned by this object, so that it is copied again before
+        the next edit instead of being modified in place.
+        """
+        raise NotImplementedError
+
+    def concat(self, value) -> _TableData:
+        """Return a new table data with rows of `value` appended."""
+        from himena.io import _concat_chunks
+
+        return _table_data(_concat_chunks([self.value, value]))
+
+
+class _RowsData(_TableData):
+    """List of rows. Rows may have different lengths."""
+
+    def __init__(self, rows: list[list[Any]]):
+        self.value = rows
+        self.nrows = len(rows)
+        self.ncols = max((len(row) for row in rows), default=0)
+        self._owned_rows: set[int] | None = None
+
+    def get(self, row: int, column: int) -> Any:
+        values = self.value[row]
+        return values[column] if column < len(values) else ""
+
+    def set(self, row: int, column: int, text: str) -> bool:
+        self._set_raw(row, column, text)
+        return True
+
+    def set_values(self, rows: np.ndarray, column: int, values: np.ndarray) -> None:
+        for row, value in zip(rows.tolist(), values.tolist()):
+            self._set_raw(row, column, value)
+        return None
+
+    def _set_raw(self, row: int, column: int, value: Any) -> None:
+        # rows may be shared with other data models
+        if self._owned_rows is None:
+            self.value = list(self.value)
+            self._owned_rows = set()
+        if row not in self._owned_rows:
+            self.value[row] = list(self.value[row])
+            self._owned_rows.add(row)
+        values = self.value[row]
+        if column >= len(values):
+            values.extend([""] * (column + 1 - len(values)))
+        values[column] = value
+        return None
+
+    def column(self, column: int) -> np.ndarray:
+        import numpy as np
+
+        values = [row[column] if column < len(row) else "" for row in self.value]
+        return np.array(values, dtype=object)
+
+    def export(self) -> list[list[Any]]:
+        self._owned_rows = None
+        return self.value
+
+    def concat(self, value) -> _TableData:
+        if not isinstance(value, list):
+            return super().concat(value)
+        # the list is extended in place once it is owned
+        rows = list(self.value) if self._owned_rows is None else self.value
+        rows.extend(value)
+        new = _RowsData([])
+        new.value = rows
+        new.nrows = len(rows)
+        new.ncols = max(self.ncols, max((len(row) for row in value), default=0))
+        new._owned_rows = self._owned_rows or set()
+        return new
+
+
+class _ArrayData(_TableData):
+    """
+    1D or 2D array. The array is copied when it is edited for the first time.
+
+    Memory-mapped and other read-only arrays may be much larger than the memory, so
+    only the blocks of rows that are edited are copied, as an overlay on the array.
+    """
+
+    def __init__(self, arr: np.ndarray):
+        self.value = arr
+        self.nrows = arr.shape[0]
+        self.ncols = 1 if arr.ndim == 1 else arr.shape[1]
+        self._owned = False
+        self._buffer: _ChunkBuffer | None = None
+        self._blocks: dict[int, np.ndarray] = {}  # block index -> edited rows
+
+    def get(self, row: int, column: int) -> Any:
+        arr, row = self._array_at(row)
+        if arr.ndim == 1:
+            return arr[row]
+        return arr[row, column]
+
+    def set(self, row: int, column: int, text: str) -> bool:
+        if self._use_blocks():
+            block, arr = self._block_at(row)
+            key = row - block * _BLOCK_ROWS
+            key = key if arr.ndim == 1 else (key, column)
+            if (arr := _set_array_item(arr, key, text, True)) is None:
+                return False
+            self._blocks[block] = arr
+            return True
+        key = row if self.value.ndim == 1 else (row, column)
+        if (arr := _set_array_item(self.value, key, text, self._owned)) is None:
+            return False
+        self.value = arr
+        self._owned = True
+        return True
+
+    def column(self, column: int) -> np.ndarray:
+        import numpy as np
+
+        if self._blocks:
+            return self.values(np.arange(self.nrows), column)[1]
+        if self.value.ndim == 1:
+            return self.value
+        return self.value[:, column]
+
+    def set_column(self, rows: np.ndarray, column: int, texts: list[str]) -> None:
+        import numpy as np
+
+        if self._use_blocks():
+            blocks = rows // _BLOCK_ROWS
+            for block in np.unique(blocks).tolist():
+                sel = blocks == block
+                block_texts = [text for text, ok in zip(texts, sel.tolist()) if ok]
+                _, arr = self._block_at(block * _BLOCK_ROWS)
+                key = rows[sel] - block * _BLOCK_ROWS
+                key = key if arr.ndim == 1 else (key, column)
+                if (arr := _set_array_slice(arr, key, block_texts, True)) is None:
+                    for row, text in zip(rows[sel].tolist(), block_texts):
+                        self.set(row, column, text)
+                else:
+                    self._blocks[block] = arr
+            return None
+        key = rows if self.value.ndim == 1 else (rows, column)
+        arr = _set_array_slice(self.value, key, texts, self._owned)
+        if arr is None:
+            return super().set_column(rows, column, texts)
+        self.value = arr
+        self._owned = True
+        return None
+
+    def values(self, rows: np.ndarray, column: int) -> tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+
+        key = rows if self.value.ndim == 1 else (rows, column)
+        if not self._blocks:
+            return rows, self.value[key]
+        out = np.asarray(self.value[key]).astype(self._merged_dtype())
+        blocks = rows // _BLOCK_ROWS
+        for block, arr in self._blocks.items():
+            if (sel := blocks == block).any():
+                index = rows[sel] - block * _BLOCK_ROWS
+                out[sel] = arr[index] if arr.ndim == 1 else arr[index, column]
+        return rows, out
+
+    def set_values(self, rows: np.ndarray, column: int, values: np.ndarray) -> None:
+        import numpy as np
+
+        if self._use_blocks():
+            blocks = rows // _BLOCK_ROWS
+            for block in np.unique(blocks).tolist():
+                sel = blocks == block
+                _, arr = self._block_at(block * _BLOCK_ROWS)
+                key = rows[sel] - block * _BLOCK_ROWS
+                key = key if arr.ndim == 1 else (key, column)
+                self._blocks[block] = _set_array_values(arr, key, values[sel], True)
+            return None
+        key = rows if self.value.ndim == 1 else (rows, column)
+        self.value = _set_array_values(self.value, key, values, self._owned)
+        self._owned = True
+        return None
+
+    def export(self) -> np.ndarray:
+        if self._blocks:
+            # a new array, so that the blocks are still owned
+            return self._merged()
+        self._owned = False
+        return self.value
+
+    def concat(self, value) -> _TableData:
+        from himena.io import _ChunkBuffer
+
+        if not hasattr(value, "shape"):
+            return super().concat(value)
+        if self._blocks:
+            self.value, self._blocks, self._owned = self._merged(), {}, True
+        buffer = self._buffer or _ChunkBuffer()
+        arr = buffer.append(self.value, value)
+        new = _ArrayData(arr)
+        new._buffer = buffer
+        # rows read so far are still shared if they were not copied to a new buffer
+        new._owned = self._owned or not _shares_buffer(arr, self.value)
+        return new
+
+    def _use_blocks(self) -> bool:
+        import numpy as np
+
+        arr = self.value
+        return not self._owned and (
+            isinstance(arr, np.memmap) or not arr.flags.writeable
+        )
+
+    def _array_at(self, row: int) -> tuple[np.ndarray, int]:
+        """The array that has the row, and the index of the row in it."""
+        block = row // _BLOCK_ROWS
+        if (arr := self._blocks.get(block)) is not None:
+            return arr, row - block * _BLOCK_ROWS
+        return self.value, row
+
+    def _block_at(self, row: int) -> tuple[int, np.ndarray]:
+        """Index and the in-memory copy of the block of rows that has the row."""
+        import numpy as np
+
+        block = row // _BLOCK_ROWS
+        if (arr := self._blocks.get(block)) is None:
+            start = block * _BLOCK_ROWS
+            arr = np.array(self.value[start : start + _BLOCK_ROWS])
+        return block, arr
+
+    def _merged(self) -> np.ndarray:
+        """A new array with the edited blocks."""
+        import numpy as np
+
+        out = np.array(self.value, dtype=self._merged_dtype())
+        for block, arr in self._blocks.items():
+            out[block * _BLOCK_ROWS : block * _BLOCK_ROWS + arr.shape[0]] = arr
+        return out
+
+    def _merged_dtype(self) -> np.dtype:
+        import numpy as np
+
+        dtypes = [arr.dtype for arr in self._blocks.values()]
+        return np.result_type(self.value.dtype, *dtypes)
+
+
+class _ColumnsData(_TableData):
+    """Dict of columns. Each column is copied when it is edited for the first time."""
+
+    def __init__(self, columns: dict[str, Any]):
+        import numpy as np
+
+        self.value = {key: np.asarray(column) for key, column in columns.items()}
+        self._keys = list(self.value.keys())
+        self.nrows = max((len(column) for column in self.value.values()), default=0)
+        self.ncols = len(self._keys)
+        self._owned: set[str] = set()
+        self._buffers: dict[str, _ChunkBuffer] = {}
+
+    def get(self, row: int, column: int) -> Any:
+        values = self.value[self._keys[column]]
+        return values[row] if row < len(values) else ""
+
+    def set(self, row: int, column: int, text: str) -> bool:
+        key = self._keys[column]
+        values = self.value[key]
+        if row >= len(values):
+            return False
+        owned = key in self._owned
+        if (values := _set_array_item(values, row, text, owned)) is None:
+            return False
+        self.value[key] = values
+        self._owned.add(key)
+        return True
+
+    def column(self, column: int) -> np.ndarray:
+        return self.value[self._keys[column]]
+
+    def set_column(self, rows: np.ndarray, column: int, texts: list[str]) -> None:
+        key = self._keys[column]
+        values = self.value[key]
+        if not (valid := rows < len(values)).all():
+            rows = rows[valid]
+            texts = [text for text, ok in zip(texts, valid.tolist()) if ok]
+        values = _set_array_slice(values, rows, texts, key in self._owned)
+        if values is None:
+            return super().set_column(rows, column, texts)
+        self.value[key] = values
+        self._owned.add(key)
+        return None
+
+    def values(self, rows: np.ndarray, column: int) -> tuple[np.ndarray, np.ndarray]:
+        values = self.value[self._keys[column]]
+        rows = rows[rows < len(values)]
+        return rows, values[rows]
+
+    def set_values(self, rows: np.ndarray, column: int, values: np.ndarray) -> None:
+        key = self._keys[column]
+        owned = key in self._owned
+        self.value[key] = _set_array_values(self.value[key], rows, values, owned)
+        self._owned.add(key)
+        return None
+
+    def keys(self) -> list[str]:
+        return self._keys
+
+    def export(self) -> dict[str, np.ndarray]:
+        self._owned.clear()
+        return dict(self.value)
+
+    def concat(self, value) -> _TableData:
+        from himena.io import _ChunkBuffer
+
+        if (
+            not isinstance(value, dict)
+            or list(value.keys()) != self._keys
+            or any(len(column) != self.nrows for column in self.value.values())
+        ):
+            return super().concat(value)
+        columns: dict[str, np.ndarray] = {}
+        owned: set[str] = set()
+        for key, old in self.value.items():
+            buffer = self._buffers.setdefault(key, _ChunkBuffer())
+            columns[key] = buffer.append(old, value[key])
+            if key in self._owned or not _shares_buffer(columns[key], old):
+                owned.add(key)
+        new = _ColumnsData(columns)
+        new._owned = owned
+        new._buffers = self._buffers
+        return new
+
+
+def _shares_buffer(arr: np.ndarray, old: np.ndarray) -> bool:
+    return arr.base is not None and arr.base is old.base
+
+
+def _table_data(value) -> _TableData:
+    import numpy as np
+
+    if isinstance(value, dict):
+        return _ColumnsData(value)
+    if isinstance(value, np.ndarray):
+        if value.ndim not in (1, 2):
+            raise ValueError(f"Table must be 1D or 2D, got {value.ndim}D array.")
+        return _ArrayData(value)
+    return _RowsData(list(value))
+
+
+def _set_array_item(arr: np.ndarray, key, text: str, owned: bool) -> np.ndarray | None:
+    """Set the parsed string to the array, copying the array if not owned."""
+    import numpy as np
+
+    kind = arr.dtype.kind
+    try:
+        if kind == "U":
+            value = text
+            if len(text) > arr.dtype.itemsize // 4:
+                # fixed-width strings must be widened to avoid truncation
+                arr, owned = arr.astype(f"<U{len(text)}"), True
+        elif kind in "iu":
+            value = int(text)
+        elif kind == "f":
+            value = float(text) if text.strip() else np.nan
+        elif kind == "b":
+            if text.strip().lower() not in ("true", "false"):
+                return None
+            value = text.strip().lower() == "true"
+        elif kind == "O":
+            value = text
+        else:
+            value = arr.dtype.type(text)
+        if not owned:
+            arr = np.array(arr)
+        arr[key] = value
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return arr
+
+
+def _find_in_table(
+    data: _TableData,
+    pattern: str,
+    regex: bool = False,
+    case_sensitive: bool = False,
+    cancelled: Callable[[], bool] = lambda: False,
+) -> np.ndarray | None:
+    """
+    Find cells whose text contains `pattern`.
+
+    Columns are searched one by one with NumPy string operations (or a compiled
+    regular expression) and the hits are returned as sorted flat indices
+    ``row * ncols + column``. None is returned if `cancelled` returns True.
+    """
+    import numpy as np
+
+    if regex:
+        flags = 0 if case_sensitive else re.IGNORECASE
+        search = re.compile(pattern, flags).search
+    elif not case_sensitive:
+        pattern = pattern.lower()
+    hits = []
+    for c in range(data.ncols):
+        if cancelled():
+            return None
+        texts = _as_str_array(data.column(c))
+        if regex:
+            matched = np.fromiter(
+                (search(text) is not None for text in texts.tolist()),
+                dtype=np.bool_,
+                count=texts.size,
+            )
+        else:
+            if not case_sensitive:
+                texts = np.char.lower(texts)
+            matched = np.char.find(texts, pattern) >= 0
+        hits.append(np.flatnonzero(matched) * data.ncols + c)
+    if not hits:
+        return np.zeros(0, dtype=np.intp)
+    return np.sort(np.concatenate(hits))
+
+
+def _as_str_array(values: np.ndarray) -> np.ndarray:
+    """Convert a column to a unicode array with the same text as `_format_value`."""
+    import numpy as np
+
+    if values.dtype.kind == "S":
+        return np.char.decode(values, errors="replace")
+    if values.dtype.kind == "O":
+        return np.array([_format_value(v) for v in values.tolist()], dtype=str)
+    return values.astype(str)
+
+
+def _set_array_slice(
+    arr: np.ndarray, key, texts: list[str], owned: bool
+) -> np.ndarray | None:
+    """Vectorized version of `_set_array_item`. None if any string is invalid."""
+    import numpy as np
+
+    kind = arr.dtype.kind
+    strings = np.array(texts, dtype=str)
+    try:
+        if kind == "U":
+            values = strings
+            if strings.dtype.itemsize > arr.dtype.itemsize:
+                arr, owned = arr.astype(strings.dtype), True
+        elif kind == "f":
+            empty = np.char.str_len(np.char.strip(strings)) == 0
+            values = np.where(empty, "nan", strings).astype(arr.dtype)
+        elif kind == "b":
+            lowered = np.char.lower(np.char.strip(strings))
+            values = lowered == "true"
+            if not np.all(values | (lowered == "false")):
+                return None
+        elif kind == "O":
+            values = np.array(texts, dtype=object)
+        else:
+            values = strings.astype(arr.dtype)
+        if not owned:
+            arr = np.array(arr)
+        arr[key] = values
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return arr
+
+
+def _sort_rows(
+    data: _TableData, keys: list[tuple[int, bool]], rows: np.ndarray | None
+) -> np.ndarray | None:
+    """
+    Stable sort of `rows` (all the rows if None) by the (column, ascending) keys.
+
+    The first key is the primary key. Only the index array is permuted.
+    """
+    import numpy as np
+
+    for column, ascending in reversed(keys):
+        values = data.full_column(column)
+        if rows is not None:
+            values = values[rows]
+        try:
+            perm = _stable_argsort(values, ascending)
+        except TypeError:
+            # mixed objects that cannot be compared
+            perm = _stable_argsort(_as_str_array(values), ascending)
+        rows = perm if rows is None else rows[perm]
+    return rows
+
+
+def _stable_argsort(values: np.ndarray, ascending: bool) -> np.ndarray:
+    import numpy as np
+
+    if not ascending:
+        # sorting the reversed array and reversing the result keeps equal values in
+        # their original order
+        perm = _stable_argsort(values[::-1], True)
+        return (values.shape[0] - 1 - perm)[::-1]
+    n = values.shape[0]
+    if values.dtype.kind in "biu" and n > 0:
+        lo, hi = int(values.min()), int(values.max())
+        if hi < 2**63 and (hi - lo + 1) * n < 2**63:
+            # pack (value, index) into one integer; np.sort is much faster than
+            # np.argsort(kind="stable")
+            keys = (values.astype(np.int64) - lo) * n + np.arange(n)
+            return np.sort(keys) % n
+    if values.dtype.kind == "f":
+        return _argsort_floats(values)
+    perm = np.argsort(values)  # not stable
+    sorted_values = values[perm]
+    ties = sorted_values[1:] == sorted_values[:-1]
+    if values.dtype.kind in "fc":
+        ties |= np.isnan(sorted_values[1:]) & np.isnan(sorted_values[:-1])
+    if not ties.any():
+        return perm
+    # order the indices within each run of equal values
+    runs = np.concatenate([[0], np.cumsum(~ties)])
+    return np.sort(runs * n + perm) % n
+
+
+def _argsort_floats(values: np.ndarray) -> np.ndarray:
+    """
+    Stable argsort of floats by sorting integers.
+
+    Floats are mapped to integers of the same order and the lower bits are replaced
+    with the indices, so that one np.sort gives the order. Values that only differ
+    in the replaced bits are sorted again with np.lexsort.
+    """
+    import numpy as np
+
+    n = values.shape[0]
+    nbits = np.uint64(max(n - 1, 1).bit_length())
+    # NaNs are sorted last and -0.0 is the same as 0.0, as np.argsort does
+    values = np.where(np.isnan(values), np.nan, values.astype(np.float64) + 0.0)
+    bits = values.view(np.uint64)
+    sign = np.uint64(1 << 63)
+    keys = np.where(bits & sign, ~bits, bits | sign)
+    keys >>= nbits
+    keys <<= nbits
+    keys |= np.arange(n, dtype=np.uint64)
+    keys.sort()
+    perm = (keys & ((np.uint64(1) << nbits) - np.uint64(1))).astype(np.intp)
+    high = keys >> nbits
+    same = high[1:] == high[:-1]
+    if same.any():
+        in_run = np.zeros(n, dtype=np.bool_)
+        in_run[1:] |= same
+        in_run[:-1] |= same
+        positions = np.flatnonzero(in_run)
+        run_ids = np.cumsum(np.concatenate([[True], ~same]))[positions]
+        sub = perm[positions]
+        perm[positions] = sub[np.lexsort((sub, values[sub], run_ids))]
+    return perm
+
+
+_FILTER_OPS = {
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _eval_filter(
+    expr: str, data: _TableData, column_names: list[str] | None
+) -> np.ndarray:
+    """
+    Evaluate a filter expression such as ``"x > 3 and name != 'a'"`` to a mask.
+
+    Columns are referred by their names or by ``col[i]`` with a 0-based index.
+    Only comparisons, arithmetic and logical operators are allowed.
+    """
+    import numpy as np
+
+    names = {name: i for i, name in enumerate(column_names or [])}
+
+    def _column(key) -> np.ndarray:
+        if isinstance(key, int) and 0 <= key < data.ncols:
+            return data.full_column(key)
+        if isinstance(key, str) and key in names:
+            return data.full_column(names[key])
+        raise ValueError(f"Column {key!r} not found.")
+
+    def _eval(node: ast.AST):
+        if isinstance(node, ast.Expression):
+            return _eval(node.body)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return _column(node.id)
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == "col"
+        ):
+            return _column(_eval(node.slice))
+        if isinstance(node, ast.BoolOp):
+            func = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return func.reduce([_eval(each) for each in node.values])
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return np.logical_not(_eval(node.operand))
+            if isinstance(node.op, ast.USub):
+                return -_eval(node.operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in _FILTER_OPS:
+            return _FILTER_OPS[type(node.op)](_eval(node.left), _eval(node.right))
+        if isinstance(node, ast.Compare):
+            out, left = True, _eval(node.left)
+            for op, each in zip(node.ops, node.comparators):
+                if type(op) not in _FILTER_OPS:
+                    break
+                right = _eval(each)
+                out = np.logical_and(out, _FILTER_OPS[type(op)](left, right))
+                left = right
+            else:
+                return out
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)!r}")
+
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter expression: {expr!r}") from e
+    try:
+        mask = np.asarray(_eval(tree))
+    except ValueError:
+        raise
+    except Exception as e:
+        # such as comparison of strings and numbers
+        raise ValueError(f"Cannot evaluate filter expression {expr!r}: {e}") from e
+    if mask.dtype.kind != "b":
+        raise ValueError(f"Filter expression {expr!r} did not give booleans.")
+    if mask.ndim > 1 or mask.size not in (1, data.nrows):
+        raise ValueError(f"Filter expression {expr!r} did not give one value per row.")
+    return np.broadcast_to(mask, (data.nrows,))
+
+
+def _set_array_values(
+    arr: np.ndarray, key, values: np.ndarray, owned: bool
+) -> np.ndarray:
+    """Set values of the same kind to the array, copying the array if not owned."""
+    import numpy as np
+
+    if arr.dtype.kind == "U" and values.dtype.itemsize > arr.dtype.itemsize:
+        arr, owned = arr.astype(values.dtype), True
+    if not owned:
+        arr = np.array(arr)
+    arr[key] = values
+    return arr
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return str(value)
+
+
+def _compact_rows(rows: np.ndarray) -> range | np.ndarray:
+    """Store consecutive row indices as a range."""
+    import numpy as np
+
+    if rows.size > 0 and rows[-1] - rows[0] == rows.size - 1:
+        if rows.size == 1 or np.all(np.diff(rows) == 1):
+            return range(int(rows[0]), int(rows[-1]) + 1)
+    return rows
+
+
+def _expand_rows(rows: range | np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    if isinstance(rows, range):
+        return np.arange(rows.start, rows.stop)
+    return rows
+
+
+def _merge_row_ranges(
+    ranges: list[tuple[int, int]], rows: np.ndarray
+) -> list[tuple[int, int]]:
+    """Add row indices to sorted (start, stop) ranges, merging adjacent ranges."""
+    import numpy as np
+
+    rows = np.unique(rows)
+    if rows.size > 0:
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        starts = rows[np.concatenate([[0], breaks])].tolist()
+        stops = (rows[np.concatenate([breaks - 1, [rows.size - 1]])] + 1).tolist()
+    else:
+        starts = stops = []
+    merged: list[tuple[int, int]] = []
+    for start, stop in sorted([*ranges, *zip(starts, stops)]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+_Segment = "tuple[range | np.ndarray, int, np.ndarray]"
+
+
+class _TableEdit(UndoableEdit[_Segment]):
+    """Edit of table cells. Each segment is (data rows, column, old values)."""
+
+    _target: QTableDataModel
+
+    def _revert_segment(self, segment: _Segment) -> _Segment:
+        rows, column, values = segment
+        rows = _expand_rows(rows)
+        self._target._mark_edited(rows, [column])
+        data = self._target._data
+        _, current = data.values(rows, column)
+        data.set_values(rows, column, values)
+        return _compact_rows(rows), column, current
+
+    def _segment_nbytes(self, segment: _Segment) -> int:
+        rows, _, values = segment
+        nbytes = values.nbytes
+        if values.dtype.kind == "O":
+            nbytes += values.size * _OBJECT_ITEM_BYTES
+        if not isinstance(rows, range):
+            nbytes += rows.nbytes
+        return nbytes
+
+    def _finish_revert(self) -> None:
+        self._target._emit_all_changed()
+        return None
+
+
+class QTableDataModel(QtCore.QAbstractTableModel):
+    """
+    Table model backed directly by the table data.
+
+    The data can be a 1D or 2D array, a dict of columns or a list of rows. Only the
+    cells requested by the view are formatted as strings, and the data is copied only
+    when (a part of) it is edited for the first time. Rows are exposed to the view
+    block by block as it scrolls down (see `canFetchMore` and `fetchMore`).
+
+    Sorting and filtering never touch the data. They only update an index array
+    that maps the rows of the view to the rows of the data.
+
+    Edited row ranges are tracked since the table was last saved (see `changes`), so
+    that writers can update only the changed part of the file.
+    """
+
+    # (start, stop) ranges of data rows and the columns whose values were changed
+    # or appended
+    rowsChanged = QtCore.Signal(list, list)
+
+    def __init__(self, value, column_names: list[str] | None = None, parent=None):
+        super().__init__(parent)
+        self._data = _table_data(value)
+        self._column_names = column_names
+        self._order: np.ndarray | None = None  # view row -> data row
+        self._sort_keys: list[tuple[int, bool]] = []
+        self._filter_expr: str | None = None
+        self._nloaded = min(self._data.nrows, _FETCH_ROWS)
+        self._journal = UndoJournal()
+        self._nrows_saved = self._data.nrows
+        self._edited_rows: list[tuple[int, int]] = []
+        self._structure_changed = False
+        self._saved_file: FileStamp | None = None
+
+    @property
+    def value(self):
+        """
+        The backing data in the same form as it was given.
+
+        Edits of read-only arrays are not included (see `snapshot`).
+        """
+        return self._data.value
+
+    def snapshot(self):
+        """The backing data that will not be modified by the later edits."""
+        return self._data.export()
+
+    def column_names(self) -> list[str] | None:
+        """Names of the columns, or None if the table has no header."""
+        return self._column_names
+
+    def rowCount(self, parent=None) -> int:
+        return self._nloaded
+
+    def total_row_count(self) -> int:
+        """Number of rows to show, including rows not fetched yet."""
+        if self._order is None:
+            return self._data.nrows
+        return self._order.size
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return not parent.isValid() and self._nloaded < self.total_row_count()
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if not parent.isValid():
+            self.fetch_rows(self._nloaded + _FETCH_ROWS)
+        return None
+
+    def fetch_rows(self, nrows: int) -> None:
+        """Expose the first `nrows` rows to the view."""
+        nrows = min(nrows, self.total_row_count())
+        if nrows > self._nloaded:
+            self.beginInsertRows(QtCore.QModelIndex(), self._nloaded, nrows - 1)
+            self._nloaded = nrows
+            self.endInsertRows()
+        return None
+
+    def columnCount(self, parent=None) -> int:
+        return self._data.ncols
+
+    def source_row(self, row: int) -> int:
+        """Row of the backing data shown at `row` of the view."""
+        if self._order is None:
+            return row
+        return int(self._order[row])
+
+    def _source_rows(self, start: int, stop: int) -> np.ndarray:
+        import numpy as np
+
+        if self._order is None:
+            return np.arange(start, stop)
+        return self._order[start:stop]
+
+    def column_values(self, column: int) -> np.ndarray:
+        """Values of the column in the order of the data, not sorted nor filtered."""
+        return self._data.column(column)
+
+    def cell_text(self, row: int, column: int) -> str:
+        """Text of the cell at (row, column)."""
+        return _format_value(self._data.get(self.source_row(row), column))
+
+    def find(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        cancelled: Callable[[], bool] = lambda: False,
+    ) -> np.ndarray | None:
+        """
+        Sorted flat indices (row * ncols + column) of the cells containing pattern.
+
+        All the rows are searched, including those not fetched yet. This method is
+        thread-safe as long as the table is not edited in the meantime.
+        """
+        import numpy as np
+
+        data, order = self._data, self._order
+        hits = _find_in_table(data, pattern, regex, case_sensitive, cancelled)
+        if hits is None or order is None:
+            return hits
+        # convert to the rows of the view
+        rows, columns = np.divmod(hits, data.ncols)
+        inverse = np.full(data.nrows, -1, dtype=np.intp)
+        inverse[order] = np.arange(order.size)
+        rows = inverse[rows]
+        shown = rows >= 0
+        return np.sort(rows[shown] * data.ncols + columns[shown])
+
+    def set_cell_text(self, row: int, column: int, text: str) -> bool:
+        """Set text to the cell without emitting signals. False if text is invalid."""
+        return self._data.set(self.source_row(row), column, text)
+
+    def set_block(self, row: int, column: int, block: list[list[str]]) -> None:
+        """
+        Set a block of strings at once and emit `dataChanged` only once.
+
+        Strings that cannot be converted to the data type of the cell are ignored.
+        Cells out of the table are also ignored. The edit can be undone.
+        """
+        nrows = self.total_row_count()
+        if not block or row >= nrows or column >= self._data.ncols:
+            return None
+        block = block[: nrows - row]
+        rows = self._source_rows(row, row + len(block))
+        nc = min(max(map(len, block)), self._data.ncols - column)
+        edit = self._record_edit(rows, range(column, column + nc))
+        self._data.set_block(rows, column, block)
+        self._mark_edited(rows, list(range(column, column + nc)))
+        self._journal.push(edit)
+        self.dataChanged.emit(
+            self.index(row, column),
+            self.index(row + len(block) - 1, column + nc - 1),
+        )
+        return None
+
+    def _record_edit(self, rows: np.ndarray, columns: Iterable[int]) -> _TableEdit:
+        segments = []
+        for column in columns:
+            rows_in_column, values = self._data.values(rows, column)
+            segments.append((_compact_rows(rows_in_column), column, values))
+        return _TableEdit(self, segments)
+
+    def _mark_edited(self, rows: np.ndarray, columns: list[int]) -> None:
+        if rows.size == 0:
+            return None
+        self.rowsChanged.emit(_merge_row_ranges([], rows), columns)
+        rows = rows[rows < self._nrows_saved]
+        if rows.size > 0:
+            self._edited_rows = _merge_row_ranges(self._edited_rows, rows)
+        return None
+
+    def changes(self) -> TableChanges:
+        """Changes of the data since the table was last saved."""
+        return TableChanges(
+            nrows_saved=self._nrows_saved,
+            edited_rows=self._edited_rows,
+            structure_changed=self._structure_changed,
+            saved_file=self._saved_file,
+        )
+
+    def mark_saved(self) -> None:
+        """Mark the current data as saved to the file."""
+        self._nrows_saved = self._data.nrows
+        self._edited_rows = []
+        self._structure_changed = False
+        return None
+
+    def set_saved_file(self, saved_file: FileStamp | None) -> None:
+        """Set the file the saved rows are in, or None if it is not known."""
+        self._saved_file = saved_file
+        return None
+
+    def restore_changes(self, changes: TableChanges) -> None:
+        """Restore the changes of a save that failed, in addition to the new ones."""
+        import numpy as np
+
+        self._nrows_saved = min(self._nrows_saved, changes.nrows_saved)
+        edited = _merge_row_ranges(
+            self._edited_rows + changes.edited_rows, np.zeros(0, dtype=np.intp)
+        )
+        self._edited_rows = [
+            (start, min(stop, self._nrows_saved))
+            for start, stop in edited
+            if start < self._nrows_saved
+        ]
+        self._structure_changed = self._structure_changed or changes.structure_changed
+        return None
+
+    def undo_journal(self) -> UndoJournal:
+        """The journal of the edits of this table."""
+        return self._journal
+
+    def undo(self) -> bool:
+        """Undo the last edit. Return False if there is nothing to undo."""
+        return self._journal.undo()
+
+    def redo(self) -> bool:
+        """Redo the last undone edit. Return False if there is nothing to redo."""
+        return self._journal.redo()
+
+    def _emit_all_changed(self) -> None:
+        if self.rowCount() > 0 and self.columnCount() > 0:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+            )
+        return None
+
+    def to_tsv(
+        self,
+        rows: Sequence[int],
+        columns: Sequence[int],
+        mask: np.ndarray | None = None,
+    ) -> str:
+        """
+        Tab-separated text of the cells at the product of `rows` and `columns`.
+
+        If a boolean `mask` of shape (len(rows), len(columns)) is given, the cells
+        where it is False are left empty.
+        """
+        import numpy as np
+
+        rows = np.asarray(rows, dtype=np.intp)
+        if self._order is not None:
+            rows = self._order[rows]
+        texts: list[list[str]] = []
+        for j, c in enumerate(columns):
+            column = np.asarray(self._data.column(c))
+            valid = rows < column.shape[0]
+            if mask is not None:
+                valid = valid & mask[:, j]
+            if valid.all():
+                texts.append(_as_str_array(column[rows]).tolist())
+            else:
+                # short columns and unselected cells are padded with empty strings
+                found = _as_str_array(column[rows[valid]])
+                padded = np.zeros(rows.size, dtype=found.dtype)
+                padded[valid] = found
+                texts.append(padded.tolist())
+        return "\n".join(map("\t".join, zip(*texts)))
+
+    def sort_keys(self) -> list[tuple[int, bool]]:
+        """List of (column, ascending) used to sort the rows."""
+        return list(self._sort_keys)
+
+    def sort_by(self, keys: list[tuple[int, bool]]) -> None:
+        """Stable sort of the rows by the (column, ascending) keys, primary first."""
+        self._sort_keys = list(keys)
+        self._update_order()
+        return None
+
+    def filter_expr(self) -> str | None:
+        """The filter expression in use."""
+        return self._filter_expr
+
+    def set_filter(self, expr: str | None) -> None:
+        """Show only the rows where `expr` is true. See `_eval_filter`."""
+        if expr is not None and expr.strip() == "":
+            expr = None
+        self._filter_expr = expr
+        try:
+            self._update_order()
+        except Exception:
+            # clear the filter, including the rows filtered by the last expression
+            self._filter_expr = None
+            self._update_order()
+            raise
+        return None
+
+    def _update_order(self) -> None:
+        import numpy as np
+
+        if self._filter_expr is None:
+            rows = None
+        else:
+            mask = _eval_filter(self._filter_expr, self._data, self._column_names)
+            rows = np.flatnonzero(mask)
+        if self._sort_keys:
+            rows = _sort_rows(self._data, self._sort_keys, rows)
+        self.beginResetModel()
+        self._order = rows
+        self._nloaded = min(self.total_row_count(), max(self._nloaded, _FETCH_ROWS))
+        self.endResetModel()
+        return None
+
+    def sort(self, column: int, order=QtCore.Qt.SortOrder.AscendingOrder) -> None:
+        # called by the view on header clicks; shift-click adds a sort key
+        if column < 0:
+            return self.sort_by([])
+        ascending = order == QtCore.Qt.SortOrder.AscendingOrder
+        modifiers = QtGui.QGuiApplication.keyboardModifiers()
+        if modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier:
+            keys = [key for key in self._sort_keys if key[0] != column]
+            keys.append((column, ascending))
+        else:
+            keys = [(column, ascending)]
+        return self.sort_by(keys)
+
+    def data(self, index: QtCore.QModelIndex, role=_DisplayRole):
+        if role in (_DisplayRole, _EditRole) and index.isValid():
+            return self.cell_text(index.row(), index.column())
+        return None
+
+    def setData(self, index: QtCore.QModelIndex, value, role=_EditRole) -> bool:
+        if role != _EditRole or not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        edit = self._record_edit(self._source_rows(row, row + 1), [column])
+        if not self.set_cell_text(row, column, str(value)):
+            return False
+        self._mark_edited(self._source_rows(row, row + 1), [column])
+        self._journal.push(edit)
+        self.dataChanged.emit(index, index, [_DisplayRole, _EditRole])
+        return True
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        return (
+            QtCore.Qt.ItemFlag.ItemIsEnabled
+            | QtCore.Qt.ItemFlag.ItemIsSelectable
+            | QtCore.Qt.ItemFlag.ItemIsEditable
+        )
+
+    def headerData(self, section: int, orientation, role=_DisplayRole):
+        if role != _DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Vertical:
+            return str(self.source_row(section) + 1)
+        if self._column_names is not None and section < len(self._column_names):
+            return self._column_names[section]
+        return str(section + 1)
+
+    def append_rows(self, value, saved: bool = False) -> None:
+        """
+        Append rows of the same kind as the backing data.
+
+        If `saved` is true, the rows are regarded as a part of the saved file, such as
+        the rows streamed from a reader.
+        """
+        if self._data.nrows == 0 and self._data.ncols == 0:
+            new = _table_data(value)
+        else:
+            new = self._data.concat(value)
+        if saved:
+            self._nrows_saved = new.nrows
+        elif new.ncols != self._data.ncols:
+            self._structure_changed = True
+        nrows_old = self._data.nrows
+        self._append_data(new)
+        self.rowsChanged.emit([(nrows_old, new.nrows)], list(range(new.ncols)))
+        return None
+
+    def _append_data(self, new: _TableData) -> None:
+        if self._column_names is not None and isinstance(new, _ColumnsData):
+            self._column_names = [str(key) for key in new.keys()]
+        if self._order is not None:
+            self._data = new
+            return self._update_order()
+        # streamed rows fill the first block; the rest are fetched on scroll
+        nloaded = min(new.nrows, max(self._nloaded, _FETCH_ROWS))
+        if new.ncols != self._data.ncols:
+            self.beginResetModel()
+            self._data = new
+            self._nloaded = nloaded
+            self.endResetModel()
+        elif nloaded > self._nloaded:
+            self.beginInsertRows(QtCore.QModelIndex(), self._nloaded, nloaded - 1)
+            self._data = new
+            self._nloaded = nloaded
+            self.endInsertRows()
+        else:
+            self._data = new
+        return None
+
+
+class QFetchScrollBar(QtW.QScrollBar):
+    """A scroll bar that shows the fraction of the rows fetched by the model."""
+
+    def __init__(self, parent: QtW.QWidget | None = None):
+        super().__init__(QtCore.Qt.Orientation.Vertical, parent)
+        self._fraction = 1.0
+
+    def set_fetched(self, nloaded: int, total: int) -> None:
+        self._fraction = nloaded / total if total > 0 else 1.0
+        if self._fraction < 1.0:
+            self.setToolTip(f"{nloaded:,} of {total:,} rows loaded")
+        else:
+            self.setToolTip("")
+        self.update()
+        return None
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+        if self._fraction >= 1.0:
+            return None
+        # a thin bar along the groove whose length is the loaded fraction
+        painter = QtGui.QPainter(self)
+        color = self.palette().color(QtGui.QPalette.ColorRole.Highlight)
+        height = int(self.height() * self._fraction)
+        painter.fillRect(self.width() - 3, 0, 3, height, color)
+        painter.end()
+        return None
+
+
+class QDefaultTableWidget(QtW.QTableView):
     def __init__(self):
         super().__init__()
         self._modified = False
+        self._nsaving = 0  # number of running saves
+        self._nsaves_started = 0
+        self.setVerticalScrollBar(QFetchScrollBar(self))
         self.horizontalHeader().setFixedHeight(18)
+        # fixed row heights, so that rows are never measured one by one
+        vheader = self.verticalHeader()
+        vheader.setSectionResizeMode(QtW.QHeaderView.ResizeMode.Fixed)
+        vheader.setDefaultSectionSize(22)
         self._finder_widget = None
+        self._set_table_model(QTableDataModel([]))
+        # clicking a header sorts the rows (see QTableDataModel.sort)
+        self.horizontalHeader().setSortIndicator(
+            -1, QtCore.Qt.SortOrder.AscendingOrder
+        )
+        self.setSortingEnabled(True)
 
         # scroll by pixel
         self.setVerticalScrollMode(QtW.QAbstractItemView.ScrollMode.ScrollPerPixel)
@@ -21,34 +1262,75 @@ class QDefaultTableWidget(QtW.QTableWidget):
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
-        @self.itemChanged.connect
-        def _():
-            self._modified = True
+    def _set_table_model(self, model: QTableDataModel) -> None:
+        self.setModel(model)
+        model.dataChanged.connect(self._on_data_changed)
+        model.rowsInserted.connect(self._update_fetched)
+        model.modelReset.connect(self._update_fetched)
+        self._update_fetched()
+        return None
+
+    def _update_fetched(self, *_) -> None:
+        table = self.model()
+        self.verticalScrollBar().set_fetched(
+            table.rowCount(), table.total_row_count()
+        )
+        return None
+
+    def load_all(self) -> None:
+        """Fetch all the rows of the table."""
+        table = self.model()
+        table.fetch_rows(table.total_row_count())
+        return None
+
+    def _on_data_changed(self, *_) -> None:
+        self._modified = True
+        return None
+
+    def model(self) -> QTableDataModel:
+        return super().model()
 
     @classmethod
     def from_model(cls, model: WidgetDataModel) -> QDefaultTableWidget:
-        import numpy as np
-
         self = cls()
-        table = np.asarray(model.value, dtype=str)
-        self.setRowCount(table.shape[0])
-        self.setColumnCount(table.shape[1])
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                self.setItem(i, j, QtW.QTableWidgetItem(table[i, j]))
-            self.setRowHeight(i, 22)
+        value = model.value
+        meta = model.additional_data
+        if isinstance(value, dict) and (not isinstance(meta, TableMeta) or meta.header):
+            column_names = [str(key) for key in value.keys()]
+        else:
+            column_names = None
+        table = QTableDataModel(value, column_names)
+        if isinstance(meta, TableMeta):
+            table.set_saved_file(meta.source)
+        self._set_table_model(table)
         if model.source is not None:
             self.setObjectName(model.source.name)
         self._modified = False
         return self
 
+    def append_chunk(self, rows) -> None:
+        """Append rows streamed from a reader to the end of the table."""
+        self.model().append_rows(rows, saved=True)
+        self._update_fetched()
+        return None
+
+    def append_rows(self, rows) -> None:
+        """Append new rows to the end of the table."""
+        self.model().append_rows(rows)
+        self._update_fetched()
+        self._modified = True
+        return None
+
     def to_model(self) -> WidgetDataModel:
+        table = self.model()
         return WidgetDataModel(
-            value=self._to_list(
-                slice(0, self.rowCount()), slice(0, self.columnCount())
-            ),
+            value=table.snapshot(),
             type=self.model_type(),
             extension_default=".csv",
+            additional_data=TableMeta(
+                header=table.column_names() is not None,
+                changes=table.changes(),
+            ),
         )
 
     def model_type(self):
@@ -58,74 +1340,119 @@ class QDefaultTableWidget(QtW.QTableWidget):
         return 400, 300
 
     def is_modified(self) -> bool:
-        return self._modified
+        # the table is modified until the running saves succeed
+        return self._modified or self._nsaving > 0
 
     def set_modified(self, value: bool) -> None:
         self._modified = value
+        if not value:
+            self.model().mark_saved()
 
-    def _to_list(self, rsl: slice, csl: slice) -> list[list[str]]:
-        values: list[list[str]] = []
-        for r in range(rsl.start, rsl.stop):
-            cells: list[str] = []
-            for c in range(csl.start, csl.stop):
-                item = self.item(r, c)
-                if item is not None:
-                    cells.append(item.text())
-                else:
-                    cells.append("")
-            values.append(cells)
-        return values
+    def begin_save(self) -> tuple[int, bool, TableChanges]:
+        """
+        Start saving the current data in a worker.
+
+        Edits made during the save are tracked as new changes. The returned state is
+        passed to `end_save` to restore the changes if the save failed.
+        """
+        self._nsaves_started += 1
+        state = (self._nsaves_started, self._modified, self.model().changes())
+        self.set_modified(False)
+        self._nsaving += 1
+        return state
+
+    def end_save(
+        self, state: tuple[int, bool, TableChanges], path: Path | None
+    ) -> None:
+        """Finish the save started by `begin_save`, with None as `path` if it failed."""
+        self._nsaving -= 1
+        save_id, modified, changes = state
+        table = self.model()
+        if path is None:
+            self._modified = self._modified or modified
+            table.restore_changes(changes)
+        elif save_id == self._nsaves_started:
+            try:
+                table.set_saved_file(FileStamp.of(path))
+            except OSError:
+                table.set_saved_file(None)
+        else:
+            # this save may have overwritten the file of a later save
+            table.set_saved_file(None)
+        return None
+
+    def _selected_ranges(self) -> list[tuple[slice, slice]]:
+        return [
+            (slice(sel.top(), sel.bottom() + 1), slice(sel.left(), sel.right() + 1))
+            for sel in self.selectionModel().selection()
+        ]
 
     def _copy_to_clipboard(self):
-        selranges = self.selectedRanges()
+        import numpy as np
+
+        selranges = self._selected_ranges()
         if not selranges:
             return
-        if len(selranges) > 1:
-            return
-
-        # copy first selection range
-        sel = selranges[0]
-        values = self._to_list(
-            slice(sel.topRow(), sel.bottomRow() + 1),
-            slice(sel.leftColumn(), sel.rightColumn() + 1),
-        )
-        if values:
-            string = "\n".join(["\t".join(cells) for cells in values])
-            QtW.QApplication.clipboard().setText(string)
+        # multiple ranges are copied as one block of the selected rows and columns,
+        # which is what spreadsheets do for ranges aligned in rows or columns. The
+        # cells of the block that are not selected are copied as empty cells.
+        rows = sorted(set().union(*(range(r.start, r.stop) for r, _ in selranges)))
+        cols = sorted(set().union(*(range(c.start, c.stop) for _, c in selranges)))
+        mask = np.zeros((len(rows), len(cols)), dtype=bool)
+        for rsl, csl in selranges:
+            # the rows and columns of a range are contiguous in the sorted lists
+            i = np.searchsorted(rows, rsl.start)
+            j = np.searchsorted(cols, csl.start)
+            mask[i : i + rsl.stop - rsl.start, j : j + csl.stop - csl.start] = True
+        string = self.model().to_tsv(rows, cols, None if mask.all() else mask)
+        QtW.QApplication.clipboard().setText(string)
 
     def _paste_from_clipboard(self):
-        sel_idx = self.selectedIndexes()
-        if not sel_idx:
+        selranges = self._selected_ranges()
+        if not selranges:
             return
         text = QtW.QApplication.clipboard().text()
         if not text:
             return
 
-        # paste in the text
-        row0, col0 = sel_idx[0].row(), sel_idx[0].column()
-        data = [line.split("\t") for line in text.splitlines()]
-        if (row0 + len(data)) > self.rowCount():
-            self.setRowCount(row0 + len(data))
-        if data and (col0 + len(data[0])) > self.columnCount():
-            self.setColumnCount(col0 + len(data[0]))
-        for r, line in enumerate(data):
-            for c, cell in enumerate(line):
-                try:
-                    self.item(row0 + r, col0 + c).setText(str(cell))
-                except AttributeError:
-                    self.setItem(row0 + r, col0 + c, QtW.QTableWidgetItem(str(cell)))
+        # paste in the text (cells out of the table are ignored)
+        block = [line.split("\t") for line in text.splitlines()]
+        table = self.model()
+        selection = QtCore.QItemSelection()
+        for rsl, csl in selranges:
+            if len(block) == 1 and len(block[0]) == 1:
+                # a single value fills the selection
+                nr, nc = rsl.stop - rsl.start, csl.stop - csl.start
+                each = [block[0] * nc] * nr
+            else:
+                each = block
+            table.set_block(rsl.start, csl.start, each)
+            nr = min(len(each), table.rowCount() - rsl.start)
+            nc = min(max(map(len, each)), table.columnCount() - csl.start)
+            selection.select(
+                table.index(rsl.start, csl.start),
+                table.index(rsl.start + nr - 1, csl.start + nc - 1),
+            )
 
         # select what was just pasted
-        selrange = QtW.QTableWidgetSelectionRange(row0, col0, row0 + r, col0 + c)
-        self.clearSelection()
-        self.setRangeSelected(selrange, True)
+        self.selectionModel().select(
+            selection, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect
+        )
 
     def _delete_selection(self):
-        for item in self.selectedItems():
-            item.setText("")
+        table = self.model()
+        for rsl, csl in self._selected_ranges():
+            nr, nc = rsl.stop - rsl.start, csl.stop - csl.start
+            table.set_block(rsl.start, csl.start, [[""] * nc] * nr)
 
     def keyPressEvent(self, e: QtGui.QKeyEvent):
         _Ctrl = QtCore.Qt.KeyboardModifier.ControlModifier
+        if e.matches(QtGui.QKeySequence.StandardKey.Undo):
+            self.model().undo()
+            return None
+        if e.matches(QtGui.QKeySequence.StandardKey.Redo):
+            self.model().redo()
+            return None
         if e.modifiers() & _Ctrl and e.key() == QtCore.Qt.Key.Key_C:
             return self._copy_to_clipboard()
         if e.modifiers() & _Ctrl and e.key() == QtCore.Qt.Key.Key_V:
@@ -140,6 +1467,41 @@ class QDefaultTableWidget(QtW.QTableWidget):
             return
         return super().keyPressEvent(e)
 
+    def contextMenuEvent(self, event: QtGui.QContextMenuEvent) -> None:
+        menu = QtW.QMenu(self)
+        action = menu.addAction("Load All Rows", self.load_all)
+        action.setEnabled(self.model().canFetchMore(QtCore.QModelIndex()))
+        menu.addSeparator()
+        menu.addAction("Filter Rows ...", self._filter_rows_with_dialog)
+        action = menu.addAction("Clear Sort and Filter", self.clear_sort_and_filter)
+        table = self.model()
+        action.setEnabled(bool(table.sort_keys()) or table.filter_expr() is not None)
+        menu.exec(event.globalPos())
+        return None
+
+    def _filter_rows_with_dialog(self):
+        expr, ok = QtW.QInputDialog.getText(
+            self,
+            "Filter rows",
+            "Expression (such as `x > 0 and name != 'a'`):",
+            text=self.model().filter_expr() or "",
+        )
+        if ok:
+            try:
+                self.model().set_filter(expr)
+            except ValueError as e:
+                QtW.QMessageBox.warning(self, "Invalid filter", str(e))
+
+    def clear_sort_and_filter(self) -> None:
+        """Show the rows in the original order."""
+        table = self.model()
+        table.set_filter(None)
+        self.horizontalHeader().setSortIndicator(
+            -1, QtCore.Qt.SortOrder.AscendingOrder
+        )
+        table.sort_by([])
+        return None
+
     def _find_string(self):
         if self._finder_widget is None:
             self._finder_widget = QTableFinderWidget(self)
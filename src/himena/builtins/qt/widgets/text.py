@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Iterator
+import sys
+from typing import Iterator, TYPE_CHECKING
 
 from qtpy import QtWidgets as QtW
 from qtpy import QtGui, QtCore
@@ -11,6 +12,10 @@ from himena.qt._qt_consts import MonospaceFontFamily
 
 from himena._utils import OrderedSet, lru_cache
 from himena.qt._qfinderwidget import QFinderWidget
+from himena.builtins.qt.widgets._undo import UndoableEdit, UndoJournal
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 _POPULAR_LANGUAGES = [
@@ -72,6 +77,47 @@ def _labeled(text: str, widget: QtW.QWidget) -> QtW.QWidget:
     return new
 
 
+def _qt_len(text: str) -> int:
+    """Length of the text in QTextDocument positions (UTF-16 code units)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+_TextSegment = "tuple[int, str, int]"
+
+# events that may remove the text around the cursor
+_EDITING_EVENTS = frozenset(
+    [
+        QtCore.QEvent.Type.KeyPress,
+        QtCore.QEvent.Type.InputMethod,
+        QtCore.QEvent.Type.Drop,
+        QtCore.QEvent.Type.ContextMenu,
+    ]
+)
+
+
+class _TextEdit(UndoableEdit[_TextSegment]):
+    """Edit of a text. Each segment is (position, old text, length of new text)."""
+
+    _target: QMainTextEdit
+
+    def _revert_segment(self, segment: _TextSegment) -> _TextSegment:
+        pos, text, length = segment
+        current = self._target._replace_text(pos, length, text)
+        return pos, current, _qt_len(text)
+
+    def _segment_nbytes(self, segment: _TextSegment) -> int:
+        return sys.getsizeof(segment[1])
+
+    def _merge_segment(
+        self, last: _TextSegment, segment: _TextSegment
+    ) -> _TextSegment | None:
+        pos0, text0, length0 = last
+        pos1, text1, length1 = segment
+        if text0 == "" and text1 == "" and pos1 == pos0 + length0:
+            return pos0, "", length0 + length1  # continuous typing
+        return None
+
+
 class QMainTextEdit(QtW.QPlainTextEdit):
     def __init__(self, parent: QtW.QWidget | None = None):
         super().__init__(parent)
@@ -84,9 +130,145 @@ class QMainTextEdit(QtW.QPlainTextEdit):
         self._highlight = None
         self._finder_widget = None
 
+        # Qt's undo stack is emptied after each edit and the edits are recorded in
+        # a memory-bounded journal instead.
+        self._journal = UndoJournal()
+        self._applying_journal = False
+        self._change_span: tuple[int, int, int] | None = None
+        self._command_added = False
+        # the removed text is not available after the change, so the text that
+        # user input may remove is captured before (start, UTF-16 encoded text)
+        self._captured: tuple[int, bytes] | None = None
+        doc = self.document()
+        doc.contentsChange.connect(self._on_contents_change)
+        doc.contentsChanged.connect(self._on_contents_changed)
+        doc.undoCommandAdded.connect(self._on_undo_command_added)
+
     def is_modified(self) -> bool:
         return self.document().isModified()
 
+    def setPlainText(self, text: str) -> None:
+        super().setPlainText(text)
+        self._journal.clear()
+
+    def undo_journal(self) -> UndoJournal:
+        """The journal of the edits of this text."""
+        return self._journal
+
+    def undo(self) -> None:
+        self._journal.undo()
+
+    def redo(self) -> None:
+        self._journal.redo()
+
+    def _on_undo_command_added(self):
+        # emitted before contentsChange
+        self._command_added = True
+
+    def _on_contents_change(self, pos: int, removed: int, added: int):
+        if self._applying_journal:
+            return
+        # the changed range is recorded as the unchanged prefix and suffix lengths
+        suffix = max(self.document().characterCount() - 1 - pos - added, 0)
+        if self._change_span is None:
+            self._change_span = (pos, suffix, added - removed)
+        else:
+            prefix0, suffix0, delta0 = self._change_span
+            self._change_span = (
+                min(prefix0, pos),
+                min(suffix0, suffix),
+                delta0 + added - removed,
+            )
+
+    def _on_contents_changed(self):
+        span, self._change_span = self._change_span, None
+        command_added, self._command_added = self._command_added, False
+        if not command_added:
+            return
+        if not self._applying_journal and span is not None:
+            if (edit := self._record_edit(*span)) is not None:
+                self._journal.push(edit)
+            else:
+                # the edit cannot be undone, nor the edits before it
+                self._journal.clear()
+        self.document().clearUndoRedoStacks()
+
+    def _record_edit(self, prefix: int, suffix: int, delta: int) -> _TextEdit | None:
+        """The edit of the changed range, or None if the removed text is unknown."""
+        new_length = max(self.document().characterCount() - 1 - suffix - prefix, 0)
+        old_length = new_length - delta
+        captured, self._captured = self._captured, None
+        if captured is not None:
+            start, data = captured
+            i, j = 2 * (prefix - start), 2 * (prefix + old_length - start)
+            if 0 <= i and j <= len(data):
+                old = data[i:j].decode("utf-16-le", "surrogatepass")
+                # keep the capture up to date for the following edits
+                new = self._text_range(prefix, new_length)
+                new_data = new.encode("utf-16-le", "surrogatepass")
+                self._captured = (start, data[:i] + new_data + data[j:])
+                return _TextEdit(self, [(prefix, old, new_length)])
+        if old_length > 0:
+            return None
+        return _TextEdit(self, [(prefix, "", new_length)])
+
+    def _capture_around_cursor(self) -> None:
+        """Capture the selected text and the lines before and after it."""
+        doc = self.document()
+        cursor = self.textCursor()
+        first = doc.findBlock(cursor.selectionStart())
+        last = doc.findBlock(cursor.selectionEnd())
+        if (block := first.previous()).isValid():
+            first = block
+        if (block := last.next()).isValid():
+            last = block
+        start = first.position()
+        stop = min(last.position() + last.length(), doc.characterCount() - 1)
+        text = self._text_range(start, stop - start)
+        self._captured = (start, text.encode("utf-16-le", "surrogatepass"))
+        return None
+
+    def _text_range(self, pos: int, length: int) -> str:
+        cursor = QtGui.QTextCursor(self.document())
+        cursor.setPosition(pos)
+        cursor.setPosition(pos + length, QtGui.QTextCursor.MoveMode.KeepAnchor)
+        return cursor.selectedText().replace("\u2029", "\n")
+
+    def _replace_text(self, pos: int, length: int, text: str) -> str:
+        """Replace the text without recording the edit and return the old text."""
+        old = self._text_range(pos, length)
+        cursor = QtGui.QTextCursor(self.document())
+        cursor.setPosition(pos)
+        cursor.setPosition(pos + length, QtGui.QTextCursor.MoveMode.KeepAnchor)
+        self._applying_journal = True
+        self._captured = None
+        try:
+            cursor.insertText(text)
+        finally:
+            self._applying_journal = False
+        self.setTextCursor(cursor)
+        return old
+
+    def contextMenuEvent(self, e: QtGui.QContextMenuEvent) -> None:
+        menu = self._context_menu(e.pos())
+        menu.exec(e.globalPos())
+        menu.deleteLater()
+        return None
+
+    def _context_menu(self, pos: QtCore.QPoint) -> QtW.QMenu:
+        menu = self.createStandardContextMenu(pos)
+        # undo and redo of the menu use the journal instead of Qt's undo stack
+        for action in menu.actions():
+            if action.objectName() == "edit-undo":
+                action.triggered.disconnect()
+                action.triggered.connect(self.undo)
+                action.setEnabled(self._journal.can_undo())
+            elif action.objectName() == "edit-redo":
+                action.triggered.disconnect()
+                action.triggered.connect(self.redo)
+                action.setEnabled(self._journal.can_redo())
+        return menu
+
     def syntax_highlight(self, lang: str | None = "python", theme: str = "default"):
         """Highlight syntax."""
         if lang is None or lang == "Plain Text":
@@ -106,12 +288,27 @@ class QMainTextEdit(QtW.QPlainTextEdit):
         self._tab_size = size
 
     def event(self, ev: QtCore.QEvent):
+        if ev.type() not in _EDITING_EVENTS:
+            return self._handle_event(ev)
+        self._capture_around_cursor()
+        try:
+            return self._handle_event(ev)
+        finally:
+            self._captured = None
+
+    def _handle_event(self, ev: QtCore.QEvent):
         try:
             if ev.type() == QtCore.QEvent.Type.KeyPress:
                 assert isinstance(ev, QtGui.QKeyEvent)
                 _key = ev.key()
                 _mod = ev.modifiers()
-                if (
+                if ev.matches(QtGui.QKeySequence.StandardKey.Undo):
+                    self.undo()
+                    return True
+                elif ev.matches(QtGui.QKeySequence.StandardKey.Redo):
+                    self.redo()
+                    return True
+                elif (
                     _key == QtCore.Qt.Key.Key_Tab
                     and _mod == QtCore.Qt.KeyboardModifier.NoModifier
                 ):
@@ -443,6 +640,7 @@ class QDefaultTextEdit(QtW.QWidget):
         super().__init__()
         self._main_text_edit = QMainTextEdit(self)
         self._footer = QTextFooter(self)
+        self._nsaving = 0  # number of running saves
 
         self._footer.languageChanged.connect(self._main_text_edit.syntax_highlight)
         self._footer.tabChanged.connect(self._main_text_edit.set_tab_size)
@@ -458,6 +656,20 @@ class QDefaultTextEdit(QtW.QWidget):
     def toPlainText(self) -> str:
         return self._main_text_edit.toPlainText()
 
+    def append_chunk(self, text: str) -> None:
+        """Append a chunk of text streamed from a reader."""
+        doc = self._main_text_edit.document()
+        modified = doc.isModified()
+        doc.setUndoRedoEnabled(False)
+        try:
+            cursor = QtGui.QTextCursor(doc)
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
+        finally:
+            doc.setUndoRedoEnabled(True)
+        doc.setModified(modified)
+        return None
+
     def setFocus(self):
         self._main_text_edit.setFocus()
 
@@ -500,11 +712,26 @@ class QDefaultTextEdit(QtW.QWidget):
         return 400, 300
 
     def is_modified(self) -> bool:
-        return self._main_text_edit.is_modified()
+        # the text is modified until the running saves succeed
+        return self._main_text_edit.is_modified() or self._nsaving > 0
 
     def set_modified(self, value: bool) -> None:
         self._main_text_edit.document().setModified(value)
 
+    def begin_save(self) -> bool:
+        """Start saving the current text in a worker. Edits after this are tracked."""
+        modified = self._main_text_edit.is_modified()
+        self.set_modified(False)
+        self._nsaving += 1
+        return modified
+
+    def end_save(self, modified: bool, path: Path | None) -> None:
+        """Finish the save started by `begin_save`, with None as `path` if it failed."""
+        self._nsaving -= 1
+        if path is None and modified:
+            self.set_modified(True)
+        return None
+
     def keyPressEvent(self, a0: QtGui.QKeyEvent | None) -> None:
         if (
             a0.key() == QtCore.Qt.Key.Key_F
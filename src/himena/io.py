@@ -1,18 +1,52 @@
 from __future__ import annotations
 
+import copy
+from fnmatch import fnmatch
+from functools import lru_cache
+import inspect
+import itertools
+import math
+import os
 from pathlib import Path
+import shutil
+import stat
+import sys
+import threading
 from logging import getLogger
-from typing import Callable, TypeVar, overload, NamedTuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    TypeVar,
+    overload,
+    NamedTuple,
+)
 import warnings
-from himena.types import WidgetDataModel, ReaderFunction, WriterFunction
+from himena.types import (
+    LazyValue,
+    WidgetDataModel,
+    ReaderChunk,
+    ReaderMetadata,
+    ReaderFunction,
+    WriterFunction,
+)
 from himena._utils import get_widget_data_model_variable
 
+if TYPE_CHECKING:
+    import numpy as np
+
 _LOGGER = getLogger(__name__)
 _ReaderProvider = Callable[["Path | list[Path]"], ReaderFunction]
+_Updater = Callable[[WidgetDataModel, Path], bool]
+_Sniffer = Callable[[bytes], bool]
 _WriterProvider = Callable[[WidgetDataModel], WriterFunction]
 
 _RP = TypeVar("_RP", bound=_ReaderProvider)
 _WP = TypeVar("_WP", bound=_WriterProvider)
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
 
 
 class PluginInfo(NamedTuple):
@@ -41,6 +75,8 @@ class ReaderProviderTuple(NamedTuple):
     provider: _ReaderProvider
     priority: int
     plugin: PluginInfo | None = None
+    patterns: tuple[str, ...] | None = None
+    sniff: _Sniffer | None = None
 
 
 class ReaderTuple(NamedTuple):
@@ -49,18 +85,654 @@ class ReaderTuple(NamedTuple):
     plugin: PluginInfo | None = None
 
     def read(self, path: Path) -> WidgetDataModel:
-        return self.reader(path)
+        out = self.reader(path)
+        if inspect.isgenerator(out):
+            return collect_chunks(out)
+        return out
+
+    def is_streaming(self) -> bool:
+        """True if the reader function yields chunks of data."""
+        return inspect.isgeneratorfunction(self.reader)
+
+
+def collect_chunks(stream: Iterable[ReaderChunk | ReaderMetadata]) -> WidgetDataModel:
+    """Consume a streaming reader output and return the complete data model."""
+    chunks: list[ReaderChunk] = []
+    metadata = ReaderMetadata()
+    for item in stream:
+        if isinstance(item, ReaderChunk):
+            chunks.append(item)
+        elif isinstance(item, ReaderMetadata):
+            metadata = item
+        else:
+            raise TypeError(f"Streaming reader yielded invalid object: {item!r}")
+    return _model_from_chunks(chunks, metadata)
+
+
+def _model_from_chunks(
+    chunks: list[ReaderChunk],
+    metadata: ReaderMetadata,
+) -> WidgetDataModel:
+    if len(chunks) == 0:
+        raise ValueError("Streaming reader did not yield any chunk.")
+    fields = {
+        name: value
+        for name in ("title", "extension_default", "extensions", "additional_data")
+        if (value := getattr(metadata, name)) is not None
+    }
+    return WidgetDataModel(
+        value=_concat_chunks([chunk.value for chunk in chunks]),
+        type=chunks[0].type,
+        **fields,
+    )
+
+
+def _concat_chunks(values: list):
+    """
+    Concatenate chunk values.
+
+    Strings and lists are joined, arrays are concatenated along the first axis and
+    dicts of arrays (columnar tables) are concatenated column by column.
+    """
+    if len(values) == 1:
+        return values[0]
+    first = values[0]
+    if isinstance(first, str):
+        return "".join(values)
+    if isinstance(first, list):
+        return list(itertools.chain.from_iterable(values))
+    if isinstance(first, dict):
+        return _concat_columns(values)
+    if hasattr(first, "shape") and hasattr(first, "dtype"):
+        import numpy as np
+
+        return np.concatenate(values, axis=0)
+    raise TypeError(f"Cannot concatenate chunks of type {type(first)}.")
+
+
+def _concat_columns(values: list[dict]) -> dict:
+    import numpy as np
+
+    keys = list(dict.fromkeys(itertools.chain.from_iterable(values)))
+    out = {}
+    for key in keys:
+        arrays = []
+        for value in values:
+            if key in value:
+                arrays.append(np.asarray(value[key]))
+            else:  # columns missing in some chunks are filled with empty strings
+                nrows = len(next(iter(value.values()), ()))
+                arrays.append(np.full(nrows, "", dtype=np.str_))
+        if _needs_str(arrays):
+            arrays = [_as_str(arr) for arr in arrays]
+        out[key] = np.concatenate(arrays)
+    return out
+
+
+def _needs_str(arrays: list) -> bool:
+    # inconsistent types (such as bool and str) cannot be safely promoted
+    kinds = {arr.dtype.kind for arr in arrays}
+    return len(kinds) > 1 and not kinds <= {"i", "u", "f"}
+
+
+def _as_str(arr: np.ndarray) -> np.ndarray:
+    """Convert an array to strings, with NaN as an empty string like in CSV files."""
+    import numpy as np
+
+    if arr.dtype.kind == "U":
+        return arr
+    out = arr.astype(np.str_)
+    if arr.dtype.kind == "f":
+        out[np.isnan(arr)] = ""
+    return out
+
+
+class _ChunkBuffer:
+    """
+    Buffer with spare rows to append chunks in amortized constant time.
+
+    Concatenating every streamed chunk to all the rows read so far takes quadratic
+    time. This buffer grows by doubling, and the arrays returned by `append` are
+    views of it, so the last returned array can be extended in place.
+    """
+
+    def __init__(self):
+        self._data: np.ndarray | None = None
+        self._size = 0
+
+    def append(self, arr, value) -> np.ndarray:
+        """Return `arr` with the rows of `value` appended."""
+        import numpy as np
+
+        arr, value = np.asarray(arr), np.asarray(value)
+        if arr.shape[1:] != value.shape[1:]:
+            return np.concatenate([arr, value], axis=0)  # raises a proper error
+        if _needs_str([arr, value]):
+            arr, value = _as_str(arr), _as_str(value)
+        dtype = np.result_type(arr, value)
+        nrows, nrows_new = arr.shape[0], arr.shape[0] + value.shape[0]
+        data = self._data
+        if not (
+            data is not None
+            and self._is_last(arr)
+            and data.dtype == dtype
+            and data.shape[0] >= nrows_new
+        ):
+            data = np.empty((max(nrows_new, 2 * nrows),) + arr.shape[1:], dtype=dtype)
+            data[:nrows] = arr
+            self._data = data
+        data[nrows:nrows_new] = value
+        self._size = nrows_new
+        return data[:nrows_new]
+
+    def _is_last(self, arr: np.ndarray) -> bool:
+        """True if `arr` is the array returned by the last `append`."""
+        return (
+            arr.base is self._data
+            and arr.shape[0] == self._size
+            and arr.__array_interface__["data"] == self._data.__array_interface__["data"]
+            and arr.strides == self._data.strides
+        )
+
+
+def _read_and_update_source(reader: ReaderTuple, source: Path) -> WidgetDataModel:
+    """Read the source using the model cache, and update the `method` if not set."""
+    # the key is determined before reading, so that the file modified during reading
+    # will not be cached with the new mtime
+    key = _model_cache_key(reader, source)
+    if (model := _MODEL_CACHE.get(key)) is not None:
+        return model
+    model = reader.read(source)
+    if model.method is None:
+        model = model._with_source(source=source, plugin=reader.plugin)
+    if _MODEL_CACHE.set(key, model):
+        # the cached model must not be modified by the widget
+        return model.model_copy(update={"value": _copy_value(model.raw_value)})
+    return model
+
+
+def _write_atomic(writer: WriterFunction, model: WidgetDataModel, path: Path) -> None:
+    """
+    Write the model to a temporary directory and move the output to the destination.
+
+    If an incremental writer is registered for `writer` (see
+    `register_incremental_writer`), it is tried first to update the existing file in
+    place. Otherwise the writer is called with a path of the same name in a temporary
+    directory next to `path`, so that the existing file is never left half-written
+    even if writing fails. Everything the writer created there, such as a directory
+    or additional files, is moved next to `path`. Symbolic links are resolved, so
+    that the target of the link is replaced.
+    """
+    import tempfile
+
+    path = Path(path).resolve()
+    if (updater := _INCREMENTAL_WRITERS.get(writer)) is not None and path.is_file():
+        if _update_in_place(updater, model, path):
+            return None
+    tmpdir = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+    try:
+        writer(model, tmpdir / path.name)
+        if not (outputs := list(tmpdir.iterdir())):
+            raise ValueError(f"Writer {writer!r} did not write anything to {path}.")
+        backup = Path(tempfile.mkdtemp(dir=tmpdir))
+        for output in outputs:
+            _replace_with(output, path.parent / output.name, backup)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return None
+
+
+def _replace_with(src: Path, dst: Path, backup: Path) -> None:
+    """Replace `dst` with `src`, moving the replaced directory into `backup`."""
+    if src.is_dir() or dst.is_dir():
+        # directories cannot be replaced atomically, so the old one is moved away
+        # right before the new one is moved in
+        if dst.exists():
+            os.replace(dst, backup / dst.name)
+        os.replace(src, dst)
+    else:
+        if dst.exists():
+            shutil.copymode(dst, src)
+        os.replace(src, dst)
+    return None
+
+
+def _update_in_place(updater: _Updater, model: WidgetDataModel, path: Path) -> bool:
+    size = path.stat().st_size
+    try:
+        return updater(model, path)
+    except Exception as e:
+        # restore the original content and fall back to rewriting the file
+        with open(path, "r+b") as f:
+            f.truncate(size)
+        _LOGGER.warning("Failed to update %s in place: %s", path, e)
+    return False
+
+
+class _ReaderProviderIndex:
+    """
+    Lookup table from file name patterns to reader providers.
+
+    Providers that declared the file patterns they handle are stored by suffix, file
+    name or glob pattern. Other providers are always considered as candidates.
+    """
+
+    def __init__(self):
+        self._by_suffix: dict[str, list[int]] = {}
+        self._by_name: dict[str, list[int]] = {}
+        self._by_glob: list[tuple[str, int]] = []
+        self._undeclared: list[int] = []
+
+    def add(self, index: int, patterns: tuple[str, ...] | None) -> None:
+        """Add the `index`-th provider to the table."""
+        if patterns is None:
+            self._undeclared.append(index)
+            return None
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                self._by_glob.append((pattern.lower(), index))
+            elif pattern.startswith("."):
+                self._by_suffix.setdefault(pattern.lower(), []).append(index)
+            else:
+                self._by_name.setdefault(pattern.lower(), []).append(index)
+        return None
+
+    def candidates(self, path: Path | list[Path]) -> list[int]:
+        """Indices of providers that may be able to read the path(s)."""
+        return sorted(self._match_declared(path).union(self._undeclared))
+
+    def cache_key(self, path: Path | list[Path]) -> Hashable:
+        """Key that identifies the kind of path(s) for the resolution cache."""
+        if isinstance(path, list):
+            kinds = frozenset(self._path_kind(p) for p in path)
+            is_list = True
+        else:
+            kinds = self._path_kind(path)
+            is_list = False
+        return kinds, frozenset(self._match_declared(path)), is_list
+
+    def _match_declared(self, path: Path | list[Path]) -> set[int]:
+        if isinstance(path, list):
+            if len(path) == 0:
+                return set()
+            return set.intersection(*[self._match(p) for p in path])
+        return self._match(path)
+
+    def _path_kind(self, path: Path) -> tuple[str, bool]:
+        # files without suffix (such as "Makefile") are usually identified by name
+        return path.suffix.lower() or path.name, path.is_dir()
+
+    def _match(self, path: Path) -> set[int]:
+        name = path.name.lower()
+        out = set(self._by_name.get(name, ()))
+        # compound suffixes such as ".tar.gz" and dot files such as ".gitignore"
+        for i, char in enumerate(name):
+            if char == ".":
+                out.update(self._by_suffix.get(name[i:], ()))
+        for pattern, index in self._by_glob:
+            if fnmatch(name, pattern):
+                out.add(index)
+        return out
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ResolutionCache(Generic[_K, _V]):
+    """
+    LRU cache of resolved reader/writer functions.
+
+    The cache is tagged with the version of the provider registry, so that all the
+    entries are discarded when a provider is registered.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._data: dict[_K, _V] = {}
+        self._maxsize = maxsize
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: _K, version: int) -> _V | None:
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+        try:
+            out = self._data.pop(key)
+        except KeyError:
+            self._misses += 1
+            return None
+        except TypeError:  # unhashable
+            return None
+        self._data[key] = out  # move to the end
+        self._hits += 1
+        return out
+
+    def set(self, key: _K, value: _V, version: int) -> None:
+        if version != self._version:
+            return None
+        try:
+            self._data[key] = value
+        except TypeError:  # unhashable
+            return None
+        if len(self._data) > self._maxsize:
+            self._data.pop(next(iter(self._data)))
+        return None
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._hits = self._misses = 0
+        return None
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+
+class ModelCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_bytes: int
+    nbytes: int
+    currsize: int
+
+
+class _ModelCache:
+    """
+    LRU cache of the data models read from local files.
+
+    Models are keyed by the resolved path, the file size, the modification time and
+    the reader plugin, so that modified files are always read again. Least recently
+    used models are evicted when the total estimated size exceeds `max_bytes`.
+    Models with lazy values are measured again as the values are loaded, and mutable
+    values are copied on every hit, so that widgets never modify the cached ones.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._data: dict[Hashable, tuple[WidgetDataModel, int]] = {}
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable | None) -> WidgetDataModel | None:
+        if key is None:
+            return None
+        with self._lock:
+            try:
+                model, nbytes = self._data.pop(key)
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data[key] = (model, nbytes)  # move to the end
+            self._hits += 1
+            self._remeasure()
+        return model.model_copy(update={"value": _copy_value(model.raw_value)})
+
+    def contains(self, key: Hashable | None) -> bool:
+        return key is not None and key in self._data
+
+    def can_hold(self, nbytes: int) -> bool:
+        return nbytes <= self._max_bytes
+
+    def set(self, key: Hashable | None, model: WidgetDataModel) -> bool:
+        """Cache the model and return True if it is cached."""
+        if key is None:
+            return False
+        nbytes = _estimate_nbytes(model.raw_value)
+        with self._lock:
+            if not self.can_hold(nbytes):
+                return False
+            if (old := self._data.pop(key, None)) is not None:
+                self._nbytes -= old[1]
+            self._data[key] = (model, nbytes)
+            self._nbytes += nbytes
+            self._remeasure()
+        return True
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = self._hits = self._misses = 0
+        return None
+
+    def info(self) -> ModelCacheInfo:
+        with self._lock:
+            self._remeasure()
+        return ModelCacheInfo(
+            self._hits, self._misses, self._max_bytes, self._nbytes, len(self._data)
+        )
+
+    def _remeasure(self) -> None:
+        """Update the sizes of the lazy values that may have been loaded, and evict."""
+        for key, (model, nbytes) in self._data.items():
+            if _has_lazy(value := model.raw_value):
+                nbytes_new = _estimate_nbytes(value)
+                self._data[key] = (model, nbytes_new)
+                self._nbytes += nbytes_new - nbytes
+        return self._evict()
+
+    def _evict(self) -> None:
+        while self._nbytes > self._max_bytes and self._data:
+            _, nbytes = self._data.pop(next(iter(self._data)))
+            self._nbytes -= nbytes
+        return None
+
+
+def _model_cache_key(reader: ReaderTuple, source: Path | list[Path]) -> Hashable | None:
+    """Cache key of the model read from the source, or None if not cacheable."""
+    if reader.plugin is None or _MODEL_CACHE._max_bytes <= 0:
+        return None
+    files = []
+    for path in source if isinstance(source, list) else [source]:
+        try:
+            path = Path(path).resolve()
+            st = path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            # directory contents may change without updating its mtime
+            return None
+        files.append((str(path), st.st_size, st.st_mtime_ns))
+    return tuple(files), reader.plugin.to_str()
+
+
+def _estimate_nbytes(value) -> int:
+    """Estimate the memory size of a model value."""
+    if isinstance(value, LazyValue):
+        if value.is_loaded():
+            return _estimate_nbytes(value.compute())
+        if value.nbytes is not None:
+            return value.nbytes
+        if value.shape is not None and value.dtype is not None:
+            import numpy as np
+
+            return math.prod(value.shape) * np.dtype(value.dtype).itemsize
+        return sys.getsizeof(value)
+    if isinstance(nbytes := getattr(value, "nbytes", None), int):
+        return nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(each) for each in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+def _has_lazy(value) -> bool:
+    if isinstance(value, dict):
+        return any(isinstance(v, LazyValue) for v in value.values())
+    return isinstance(value, LazyValue)
+
+
+def _copy_value(value):
+    """Copy a model value so that modifying the copy does not affect the original."""
+    if isinstance(value, (str, bytes, int, float, complex, bool, type(None))):
+        return value
+    if isinstance(value, LazyValue):
+        return LazyValue(
+            lambda: _copy_value(value.compute()),
+            getitem=lambda key: _copy_value(value[key]),
+            shape=value.shape,
+            dtype=value.dtype,
+            nbytes=value.nbytes,
+            value_type=value.value_type,
+        )
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(each) for each in value]
+    if hasattr(value, "flags") and hasattr(value, "copy"):
+        # read-only arrays (such as memory-mapped ones) are shared
+        return value if not value.flags.writeable else value.copy()
+    return copy.deepcopy(value)
 
 
 _READER_PROVIDERS: list[ReaderProviderTuple] = []
+_READER_PROVIDER_INDEX = _ReaderProviderIndex()
 _WRITER_PROVIDERS: list[tuple[_WriterProvider, int]] = []
+_INCREMENTAL_WRITERS: dict[WriterFunction, _Updater] = {}
+_REGISTRY_VERSION = 0
+_READER_CACHE = _ResolutionCache[Hashable, list[ReaderTuple]]()
+_WRITER_CACHE = _ResolutionCache[Hashable, list[WriterFunction]]()
+_MODEL_CACHE = _ModelCache(max_bytes=0)  # enabled by `set_model_cache_size`
+
+
+def reader_cache_info() -> CacheInfo:
+    """Return the hit/miss statistics of the reader resolution cache."""
+    return _READER_CACHE.info()
+
+
+def writer_cache_info() -> CacheInfo:
+    """Return the hit/miss statistics of the writer resolution cache."""
+    return _WRITER_CACHE.info()
+
+
+def clear_resolution_cache() -> None:
+    """Clear the reader/writer resolution caches and their statistics."""
+    _READER_CACHE.clear()
+    _WRITER_CACHE.clear()
+    return None
+
+
+def model_cache_info() -> ModelCacheInfo:
+    """Return the statistics of the cache of the models read from files."""
+    return _MODEL_CACHE.info()
+
+
+def set_model_cache_size(max_bytes: int) -> None:
+    """
+    Set the memory budget of the cache of the models read from files.
+
+    The cache is disabled by default. Once enabled, files read by `read_file`, "open
+    recent" and session loading are cached until the total estimated size exceeds
+    `max_bytes`. Set 0 to disable the cache again.
+    """
+    if max_bytes < 0:
+        raise ValueError(f"`max_bytes` must be non-negative, got {max_bytes}.")
+    _MODEL_CACHE.resize(int(max_bytes))
+    return None
+
+
+def clear_model_cache() -> None:
+    """Clear the cache of the models read from files."""
+    _MODEL_CACHE.clear()
+    return None
+
+
+def _bump_registry_version() -> None:
+    global _REGISTRY_VERSION
+    _REGISTRY_VERSION += 1
+    return None
+
+
+HEADER_SIZE = 4096
+
+
+def read_header(path: Path) -> bytes:
+    """
+    Read the first `HEADER_SIZE` bytes of a file.
+
+    Headers are cached by the path, the file size and the modification time, so that
+    the file is opened only once no matter how many sniffers check the content. An
+    empty bytes is returned for directories and inaccessible files.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return b""
+    if not stat.S_ISREG(st.st_mode):
+        return b""
+    return _read_header_cached(str(path), st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _read_header_cached(path: str, size: int, mtime_ns: int) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read(HEADER_SIZE)
+    except OSError:
+        return b""
 
 
 def get_readers(path: Path | list[Path], empty_ok: bool = False) -> list[ReaderTuple]:
     """Get reader functions that can read the path(s)."""
+    sniffed = _sniff_providers(path)
+    key = (_READER_PROVIDER_INDEX.cache_key(path), sniffed)
+    version = _REGISTRY_VERSION
+    if (matched := _READER_CACHE.get(key, version)) is None:
+        matched = _resolve_readers(path, sniffed)
+        _READER_CACHE.set(key, matched, version)
+    if not matched and not empty_ok:
+        if isinstance(path, list):
+            msg = [p.name for p in path]
+        else:
+            msg = path.name
+        raise ValueError(f"No reader functions available for {msg!r}")
+    return list(matched)
+
+
+def _sniff_providers(path: Path | list[Path]) -> frozenset[int]:
+    """Indices of the content-sniffing providers that accept the file header(s)."""
+    sniffing = [
+        index
+        for index in _READER_PROVIDER_INDEX.candidates(path)
+        if _READER_PROVIDERS[index].sniff is not None
+    ]
+    if not sniffing:
+        return frozenset()
+    paths = path if isinstance(path, list) else [path]
+    headers = [read_header(p) for p in paths]
+    accepted: set[int] = set()
+    for index in sniffing:
+        info = _READER_PROVIDERS[index]
+        try:
+            if all(info.sniff(header) for header in headers):
+                accepted.add(index)
+        except Exception as e:
+            _warn_failed_provider(info.sniff, e)
+    return frozenset(accepted)
+
+
+def _resolve_readers(
+    path: Path | list[Path],
+    sniffed: frozenset[int] = frozenset(),
+) -> list[ReaderTuple]:
     matched: list[ReaderTuple] = []
     priority_max = -float("inf")
-    for info in _READER_PROVIDERS:
+    for index in _READER_PROVIDER_INDEX.candidates(path):
+        info = _READER_PROVIDERS[index]
+        if info.sniff is not None and index not in sniffed:
+            continue
         try:
             out = info.provider(path)
         except Exception as e:
@@ -75,17 +747,27 @@ def get_readers(path: Path | list[Path], empty_ok: bool = False) -> list[ReaderT
                         f"Reader provider {info.provider!r} returned {out!r}, which is "
                         "not callable."
                     )
-    if not matched and not empty_ok:
-        if isinstance(path, list):
-            msg = [p.name for p in path]
-        else:
-            msg = path.name
-        raise ValueError(f"No reader functions available for {msg!r}")
     return [reader for reader in matched if reader.priority == priority_max]
 
 
 def get_writers(model: WidgetDataModel, empty_ok: bool = False) -> list[WriterFunction]:
     """Get writer functions that can write given data model."""
+    # the raw value is used not to load a lazy value
+    if isinstance(raw := model.raw_value, LazyValue):
+        key = (model.type, LazyValue, raw.value_type)
+    else:
+        key = (model.type, type(raw))
+    version = _REGISTRY_VERSION
+    if (matched := _WRITER_CACHE.get(key, version)) is None:
+        matched = _resolve_writers(model)
+        _WRITER_CACHE.set(key, matched, version)
+    if not matched and not empty_ok:
+        _LOGGER.info("Writer providers: %r", [x[0] for x in _WRITER_PROVIDERS])
+        raise ValueError(f"No writer functions available for {model.type!r}")
+    return list(matched)
+
+
+def _resolve_writers(model: WidgetDataModel) -> list[WriterFunction]:
     matched: list[tuple[WriterFunction, int]] = []
     priority_max = -1
     for provider, priority in _WRITER_PROVIDERS:
@@ -103,9 +785,6 @@ def get_writers(model: WidgetDataModel, empty_ok: bool = False) -> list[WriterFu
                         f"Writer provider {provider!r} returned {out!r}, which is not"
                         "callable."
                     )
-    if not matched and not empty_ok:
-        _LOGGER.info("Writer providers: %r", [x[0] for x in _WRITER_PROVIDERS])
-        raise ValueError(f"No writer functions available for {model.type!r}")
     return [fn for fn, pri in matched if pri == priority_max]
 
 
@@ -113,17 +792,28 @@ def _warn_failed_provider(provider, e: Exception):
     return warnings.warn(
         f"Error in reader provider {provider!r}: {e}",
         RuntimeWarning,
-        stacklevel=3,
+        stacklevel=4,
     )
 
 
 @overload
-def register_reader_provider(provider: _RP, *, priority: int = 0) -> _RP: ...
+def register_reader_provider(
+    provider: _RP,
+    *,
+    priority: int = 0,
+    suffixes: Iterable[str] | None = None,
+    sniff: _Sniffer | None = None,
+) -> _RP: ...
 @overload
-def register_reader_provider(*, priority: int = 0) -> Callable[[_RP], _RP]: ...
+def register_reader_provider(
+    *,
+    priority: int = 0,
+    suffixes: Iterable[str] | None = None,
+    sniff: _Sniffer | None = None,
+) -> Callable[[_RP], _RP]: ...
 
 
-def register_reader_provider(provider=None, priority=0):
+def register_reader_provider(provider=None, priority=0, suffixes=None, sniff=None):
     """
     Register reader provider function.
 
@@ -138,14 +828,58 @@ def register_reader_provider(provider=None, priority=0):
     ...         with open(path) as f:
     ...             return WidgetDataModel(value=f.read(), type="text", source=path)
     ...     return _read_text
+
+    A reader function can also be a generator function that yields `ReaderChunk`s
+    (lines for text, rows for tables or frames for images) and optionally a
+    `ReaderMetadata`. Such readers are streamed to the widget if the widget class
+    implements an `append_chunk` method. Metadata yielded before the first chunk is
+    also used to create the widget.
+
+    >>> @register_reader_provider
+    ... def my_reader_provider(path):
+    ...     def _read_text(path):
+    ...         with open(path) as f:
+    ...             while lines := f.readlines(2**20):
+    ...                 yield ReaderChunk("".join(lines), type="text")
+    ...     return _read_text
+
+    If `suffixes` is given, the provider will only be called for the paths that match
+    any of the patterns. A pattern can be a suffix (".txt", ".tar.gz"), a file name
+    ("Makefile") or a glob pattern ("*_metadata.json"). Matching is case-insensitive.
+
+    >>> @register_reader_provider(suffixes=[".txt"])
+    ... def my_reader_provider(path):
+    ...     ...
+
+    If the file format has to be identified by its content, give a `sniff` function
+    instead of opening the file in the provider. It is called with the first
+    `HEADER_SIZE` bytes of the file (or an empty bytes for directories), and the
+    provider is called only if it returns True. The header is read only once and
+    shared by all the sniffers.
+
+    >>> @register_reader_provider(sniff=lambda header: header.startswith(b"%PDF"))
+    ... def my_reader_provider(path):
+    ...     ...
+
+    Resolved reader functions are cached for each kind of path (suffix, whether it is
+    a directory and whether multiple paths are given) and the result of sniffing.
+    Providers should therefore decide by the file type, not by the content of each
+    file.
     """
     _check_priority(priority)
+    patterns = _norm_patterns(suffixes)
+    if sniff is not None and not callable(sniff):
+        raise TypeError(f"`sniff` must be callable, got {sniff!r}.")
 
     def _inner(func):
         if not callable(func):
             raise ValueError("Provider must be callable.")
         plugin = _plugin_info_from_func(func)
-        _READER_PROVIDERS.append(ReaderProviderTuple(func, priority, plugin))
+        _READER_PROVIDER_INDEX.add(len(_READER_PROVIDERS), patterns)
+        _READER_PROVIDERS.append(
+            ReaderProviderTuple(func, priority, plugin, patterns, sniff)
+        )
+        _bump_registry_version()
         return func
 
     return _inner if provider is None else _inner(provider)
@@ -172,6 +906,9 @@ def register_writer_provider(provider=None, priority=0):
     ...         with open(model.source, "w") as f:
     ...             f.write(model.value)
     ...     return _write_text
+
+    Resolved writer functions are cached for each pair of the model `type` and the
+    Python type of the model value.
     """
     _check_priority(priority)
 
@@ -179,11 +916,50 @@ def register_writer_provider(provider=None, priority=0):
         if not callable(func):
             raise ValueError("Provider must be callable.")
         _WRITER_PROVIDERS.append((TypedWriterProvider.try_convert(func), priority))
+        _bump_registry_version()
         return func
 
     return _inner if provider is None else _inner(provider)
 
 
+def register_incremental_writer(
+    writer: WriterFunction,
+) -> Callable[[_Updater], _Updater]:
+    """
+    Register a function that updates a file written by `writer` in place.
+
+    The function is called with the model and the path of an existing file before
+    `writer` is used to rewrite the whole file. It should return True if the file is
+    updated, or False without touching the file if it cannot be updated in place (the
+    file is then rewritten by `writer`). Appending only the new part of the data is
+    much faster than rewriting a large file.
+
+    >>> @register_incremental_writer(_write_log)
+    ... def _append_log(model: WidgetDataModel, path: Path) -> bool:
+    ...     ...
+    """
+
+    def _inner(func: _Updater) -> _Updater:
+        if not callable(func):
+            raise ValueError("Incremental writer must be callable.")
+        _INCREMENTAL_WRITERS[writer] = func
+        return func
+
+    return _inner
+
+
+def _norm_patterns(suffixes: Iterable[str] | None) -> tuple[str, ...] | None:
+    if suffixes is None:
+        return None
+    if isinstance(suffixes, str):
+        suffixes = [suffixes]
+    patterns = tuple(suffixes)
+    for pattern in patterns:
+        if not isinstance(pattern, str) or pattern == "":
+            raise ValueError(f"Invalid file pattern: {pattern!r}")
+    return patterns
+
+
 def _check_priority(priority: int):
     if isinstance(priority, int) or hasattr(priority, "__int__"):
         return int(priority)
@@ -196,10 +972,25 @@ class TypedWriterProvider:
         self._data_type = typ
 
     def __call__(self, model: WidgetDataModel):
+        if isinstance(lazy := model.raw_value, LazyValue):
+            # the declared type is checked, so that the value is not loaded here
+            typ = lazy.value_type
+            if typ is None or not issubclass(typ, self._data_type):
+                return None
+            return self._deferred_writer
         if not isinstance(model.value, self._data_type):
             return None
         return self._func(model)
 
+    def _deferred_writer(self, model: WidgetDataModel, path: Path) -> None:
+        if not isinstance(value := model.value, self._data_type):
+            raise TypeError(
+                f"Writer {self._func!r} does not support {type(value).__name__}."
+            )
+        if not callable(writer := self._func(model)):
+            raise ValueError(f"Writer provider {self._func!r} returned {writer!r}.")
+        return writer(model, path)
+
     @staticmethod
     def try_convert(func: Callable) -> Callable:
         if arg := get_widget_data_model_variable(func):
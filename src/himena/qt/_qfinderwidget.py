@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from qtpy import QtWidgets as QtW, QtGui
+from concurrent.futures import Future
+import re
+from qtpy import QtWidgets as QtW, QtGui, QtCore
 from qtpy.QtCore import Qt
 from typing import TYPE_CHECKING, Generic, TypeVar
-import itertools
+import numpy as np
+from himena.widgets._jobs import get_executor
 
 _W = TypeVar("_W", bound=QtW.QPlainTextEdit)
 _X = TypeVar("_W", bound=QtW.QWidget)
@@ -25,7 +28,7 @@ class _QFinderBaseWidget(QtW.QDialog, Generic[_X]):
         _layout.addWidget(_btn_next)
         _btn_prev.clicked.connect(self._find_prev)
         _btn_next.clicked.connect(self._find_next)
-        _line.textChanged.connect(self._find_next)
+        _line.textChanged.connect(self._on_text_changed)
         self._line_edit = _line
 
     # fmt: off
@@ -36,6 +39,9 @@ class _QFinderBaseWidget(QtW.QDialog, Generic[_X]):
     def lineEdit(self) -> QtW.QLineEdit:
         return self._line_edit
 
+    def _on_text_changed(self):
+        self._find_next()
+
     def _find_prev(self):
         raise NotImplementedError
 
@@ -79,39 +85,142 @@ class QFinderWidget(_QFinderBaseWidget[_W]):
             qtext.find(text)
 
 
-class QTableFinderWidget(_QFinderBaseWidget[QtW.QTableWidget]):
+class QTableFinderWidget(_QFinderBaseWidget[QtW.QTableView]):
+    """
+    A finder widget for a table view.
+
+    The parent table model must implement ``find`` (see ``QTableDataModel``). Search
+    runs in a worker thread, and the sorted array of hit positions is used to jump
+    to the next/previous hit by bisection.
+    """
+
+    _search_finished = QtCore.Signal(int, object)
+
+    def __init__(self, parent: QtW.QTableView | None = None):
+        super().__init__(parent)
+        self._case_button = _make_toggle_button("Aa", "Match case")
+        self._regex_button = _make_toggle_button(".*", "Use regular expression")
+        self._count_label = QtW.QLabel()
+        self._count_label.setMinimumWidth(60)
+        layout = self.layout()
+        layout.insertWidget(1, self._case_button)
+        layout.insertWidget(2, self._regex_button)
+        layout.insertWidget(3, self._count_label)
+        self._case_button.toggled.connect(self._start_search)
+        self._regex_button.toggled.connect(self._start_search)
+        self._search_finished.connect(self._on_search_finished)
+
+        self._hits: np.ndarray | None = None
+        self._searched_nrows = 0
+        self._generation = 0
+        self._future: Future | None = None
+        self._pending_step = 0
+        model = parent.model()
+        model.dataChanged.connect(self._invalidate)
+        model.modelReset.connect(self._invalidate)
+        model.rowsInserted.connect(self._on_rows_inserted)
+
+    def _on_text_changed(self):
+        self._start_search(step=0)
+
     def _find_prev(self):
-        line_text = self._line_edit.text()
-        if line_text == "":
-            return
-        qtable = self.parentWidget()
-        index = qtable.currentIndex()
-        i = index.row() * qtable.columnCount() + index.column()
-        nr, nc = qtable.rowCount(), qtable.columnCount()
-
-        for ith in itertools.chain(range(i, -1, -1), range(nr * nc - 1, i, -1)):
-            r, c = divmod(ith, nc)
-            text = qtable.item(r, c).text()
-            if text == "":
-                continue
-            if line_text in text:
-                qtable.setCurrentCell(r, c)
-                return
+        self._find(-1)
 
     def _find_next(self):
-        line_text = self._line_edit.text()
-        if line_text == "":
+        self._find(1)
+
+    def _find(self, step: int):
+        if self._line_edit.text() == "":
+            return
+        if self._hits is None:
+            self._start_search(step=step)
+        else:
+            self._jump(step)
+
+    def _invalidate(self, *_):
+        self._hits = None
+
+    def _on_rows_inserted(self, *_):
+        # rows fetched by the view are already searched; new data is not
+        if self.parentWidget().model().total_row_count() != self._searched_nrows:
+            self._hits = None
+
+    def _start_search(self, *_, step: int = 0):
+        self._generation += 1
+        self._hits = None
+        self._pending_step = step
+        if self._future is not None:
+            self._future.cancel()
+        pattern = self._line_edit.text()
+        if pattern == "":
+            self._count_label.setText("")
+            return
+        generation = self._generation
+        model = self.parentWidget().model()
+        regex = self._regex_button.isChecked()
+        case_sensitive = self._case_button.isChecked()
+        self._searched_nrows = model.total_row_count()
+
+        def _search():
+            try:
+                return model.find(
+                    pattern,
+                    regex=regex,
+                    case_sensitive=case_sensitive,
+                    cancelled=lambda: generation != self._generation,
+                )
+            except re.error:
+                return "invalid"
+
+        def _on_done(future: Future):
+            if future.cancelled():
+                return
+            try:
+                self._search_finished.emit(generation, future.result())
+            except RuntimeError:
+                pass  # finder already deleted
+
+        self._future = get_executor("thread").submit(_search)
+        self._future.add_done_callback(_on_done)
+
+    def _on_search_finished(self, generation: int, hits):
+        if generation != self._generation or hits is None:
+            return  # outdated
+        if isinstance(hits, str):
+            self._count_label.setText(hits)
+            return
+        self._hits = hits
+        self._jump(self._pending_step)
+
+    def _jump(self, step: int):
+        """Move to the hit at/after (step=0), after (1) or before (-1) current cell."""
+        hits = self._hits
+        if hits.size == 0:
+            self._count_label.setText("0 hits")
             return
         qtable = self.parentWidget()
+        model = qtable.model()
         index = qtable.currentIndex()
-        i = index.row() * qtable.columnCount() + index.column()
-        nr, nc = qtable.rowCount(), qtable.columnCount()
-
-        for ith in itertools.chain(range(i, nr * nc), range(i)):
-            r, c = divmod(ith, nc)
-            text = qtable.item(r, c).text()
-            if text == "":
-                continue
-            if line_text in text:
-                qtable.setCurrentCell(r, c)
-                return
+        if index.isValid():
+            current = index.row() * model.columnCount() + index.column()
+        else:
+            current = -1 if step >= 0 else 0
+        if step < 0:
+            ith = (np.searchsorted(hits, current, side="left") - 1) % hits.size
+        else:
+            side = "left" if step == 0 else "right"
+            ith = np.searchsorted(hits, current, side=side) % hits.size
+        r, c = divmod(int(hits[ith]), model.columnCount())
+        if r >= model.rowCount():
+            model.fetch_rows(r + 1)
+        qtable.setCurrentIndex(model.index(r, c))
+        self._count_label.setText(f"{ith + 1} / {hits.size}")
+
+
+def _make_toggle_button(text: str, tooltip: str) -> QtW.QToolButton:
+    button = QtW.QToolButton()
+    button.setText(text)
+    button.setToolTip(tooltip)
+    button.setCheckable(True)
+    button.setFixedSize(22, 18)
+    return button
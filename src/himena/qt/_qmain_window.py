@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from timeit import default_timer as timer
 import logging
-from typing import Callable, Literal, TypeVar, TYPE_CHECKING, cast
+from typing import Any, Callable, Literal, TypeVar, TYPE_CHECKING, cast
 from pathlib import Path
 
 import app_model
@@ -15,6 +15,7 @@ from himena.qt._qsub_window import QSubWindow, QSubWindowArea
 from himena.qt._qdock_widget import QDockWidget
 from himena.qt._qcommand_palette import QCommandPalette
 from himena.qt._qgoto import QGotoWidget
+from himena.qt._qprogress import QJobProgress, QLoadingPlaceholder
 from himena import anchor as _anchor
 from himena.types import (
     DockArea,
@@ -36,6 +37,7 @@ from himena.qt._utils import (
 
 if TYPE_CHECKING:
     from himena.widgets._main_window import SubWindow, MainWindow
+    from himena.widgets._jobs import JobHandle
 
 _STYLE_QSS_PATH = Path(__file__).parent / "style.qss"
 _ICON_PATH = Path(__file__).parent.parent / "resources" / "icon.svg"
@@ -45,6 +47,7 @@ _LOGGER = logging.getLogger(__name__)
 
 class QMainWindow(QModelMainWindow, widgets.BackendMainWindow[QtW.QWidget]):
     _himena_main_window: MainWindow
+    _main_thread_call_requested = QtCore.Signal(object)
 
     def __init__(self, app: app_model.Application):
         _app_instance = get_event_loop_handler("qt", app.name)
@@ -106,6 +109,7 @@ class QMainWindow(QModelMainWindow, widgets.BackendMainWindow[QtW.QWidget]):
         self.setStyleSheet(style_text)
 
         self._anim_subwindow = QtCore.QPropertyAnimation()
+        self._main_thread_call_requested.connect(self._call_requested_function)
         self.setMinimumSize(400, 300)
         self.resize(800, 600)
 
@@ -518,6 +522,30 @@ class QMainWindow(QModelMainWindow, widgets.BackendMainWindow[QtW.QWidget]):
         win.setFocus()
         return None
 
+    def _call_in_main_thread(self, func: Callable[[], Any]) -> None:
+        # signal emitted from a worker thread is queued to the main thread
+        self._main_thread_call_requested.emit(func)
+        return None
+
+    @QtCore.Slot(object)
+    def _call_requested_function(self, func: Callable[[], Any]) -> None:
+        func()
+        return None
+
+    def _add_job_progress(self, job: JobHandle) -> None:
+        progress = QJobProgress(job)
+        self.statusBar().addPermanentWidget(progress)
+
+        @job.add_done_callback
+        def _remove(_):
+            self.statusBar().removeWidget(progress)
+            progress.deleteLater()
+
+        return None
+
+    def _loading_placeholder(self, job: JobHandle) -> QLoadingPlaceholder:
+        return QLoadingPlaceholder(job)
+
 
 def _is_root_menu_id(app: app_model.Application, menu_id: str) -> bool:
     if menu_id in (
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from qtpy import QtWidgets as QtW
+from qtpy import QtCore
+
+if TYPE_CHECKING:
+    from himena.widgets._jobs import JobHandle
+
+
+class QJobProgress(QtW.QWidget):
+    """A progress bar with a cancel button for a running job."""
+
+    def __init__(self, job: JobHandle, parent: QtW.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtW.QHBoxLayout(self)
+        layout.setContentsMargins(2, 0, 2, 0)
+        layout.setSpacing(2)
+        self._label = QtW.QLabel(job.title)
+        self._progress_bar = QtW.QProgressBar()
+        self._progress_bar.setFixedWidth(120)
+        self._progress_bar.setFixedHeight(14)
+        self._progress_bar.setFormat("%v/%m")
+        self._set_progress(*job.progress)
+        self._cancel_button = QtW.QToolButton()
+        self._cancel_button.setText("✕")
+        self._cancel_button.setToolTip("Cancel")
+        self._cancel_button.setFixedSize(16, 16)
+        self._cancel_button.clicked.connect(job.cancel)
+        layout.addWidget(self._label)
+        layout.addWidget(self._progress_bar)
+        layout.addWidget(self._cancel_button)
+        layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignVCenter)
+        job.add_progress_callback(self._set_progress)
+
+    def _set_progress(self, n_done: int, total: int) -> None:
+        if total <= 1:
+            # a single task such as saving a large file; show a busy indicator
+            self._progress_bar.setRange(0, 0)
+        else:
+            self._progress_bar.setRange(0, total)
+            self._progress_bar.setValue(n_done)
+        return None
+
+
+class QLoadingPlaceholder(QtW.QWidget):
+    """A placeholder widget shown in a sub-window while the content is loading."""
+
+    def __init__(self, job: JobHandle, parent: QtW.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtW.QVBoxLayout(self)
+        layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._label = QtW.QLabel(f"{job.title} ...")
+        self._label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._progress_bar = QtW.QProgressBar()
+        self._progress_bar.setRange(0, 0)  # busy indicator
+        self._progress_bar.setFixedHeight(14)
+        self._progress_bar.setTextVisible(False)
+        self._cancel_button = QtW.QPushButton("Cancel")
+        self._cancel_button.clicked.connect(job.cancel)
+        layout.addWidget(self._label)
+        layout.addWidget(self._progress_bar)
+        layout.addWidget(
+            self._cancel_button, alignment=QtCore.Qt.AlignmentFlag.AlignCenter
+        )
+
+    def size_hint(self) -> tuple[int, int]:
+        return 240, 120
@@ -191,7 +191,7 @@ class QTabWidget(QtW.QTabWidget):
             for url in urls:
                 if url.isLocalFile():
                     path = url.toLocalFile()
-                    get_main_window(self).read_file(path)
+                    get_main_window(self).read_file_async(path)
         return super().dropEvent(event)
 
     def widget_area(self, index: int) -> QSubWindowArea | None:
@@ -17,6 +17,7 @@ class QFallbackWidget(QtW.QPlainTextEdit):
     def from_model(cls, model: WidgetDataModel) -> QFallbackWidget:
         self = cls()
         self.setPlainText(
-            f"No widget registered for:\n\ntype: {model.type!r}\nvalue: {model.value!r}"
+            "No widget registered for:\n\n"
+            f"type: {model.type!r}\nvalue: {model.raw_value!r}"
         )
         return self
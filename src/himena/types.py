@@ -1,9 +1,11 @@
 from functools import wraps
 import inspect
 from pathlib import Path
+import threading
 from typing import (
     Any,
     Callable,
+    Iterator,
     Literal,
     NamedTuple,
     TypeAlias,
@@ -63,6 +65,125 @@ else:
             return cls
 
 
+class LazyValue(Generic[_T]):
+    """
+    A value that is loaded on demand.
+
+    Widgets that support lazy values can read only the part they need by indexing, and
+    the entire value is loaded and cached on `compute()`.
+
+    >>> value = LazyValue(
+    ...     lambda: np.load(path),
+    ...     getitem=lambda key: np.load(path, mmap_mode="r")[key],
+    ...     shape=(100, 2048, 2048),
+    ...     dtype=np.uint16,
+    ... )
+    >>> model = WidgetDataModel(value=value, type="image")
+
+    Parameters
+    ----------
+    loader : callable
+        Function that returns the entire value.
+    getitem : callable, optional
+        Function that returns a part of the value for the given key. If not given,
+        indexing loads the entire value.
+    shape : tuple of int, optional
+        Shape of the value if it is array-like.
+    dtype : Any, optional
+        Data type of the value if it is array-like.
+    nbytes : int, optional
+        Estimated size of the value in bytes.
+    value_type : type, optional
+        Type of the loaded value. If not given, numpy array is expected for values
+        with `shape` or `dtype`. Writers are chosen by this type without loading.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], _T],
+        *,
+        getitem: Callable[[Any], Any] | None = None,
+        shape: tuple[int, ...] | None = None,
+        dtype: Any = None,
+        nbytes: int | None = None,
+        value_type: type | None = None,
+    ):
+        if not callable(loader):
+            raise TypeError(f"`loader` must be callable, got {type(loader)}.")
+        self._loader = loader
+        self._getitem = getitem
+        self._shape = None if shape is None else tuple(shape)
+        self._dtype = dtype
+        self._nbytes = nbytes
+        self._value_type = value_type
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._cache: _T | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(shape={self._shape!r}, dtype={self._dtype!r}, "
+            f"loaded={self._loaded})"
+        )
+
+    @property
+    def shape(self) -> tuple[int, ...] | None:
+        """Shape of the value (None if unknown)."""
+        return self._shape
+
+    @property
+    def ndim(self) -> int | None:
+        """Number of dimensions of the value (None if unknown)."""
+        if self._shape is None:
+            return None
+        return len(self._shape)
+
+    @property
+    def dtype(self) -> Any:
+        """Data type of the value (None if unknown)."""
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int | None:
+        """Estimated size of the value in bytes (None if unknown)."""
+        return self._nbytes
+
+    @property
+    def value_type(self) -> type | None:
+        """Type of the value (None if unknown)."""
+        if self._loaded:
+            return type(self._cache)
+        if self._value_type is None and (
+            self._shape is not None or self._dtype is not None
+        ):
+            import numpy as np
+
+            return np.ndarray
+        return self._value_type
+
+    def is_loaded(self) -> bool:
+        """True if the entire value is already loaded."""
+        return self._loaded
+
+    def compute(self) -> _T:
+        """Load the entire value, or return the cached one."""
+        with self._lock:
+            if not self._loaded:
+                self._cache = self._loader()
+                self._loaded = True
+        return self._cache
+
+    def __getitem__(self, key) -> Any:
+        if self._loaded or self._getitem is None:
+            return self.compute()[key]
+        return self._getitem(key)
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        return np.asarray(self.compute(), dtype=dtype)
+
+
 class WidgetDataModel(GenericModel[_T]):
     """
     A data model that represents a widget containing an internal data.
@@ -70,7 +191,8 @@ class WidgetDataModel(GenericModel[_T]):
     Parameters
     ----------
     value : Any
-        Internal value.
+        Internal value. If a `LazyValue` is given, it is loaded on the first access
+        to the `value` attribute.
     source : Path, optional
         Path of the source file if exists.
     type : str, optional
@@ -105,6 +227,17 @@ class WidgetDataModel(GenericModel[_T]):
         description="Additional data that may be used for specific widgets.",
     )  # fmt: skip
 
+    def __getattribute__(self, name: str):
+        out = super().__getattribute__(name)
+        if name == "value" and isinstance(out, LazyValue):
+            return out.compute()
+        return out
+
+    @property
+    def raw_value(self) -> "_T | LazyValue[_T]":
+        """The internal value without loading it even if it is lazy."""
+        return super().__getattribute__("value")
+
     def with_value(self, value: _U, type: str | None = None) -> "WidgetDataModel[_U]":
         update = {"value": value}
         if type is not None:
@@ -163,7 +296,7 @@ class WidgetDataModel(GenericModel[_T]):
         return [s if s.startswith(".") else f".{s}" for s in v]
 
     def __repr__(self):
-        value_repr = repr(self.value)
+        value_repr = repr(self.raw_value)
         if len(value_repr) > 24:
             value_repr = value_repr[:24] + "..."
         if source := self.source:
@@ -217,7 +350,33 @@ def is_subtype(string: str, supertype: str) -> bool:
     return string_parts[: len(supertype_parts)] == supertype_parts
 
 
+class ReaderChunk(NamedTuple):
+    """A chunk of data yielded by a streaming reader function."""
+
+    value: Any
+    type: str
+
+
+class ReaderMetadata(BaseModel):
+    """Metadata of the data, optionally yielded last by a streaming reader function."""
+
+    title: str | None = Field(default=None, description="Title for the widget.")
+    extension_default: str | None = Field(
+        default=None,
+        description="Default file extension for saving.",
+    )
+    extensions: list[str] = Field(
+        default_factory=list,
+        description="List of allowed file extensions.",
+    )
+    additional_data: object | None = Field(
+        default=None,
+        description="Additional data that may be used for specific widgets.",
+    )
+
+
 ReaderFunction = Callable[[Path], WidgetDataModel]
+StreamingReaderFunction = Callable[[Path], Iterator["ReaderChunk | ReaderMetadata"]]
 WriterFunction = Callable[[WidgetDataModel, Path], None]
 
 
@@ -377,3 +536,60 @@ class TextFileMeta(BaseModel):
 
     language: str | None = Field(None, description="Language of the text file.")
     spaces: int = Field(4, description="Number of spaces for indentation.")
+
+
+class FileStamp(BaseModel):
+    """Path, size and modification time of a file, to detect changes of the file."""
+
+    path: Path = Field(..., description="Resolved path of the file.")
+    size: int = Field(..., description="Size of the file in bytes.")
+    mtime_ns: int = Field(..., description="Modification time in nanoseconds.")
+
+    @classmethod
+    def of(cls, path: str | Path) -> "FileStamp":
+        """Stamp the file at the path as it is now."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        return cls(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    def matches(self, path: str | Path) -> bool:
+        """True if `path` is the stamped file and it was not changed since."""
+        try:
+            return FileStamp.of(path) == self
+        except OSError:
+            return False
+
+
+class TableChanges(BaseModel):
+    """Changes of a table since it was last read from or saved to a file."""
+
+    nrows_saved: int = Field(
+        0, description="Number of rows that were in the file when it was last saved."
+    )
+    edited_rows: list[tuple[int, int]] = Field(
+        default_factory=list,
+        description="Sorted, non-overlapping (start, stop) ranges of the saved rows "
+        "that were edited.",
+    )
+    structure_changed: bool = Field(
+        False, description="Whether the columns were changed."
+    )
+    saved_file: FileStamp | None = Field(
+        None, description="The file the saved rows are in, as last read or saved."
+    )
+
+    def is_append_only(self) -> bool:
+        """True if rows were only added after the saved rows."""
+        return not self.edited_rows and not self.structure_changed
+
+
+class TableMeta(BaseModel):
+    """Preset for describing a table metadata."""
+
+    header: bool = Field(True, description="Whether the table has column names.")
+    changes: TableChanges | None = Field(
+        None, description="Changes since the table was last saved, if tracked."
+    )
+    source: FileStamp | None = Field(
+        None, description="The file the table was read from, as it was before reading."
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import inspect
 from pathlib import Path
-from typing import Callable, Generic, Literal, TypeVar, TYPE_CHECKING, overload
+from typing import Any, Callable, Generic, Literal, TypeVar, TYPE_CHECKING, overload
 
 from himena.anchor import WindowAnchor
 from himena.types import (
@@ -18,6 +18,7 @@ from himena.types import (
 if TYPE_CHECKING:
     from himena.widgets._main_window import MainWindow
     from himena.widgets._wrapper import SubWindow, DockWidget
+    from himena.widgets._jobs import JobHandle
     import numpy as np
     from numpy.typing import NDArray
 
@@ -202,3 +203,12 @@ class BackendMainWindow(Generic[_W]):  # pragma: no cover
 
     def _move_focus_to(self, widget: _W) -> None:
         raise NotImplementedError
+
+    def _call_in_main_thread(self, func: Callable[[], Any]) -> None:
+        raise NotImplementedError
+
+    def _add_job_progress(self, job: JobHandle) -> None:
+        raise NotImplementedError
+
+    def _loading_placeholder(self, job: JobHandle) -> _W:
+        raise NotImplementedError
@@ -0,0 +1,255 @@
+"""Jobs that run in worker threads or processes."""
+
+from __future__ import annotations
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from logging import getLogger
+import os
+import sys
+import threading
+from typing import Any, Callable, Generic, Literal, Sequence, TypeVar, TYPE_CHECKING
+
+from psygnal import Signal
+
+if TYPE_CHECKING:
+    from himena.widgets import BackendMainWindow
+
+_R = TypeVar("_R")
+_LOGGER = getLogger(__name__)
+
+ExecutorType = Literal["thread", "process"]
+
+_MAX_THREAD_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+_EXECUTORS: dict[ExecutorType, Executor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor(kind: ExecutorType = "thread") -> Executor:
+    """Get the bounded worker pool shared in the application."""
+    with _EXECUTOR_LOCK:
+        if (executor := _EXECUTORS.get(kind)) is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(
+                    max_workers=_MAX_THREAD_WORKERS,
+                    thread_name_prefix="himena-worker",
+                )
+            elif kind == "process":
+                executor = ProcessPoolExecutor()
+            else:
+                raise ValueError(f"Unknown executor type: {kind!r}")
+            _EXECUTORS[kind] = executor
+    return executor
+
+
+class JobHandle(Generic[_R]):
+    """
+    A future-like handle of a job running in workers.
+
+    A job consists of one or more tasks. Callbacks connected to the handle are always
+    called in the main thread. If the job failed, the exception is passed to the error
+    callbacks, or to `sys.excepthook` if there is none.
+    """
+
+    progressed = Signal(int, int)
+    finished = Signal()
+    errored = Signal(object)
+
+    def __init__(self, title: str, total: int):
+        self._title = title
+        self._total = total
+        self._n_done = 0
+        self._futures: list[Future] = []
+        self._cancelled = False
+        self._error: BaseException | None = None
+        self._done = threading.Event()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(title={self._title!r}, "
+            f"progress={self._n_done}/{self._total})"
+        )
+
+    @property
+    def title(self) -> str:
+        """Title of the job."""
+        return self._title
+
+    @property
+    def progress(self) -> tuple[int, int]:
+        """Tuple of the number of finished tasks and the total number of tasks."""
+        return self._n_done, self._total
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job.
+
+        Tasks that have not started yet will never run, and results of the running
+        tasks will be discarded.
+        """
+        if self.done():
+            return False
+        self._cancelled = True
+        for future in self._futures:
+            future.cancel()
+        self._finish()
+        return True
+
+    def cancelled(self) -> bool:
+        """True if the job was cancelled."""
+        return self._cancelled
+
+    def done(self) -> bool:
+        """True if the job finished or was cancelled."""
+        return self._done.is_set()
+
+    def exception(self) -> BaseException | None:
+        """The exception that made the job fail, or None."""
+        return self._error
+
+    def result(self, timeout: float | None = None) -> list[_R]:
+        """Wait for all the tasks and return their results."""
+        wait(self._futures, timeout=timeout)
+        if self._error is not None:
+            raise self._error
+        return [future.result(timeout=0) for future in self._futures]
+
+    def add_done_callback(self, callback: Callable[[JobHandle[_R]], Any]) -> None:
+        """Add a callback that will be called with this handle when job is done."""
+        if self.done():
+            callback(self)
+        else:
+            self.finished.connect(lambda: callback(self))
+        return None
+
+    def add_progress_callback(self, callback: Callable[[int, int], Any]) -> None:
+        """Add a callback that will be called with (n_done, total) on progress."""
+        self.progressed.connect(callback)
+        return None
+
+    def add_error_callback(self, callback: Callable[[BaseException], Any]) -> None:
+        """Add a callback that will be called with the exception if the job failed."""
+        if self._error is not None:
+            callback(self._error)
+        else:
+            self.errored.connect(callback)
+        return None
+
+    def _finish(self) -> None:
+        if not self._done.is_set():
+            self._done.set()
+            self.finished.emit()
+        return None
+
+    def _fail(self, exc: BaseException) -> None:
+        """Finish the job with an error, cancelling the tasks not started yet."""
+        if self.done():
+            return None
+        self._error = exc
+        for future in self._futures:
+            future.cancel()
+        self._finish()
+        if len(self.errored) > 0:
+            self.errored.emit(exc)
+        else:
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+        return None
+
+
+def run_tasks(
+    backend: BackendMainWindow,
+    tasks: Sequence[tuple[Callable[..., _R], tuple]],
+    on_result: Callable[[int, _R], Any],
+    *,
+    title: str = "",
+    executor: ExecutorType = "thread",
+    job: JobHandle[_R] | None = None,
+    fail_fast: bool = True,
+) -> JobHandle[_R]:
+    """
+    Run tasks in parallel and process the results in the order of `tasks`.
+
+    Parameters
+    ----------
+    backend : BackendMainWindow
+        The backend main window used to call back in the main thread.
+    tasks : sequence of (function, args)
+        Tasks to run. Functions and arguments must be picklable if `executor` is
+        "process".
+    on_result : callable
+        Function called with the index and the result of each task in the main thread.
+        Results are passed in the order of `tasks` as soon as all the preceding tasks
+        have finished.
+    title : str, optional
+        Title of the job.
+    executor : "thread" or "process", default "thread"
+        Type of the worker pool.
+    job : JobHandle, optional
+        Handle to be used for this job. Useful if tasks need to refer to the handle.
+    fail_fast : bool, default True
+        If true, the job fails as soon as a task or `on_result` raised, and the tasks
+        not started yet are cancelled. Otherwise all the tasks are run and the job fails
+        with the first error at the end.
+    """
+    if job is None:
+        job = JobHandle[_R](title, len(tasks))
+    pool = get_executor(executor)
+    results: dict[int, Future] = {}
+    errors: list[BaseException] = []
+    next_index = 0
+
+    def _on_task_done(index: int, future: Future) -> None:
+        nonlocal next_index
+        if job.done() or future.cancelled():
+            return None
+        if fail_fast and (exc := future.exception()) is not None:
+            return job._fail(exc)
+        results[index] = future
+        job._n_done += 1
+        job.progressed.emit(job._n_done, job._total)
+        while next_index in results:
+            each = results.pop(next_index)
+            if (exc := each.exception()) is not None:
+                errors.append(exc)
+            else:
+                try:
+                    on_result(next_index, each.result())
+                except Exception as e:
+                    if fail_fast:
+                        return job._fail(e)
+                    errors.append(e)
+            next_index += 1
+        if next_index == job._total:
+            if errors:
+                job._fail(errors[0])
+            else:
+                job._finish()
+        return None
+
+    for index, (func, args) in enumerate(tasks):
+        future = pool.submit(func, *args)
+        job._futures.append(future)
+        future.add_done_callback(
+            lambda f, i=index: _call_in_main_thread(
+                backend, lambda: _on_task_done(i, f)
+            )
+        )
+    if len(tasks) == 0:
+        job._finish()
+    else:
+        backend._add_job_progress(job)
+    return job
+
+
+def _call_in_main_thread(backend: BackendMainWindow, func: Callable[[], Any]) -> None:
+    try:
+        backend._call_in_main_thread(func)
+    except RuntimeError:
+        # main window is already deleted
+        _LOGGER.info("Main window deleted before job finished.")
+    return None
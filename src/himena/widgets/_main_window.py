@@ -21,6 +21,8 @@ from himena.types import (
 from himena.session import from_yaml
 from himena.widgets._backend import BackendMainWindow
 from himena.widgets._hist import ActivationHistory
+from himena.io import get_writers, _write_atomic
+from himena.widgets._jobs import ExecutorType, JobHandle, run_tasks
 from himena.widgets._widget_list import TabList, TabArea, DockWidgetList
 from himena.widgets._wrapper import SubWindow, DockWidget
 
@@ -252,6 +254,66 @@ class MainWindow(Generic[_W]):
         _, tabarea = self._current_or_new_tab()
         return tabarea.read_file(file_path)
 
+    def read_file_async(
+        self,
+        file_path: str | Path | list[str | Path],
+        *,
+        executor: ExecutorType = "thread",
+    ) -> JobHandle[WidgetDataModel]:
+        """Read local file(s) in a worker and open as a new sub-window."""
+        _, tabarea = self._current_or_new_tab()
+        return tabarea.read_file_async(file_path, executor=executor)
+
+    def read_files_async(
+        self,
+        file_paths: list[str | Path],
+        *,
+        executor: ExecutorType = "thread",
+    ) -> JobHandle[WidgetDataModel]:
+        """Read local files in parallel and open each of them as a new sub-window."""
+        _, tabarea = self._current_or_new_tab()
+        return tabarea.read_files_async(file_paths, executor=executor)
+
+    def _save_models_async(
+        self,
+        items: list[tuple[SubWindow[_W], WidgetDataModel, Path]],
+    ) -> JobHandle[None]:
+        """
+        Write the models of sub-windows to the paths in workers.
+
+        Each file is atomically replaced after the writer function finished, and the
+        save path of the sub-window is updated. Edits made during the save remain
+        unsaved, and all the changes remain unsaved if the save failed.
+        """
+        tasks = []
+        for _, model, path in items:
+            writer = get_writers(model)[0]
+            tasks.append((_write_atomic, (writer, model, path)))
+        if len(items) == 1:
+            title = f"Saving {items[0][2].name}"
+        else:
+            title = f"Saving {len(items)} files"
+        states = [sub_win._begin_save() for sub_win, _, _ in items]
+        saved: set[int] = set()
+
+        def _on_result(index: int, _) -> None:
+            sub_win, _, path = items[index]
+            saved.add(index)
+            sub_win._end_save(states[index], path)
+            return None
+
+        def _on_finished(_) -> None:
+            for index, (sub_win, _, _) in enumerate(items):
+                if index not in saved:
+                    sub_win._end_save(states[index], None)
+            return None
+
+        job = run_tasks(
+            self._backend_main_window, tasks, _on_result, title=title, fail_fast=False
+        )
+        job.add_done_callback(_on_finished)
+        return job
+
     def read_session(self, path: str | Path) -> None:
         """Read a session file and open the session."""
         fp = Path(path)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from functools import partial
 from pathlib import Path
 from typing import Generic, TYPE_CHECKING, Iterator, TypeVar
 from collections.abc import Sequence
@@ -8,8 +9,29 @@ import weakref
 
 from psygnal import Signal
 from himena._descriptors import LocalReaderMethod
-from himena.io import get_readers
-from himena.types import NewWidgetBehavior, WidgetDataModel, WindowState, WindowRect
+from himena.io import (
+    get_readers,
+    _copy_value,
+    _estimate_nbytes,
+    _model_cache_key,
+    _model_from_chunks,
+    _read_and_update_source,
+    _MODEL_CACHE,
+)
+from himena.types import (
+    NewWidgetBehavior,
+    ReaderChunk,
+    ReaderMetadata,
+    WidgetDataModel,
+    WindowState,
+    WindowRect,
+)
+from himena.widgets._jobs import (
+    ExecutorType,
+    JobHandle,
+    run_tasks,
+    _call_in_main_thread,
+)
 from himena.widgets._wrapper import _HasMainWindowRef, SubWindow, DockWidget
 
 if TYPE_CHECKING:
@@ -70,7 +92,11 @@ class TabArea(SemiMutableSequence[SubWindow[_W]], _HasMainWindowRef[_W]):
 
     def __delitem__(self, index_or_name: int | str) -> None:
         index = self._norm_index_or_name(index_or_name)
-        return self._main_window()._del_widget_at(self._i_tab, index)
+        sub_window = self[index]
+        self._main_window()._del_widget_at(self._i_tab, index)
+        # emitted here, as windows are removed in many ways
+        sub_window.closed.emit()
+        return None
 
     def _norm_index_or_name(self, index_or_name: int | str) -> int:
         if isinstance(index_or_name, str):
@@ -212,19 +238,209 @@ class TabArea(SemiMutableSequence[SubWindow[_W]], _HasMainWindowRef[_W]):
 
     def read_file(self, file_path: str | Path | list[str | Path]) -> SubWindow[_W]:
         """Read local file(s) and open as a new sub-window in this tab."""
-        if hasattr(file_path, "__iter__") and not isinstance(file_path, (str, Path)):
-            fp = [Path(f) for f in file_path]
-        else:
-            fp = Path(file_path)
+        fp = _norm_file_path(file_path)
         readers = get_readers(fp)
         reader = readers[0]
-        model = reader.read(fp)._with_source(source=fp, plugin=reader.plugin)
+        model = _read_and_update_source(reader, fp)
         out = self.add_data_model(model)
         main = self._main_window()._himena_main_window
         main._recent_manager.append_recent_files([fp])
         main._recent_manager.update_menu()
         return out
 
+    def read_file_async(
+        self,
+        file_path: str | Path | list[str | Path],
+        *,
+        executor: ExecutorType = "thread",
+    ) -> JobHandle[WidgetDataModel]:
+        """
+        Read local file(s) in a worker and open as a new sub-window in this tab.
+
+        A placeholder sub-window is shown while the file is being read, which will be
+        replaced by the actual widget when reading is finished. Closing the placeholder
+        cancels the job. If the reader function is a streaming one and the widget
+        supports `append_chunk`, the widget is shown as soon as the first chunk is
+        read and the following chunks are appended progressively.
+
+        Parameters
+        ----------
+        file_path : str, Path or list of them
+            Path(s) of the file to read.
+        executor : "thread" or "process", default "thread"
+            Type of the worker pool. The "process" pool is only available if the reader
+            function and the returned data are picklable.
+
+        Returns
+        -------
+        JobHandle
+            A future-like handle to monitor or cancel the job.
+        """
+        fp = _norm_file_path(file_path)
+        reader = get_readers(fp)[0]
+        main = self._main_window()
+        ui = main._himena_main_window
+        if isinstance(fp, list):
+            title = f"Loading {len(fp)} files"
+        else:
+            title = f"Loading {fp.name}"
+        job = JobHandle[WidgetDataModel](title, 1)
+        sub_win: SubWindow[_W] | None = None
+        collected: list[ReaderChunk] | None = None
+
+        def _swap_placeholder(model: WidgetDataModel) -> SubWindow[_W]:
+            placeholder.closed.disconnect(job.cancel)
+            i_tab, i_win = placeholder._find_me(ui)
+            if placeholder.state is WindowState.NORMAL:
+                rect = placeholder.rect
+            else:
+                rect = None
+            del ui.tabs[i_tab][i_win]
+            out = ui.tabs[i_tab].add_data_model(model)
+            if rect is not None and out.state is WindowState.NORMAL:
+                out.rect = (rect.left, rect.top, *out.rect[2:])
+            return out
+
+        def _on_chunk(chunk: ReaderChunk, metadata: ReaderMetadata) -> None:
+            nonlocal sub_win, collected
+            if job.done():
+                return None
+            if collected is not None:
+                collected.append(chunk)
+            elif sub_win is None:
+                if not hasattr(main._pick_widget_class(chunk.type), "append_chunk"):
+                    collected = [chunk]
+                    return None
+                model = _model_from_chunks([chunk], metadata)
+                sub_win = _swap_placeholder(
+                    model._with_source(source=fp, plugin=reader.plugin)
+                )
+                # closing the window stops streaming
+                sub_win.closed.connect(job.cancel)
+            else:
+                sub_win.widget.append_chunk(chunk.value)
+            return None
+
+        def _stream() -> ReaderMetadata:
+            metadata = ReaderMetadata()
+            chunks: list[ReaderChunk] = []  # chunks to be cached
+            nbytes = 0
+            stream = reader.reader(fp)
+            try:
+                for item in stream:
+                    if job.cancelled():
+                        return metadata
+                    if isinstance(item, ReaderChunk):
+                        _call_in_main_thread(main, partial(_on_chunk, item, metadata))
+                        if cache_key is not None:
+                            chunks.append(item)
+                            nbytes += _estimate_nbytes(item.value)
+                            if not _MODEL_CACHE.can_hold(nbytes):
+                                chunks.clear()
+                    elif isinstance(item, ReaderMetadata):
+                        metadata = item
+                    else:
+                        raise TypeError(f"Streaming reader yielded {item!r}.")
+            finally:
+                stream.close()
+            if chunks:
+                if len(chunks) == 1:
+                    # the value of the only chunk is shared with the widget
+                    chunks = [chunks[0]._replace(value=_copy_value(chunks[0].value))]
+                model = _model_from_chunks(chunks, metadata)
+                _MODEL_CACHE.set(
+                    cache_key, model._with_source(source=fp, plugin=reader.plugin)
+                )
+            return metadata
+
+        def _on_result(_, out: WidgetDataModel | ReaderMetadata) -> None:
+            if isinstance(out, WidgetDataModel):
+                _swap_placeholder(out)
+            elif collected is not None:
+                model = _model_from_chunks(collected, out)
+                _swap_placeholder(model._with_source(source=fp, plugin=reader.plugin))
+            elif sub_win is None:
+                raise ValueError(f"Reader {reader.reader!r} did not yield any chunk.")
+            else:
+                sub_win.closed.disconnect(job.cancel)
+                if out.title is not None:
+                    sub_win.title = out.title
+                if hasattr(sub_win.widget, "set_modified"):
+                    sub_win.widget.set_modified(False)
+            ui._recent_manager.append_recent_files([fp])
+            ui._recent_manager.update_menu()
+
+        def _on_done(_):
+            # remove the placeholder if reading failed or cancelled
+            if any(win is placeholder for win in ui.iter_windows()):
+                i_tab, i_win = placeholder._find_me(ui)
+                del ui.tabs[i_tab][i_win]
+
+        cache_key = _model_cache_key(reader, fp)
+        if (
+            reader.is_streaming()
+            and executor == "thread"
+            and not _MODEL_CACHE.contains(cache_key)
+        ):
+            task = (_stream, ())
+        else:
+            task = (_read_and_update_source, (reader, fp))
+        run_tasks(main, [task], _on_result, executor=executor, job=job)
+        placeholder = self.add_widget(main._loading_placeholder(job), title=title)
+        placeholder.closed.connect(job.cancel)
+        job.add_done_callback(_on_done)
+        return job
+
+    def read_files_async(
+        self,
+        file_paths: list[str | Path],
+        *,
+        executor: ExecutorType = "thread",
+    ) -> JobHandle[WidgetDataModel]:
+        """
+        Read local files in parallel and open each of them as a new sub-window.
+
+        Files are read in a bounded pool of workers. Sub-windows are added in the order
+        of `file_paths` as soon as the file and all the preceding ones are read.
+
+        Parameters
+        ----------
+        file_paths : list of str or Path
+            Paths of the files to read.
+        executor : "thread" or "process", default "thread"
+            Type of the worker pool. The "process" pool is only available if the reader
+            functions and the returned data are picklable.
+
+        Returns
+        -------
+        JobHandle
+            A future-like handle to monitor or cancel the job.
+        """
+        fps = [Path(f) for f in file_paths]
+        tasks = [(_read_and_update_source, (get_readers(fp)[0], fp)) for fp in fps]
+        opened: list[Path] = []
+
+        def _on_result(index: int, model: WidgetDataModel) -> None:
+            self.add_data_model(model)
+            opened.append(fps[index])
+
+        def _on_done(_):
+            if opened:
+                main = self._main_window()._himena_main_window
+                main._recent_manager.append_recent_files(opened)
+                main._recent_manager.update_menu()
+
+        job = run_tasks(
+            self._main_window(),
+            tasks,
+            _on_result,
+            title=f"Opening {len(fps)} files",
+            executor=executor,
+            fail_fast=False,
+        )
+        job.add_done_callback(_on_done)
+        return job
+
     def save_session(self, file_path: str | Path) -> None:
         """Save the current session to a file."""
         from himena.session import TabSession
@@ -265,6 +481,12 @@ class TabArea(SemiMutableSequence[SubWindow[_W]], _HasMainWindowRef[_W]):
         return None
 
 
+def _norm_file_path(file_path: str | Path | list[str | Path]) -> Path | list[Path]:
+    if hasattr(file_path, "__iter__") and not isinstance(file_path, (str, Path)):
+        return [Path(f) for f in file_path]
+    return Path(file_path)
+
+
 def _norm_nrows_ncols(nrows: int | None, ncols: int | None, n: int) -> tuple[int, int]:
     if nrows is None:
         if ncols is None:
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Generic, TYPE_CHECKING, TypeVar
+from typing import Any, Generic, TYPE_CHECKING, TypeVar
 from uuid import uuid4
 import weakref
 
@@ -70,6 +70,32 @@ class WidgetWrapper(_HasMainWindowRef[_W]):
             self.widget.set_modified(False)
         return None
 
+    def _begin_save(self) -> Any:
+        """
+        Called when the model of the widget starts being saved in a worker.
+
+        Widgets that implement `begin_save` and `end_save` track the edits made during
+        the save, so that only the content that was written is marked as saved.
+        `end_save` is called with the returned state and the saved path, or None if
+        the save failed.
+        """
+        if callable(begin_save := getattr(self.widget, "begin_save", None)):
+            return begin_save()
+        return None
+
+    def _end_save(self, state: Any, path: Path | None) -> None:
+        """Called when the save finished, with None as `path` if it failed."""
+        if (widget := self._widget()) is None:
+            return None
+        if not callable(end_save := getattr(widget, "end_save", None)):
+            if path is not None:
+                self.update_default_save_path(path)
+            return None
+        if path is not None:
+            self._save_behavior = SaveToPath(path=Path(path), ask_overwrite=True)
+        end_save(state, path)
+        return None
+
     def _update_widget_data_model_method(self, method: MethodDescriptor) -> None:
         """Update the method descriptor of the widget."""
         self._widget_data_model_method = method
@@ -0,0 +1,309 @@
+import threading
+import time
+import numpy as np
+import pytest
+from himena.builtins.qt.widgets import QDefaultImageView
+from himena.types import WidgetDataModel
+
+
+def _image_view(qtbot, value) -> QDefaultImageView:
+    widget = QDefaultImageView.from_model(WidgetDataModel(value=value, type="image"))
+    qtbot.addWidget(widget)
+    return widget
+
+
+def test_stack_contrast_limits(qtbot):
+    arr = np.stack([np.full((20, 20), i, dtype=np.float32) for i in range(10)])
+    arr[0, 0, 0] = np.nan
+    widget = _image_view(qtbot, arr)
+    # limits of the whole stack are estimated in a worker
+    qtbot.waitUntil(lambda: widget.contrast_limits()[1] > 8)
+    lo, hi = widget.contrast_limits()
+    assert lo < 1
+    plane = widget.as_image_array(arr[5])
+    assert plane.dtype == np.uint8
+    assert plane[0, 0] == plane[1, 1] == int((5 - lo) / (hi - lo) * 255)
+    assert widget.as_image_array(arr[0])[0, 0] == 0  # NaN
+
+    widget.set_contrast_limits((0, 9))
+    assert widget.as_image_array(arr[9])[0, 0] == 255
+    with pytest.raises(ValueError):
+        widget.set_contrast_limits((1, 1))
+
+
+def test_lut_rendering(qtbot):
+    arr = np.array([[0, 1000, 2000, 65535]], dtype=np.uint16)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((1000, 2000))
+    assert widget.as_image_array(arr).tolist() == [[0, 0, 255, 255]]
+    arr = np.array([[-100, 0, 100]], dtype=np.int16)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((-100, 100))
+    assert widget.as_image_array(arr).tolist() == [[0, 127, 255]]
+    widget = _image_view(qtbot, np.zeros((2, 4, 4), dtype=np.uint8))
+    assert widget.contrast_limits() is None
+
+
+def test_grayscale16_rendering(qtbot):
+    from qtpy import QtGui
+    from himena.builtins.qt.widgets.image import _array_to_qimage
+
+    # 16-bit images are shown as 16-bit grayscale images with any contrast limits
+    arr = np.array([[0, 1000, 1500, 2000, 65535]], dtype=np.uint16)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((1000, 2000))
+    rendered = widget._render_slice(arr, widget.contrast_limits())
+    assert rendered.dtype == np.uint16
+    assert rendered.tolist() == [[0, 0, 32767, 65535, 65535]]
+    img = _array_to_qimage(rendered)
+    assert img.format() == QtGui.QImage.Format.Format_Grayscale16
+    arr = np.array([[-100, 0, 100]], dtype=np.int16)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((-100, 100))
+    assert widget._render_slice(arr, (-100, 100)).tolist() == [[0, 32767, 65535]]
+
+
+def test_qimage_shares_buffer(qtbot):
+    from qtpy import QtGui
+    from himena.builtins.qt.widgets.image import _array_to_qimage
+
+    fmt = QtGui.QImage.Format
+    gray = np.arange(15, dtype=np.uint8).reshape(3, 5)
+    for arr, format in [
+        (gray, fmt.Format_Grayscale8),
+        (gray.astype(np.uint16) * 1000, fmt.Format_Grayscale16),
+        (np.zeros((3, 5, 3), dtype=np.uint8), fmt.Format_RGB888),
+        (np.zeros((3, 5, 4), dtype=np.uint8), fmt.Format_RGBA8888),
+    ]:
+        img = _array_to_qimage(arr)
+        assert img.format() == format
+        assert (img.width(), img.height()) == (5, 3)
+        assert int(img.constBits()) == arr.ctypes.data  # not copied
+    assert _array_to_qimage(gray).pixelColor(4, 2).red() == 14
+    # only non-contiguous arrays are copied
+    img = _array_to_qimage(gray[:, ::2])
+    assert img.pixelColor(1, 1).red() == 7
+    with pytest.raises(ValueError):
+        _array_to_qimage(np.zeros((3, 5), dtype=np.float32))
+
+    # 16-bit images are shown as they are with the full range
+    arr = np.arange(2 * 4 * 4, dtype=np.uint16).reshape(2, 4, 4)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((0, 65535))
+    assert widget._get_slice((1,)).dtype == np.uint16
+
+
+def test_qimage_without_grayscale16(qtbot, monkeypatch):
+    from himena.builtins.qt.widgets import image as _image
+
+    monkeypatch.setattr(_image, "_HAS_GRAYSCALE16", False)
+    with pytest.raises(ValueError):
+        _image._array_to_qimage(np.zeros((3, 5), dtype=np.uint16))
+    # 16-bit images are rendered to 8-bit by the lookup table
+    arr = np.arange(2 * 4 * 4, dtype=np.uint16).reshape(2, 4, 4) * 4000
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((0, 65535))
+    rendered = widget._get_slice((1,))
+    assert rendered.dtype == np.uint8
+    np.testing.assert_array_equal(rendered, widget.as_image_array(arr[1]))
+
+
+def test_slice_cache_and_prefetch(qtbot):
+    arr = np.arange(10 * 4 * 5, dtype=np.uint16).reshape(10, 4, 5)
+    widget = _image_view(qtbot, arr)
+    widget.set_contrast_limits((0, 199))
+    cache = widget._slice_cache
+    limits = widget.contrast_limits()
+    widget._sliders[0].setValue(1)
+    # slices ahead in the direction of motion are rendered in a worker
+    qtbot.waitUntil(lambda: cache.contains(((5,), limits)))
+    assert not cache.contains(((6,), limits))
+    hits = cache._hits
+    widget._sliders[0].setValue(3)
+    assert cache._hits == hits + 1
+    rendered = widget._get_slice((3,))
+    assert rendered.dtype == np.uint16
+    np.testing.assert_allclose(rendered, arr[3] / 199 * 65535, atol=1)
+    # cached slices depend on the contrast limits
+    widget.set_contrast_limits((0, 70))
+    assert widget._get_slice((3,)).max() == 65535
+
+    small = _image_view(qtbot, arr)
+    small._slice_cache._max_bytes = 100
+    for i in range(5):
+        small._get_slice((i,))
+    assert len(small._slice_cache._data) == 2
+
+
+class _OutOfCoreArray:
+    """Array-like object that records the indexed planes."""
+
+    def __init__(self, arr: np.ndarray, delay: float = 0.0):
+        self._arr = arr
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+        self.delay = delay
+        self.keys = []
+        self.threads = []
+
+    def __getitem__(self, key):
+        import time
+
+        time.sleep(self.delay)
+        self.keys.append(key)
+        self.threads.append(threading.get_ident())
+        return self._arr[key]
+
+
+def test_out_of_core_array(qtbot):
+    arr = np.arange(6 * 4 * 5, dtype=np.uint8).reshape(6, 4, 5)
+    lazy = _OutOfCoreArray(arr)
+    widget = _image_view(qtbot, lazy)
+    assert widget.to_model().raw_value is lazy
+    assert lazy.keys == [(0,)]
+    lazy.delay = 0.3
+    widget._sliders[0].setValue(5)
+    qtbot.waitUntil(lambda: not widget._loading_label.isHidden())
+    qtbot.waitUntil(widget._loading_label.isHidden)
+    # only planes are indexed
+    assert all(isinstance(key, tuple) and len(key) == 1 for key in lazy.keys)
+    assert widget._slice_cache.contains(((5,), None))
+
+
+def test_out_of_core_array_latest_slice(qtbot, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from himena.builtins.qt.widgets import image as _image
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(_image, "get_executor", lambda _: executor)
+    arr = np.arange(6 * 4 * 5, dtype=np.uint8).reshape(6, 4, 5)
+    lazy = _OutOfCoreArray(arr, delay=0.2)
+    widget = _image_view(qtbot, lazy)
+    lazy.keys.clear()
+    # requests of slices that are not loaded yet are dropped
+    for i in range(1, 5):
+        widget._load_generation += 1
+        widget._load_slice(((i,), None))
+    qtbot.waitUntil(lambda: widget._slice_cache.contains(((4,), None)))
+    executor.shutdown(wait=True)
+    assert lazy.keys[-1] == (4,)
+    assert (2,) not in lazy.keys and (3,) not in lazy.keys
+
+
+def test_tiled_image_view(qtbot, monkeypatch):
+    from himena.builtins.qt.widgets import image as _image
+
+    monkeypatch.setattr(_image, "_TILED_MIN_PIXELS", 100 * 100)
+    monkeypatch.setattr(_image, "_TILE_SIZE", 64)
+    monkeypatch.setattr(_image, "_PYRAMID_STRIP_ROWS", 128)
+    arr = np.random.default_rng(0).integers(0, 4000, (2, 600, 1000), dtype=np.uint16)
+    lazy = _OutOfCoreArray(arr)
+    widget = _image_view(qtbot, lazy)
+    view = widget._image_label
+    assert isinstance(view, _image.QTiledImageView)
+    assert view.image_shape() == (600, 1000) and view.nlevels() == 5
+    assert view.level_for_scale(1.5) == 0
+    assert view.level_for_scale(0.3) == 1
+    assert view.level_for_scale(0.01) == 4
+    # only the visible tiles are indexed
+    qtbot.waitUntil(widget._contrast_future.done)
+    lazy.keys.clear()
+    np.testing.assert_array_equal(
+        view.tile(0, 1, 2), widget.as_image_array(arr[0, 64:128, 128:192])
+    )
+    assert lazy.keys == [(0, slice(64, 128), slice(128, 192))]
+    # the pyramid is built in a worker once a downsampled level is shown
+    assert view._levels == {}
+    widget.resize(300, 300)
+    widget.show()
+    qtbot.waitExposed(widget)
+    qtbot.waitUntil(lambda: sorted(view._levels) == [1, 2, 3, 4])
+    assert view._levels[2].shape == (150, 250)
+    lazy.keys.clear()
+    view._tiles.clear()
+    view.viewport().grab()
+    # the image fits in the view, so the tiles come from the pyramid
+    scale = view.transform().m11()
+    level = view.level_for_scale(scale)
+    assert level > 0
+    assert lazy.keys == []
+    assert {key[1] for key in view._tiles._data} == {level}
+    tiles_per_side = 300 / (64 * scale * 2**level) + 1
+    assert 0 < len(view._tiles._data) <= tiles_per_side**2
+
+    widget._sliders[0].setValue(1)
+    qtbot.waitUntil(lambda: 1 in view._levels)
+    assert view._source.shape == (600, 1000)
+    # the levels of the planes shown before are reused
+    widget._sliders[0].setValue(0)
+    assert sorted(view._levels) == [1, 2, 3, 4]
+
+    # the pyramid is not built while the plane keeps changing
+    widget = _image_view(qtbot, _OutOfCoreArray(arr))
+    view = widget._image_label
+    widget.resize(300, 300)
+    widget.show()
+    qtbot.waitExposed(widget)
+    for i in range(6):
+        widget._sliders[0].setValue(i % 2)
+        view.viewport().grab()
+        qtbot.wait(_image._PYRAMID_DELAY_MS // 3)
+    assert view._future is None and view._levels == {}
+    qtbot.waitUntil(lambda: sorted(view._levels) == [1, 2, 3, 4])
+
+
+def test_tiled_image_view_paints_in_worker(qtbot, monkeypatch):
+    from himena.builtins.qt.widgets import image as _image
+
+    monkeypatch.setattr(_image, "_TILED_MIN_PIXELS", 100 * 100)
+    monkeypatch.setattr(_image, "_TILE_SIZE", 64)
+    arr = np.random.default_rng(0).integers(0, 4000, (600, 1000), dtype=np.uint16)
+    lazy = _OutOfCoreArray(arr)
+    widget = _image_view(qtbot, lazy)
+    view = widget._image_label
+    widget.resize(300, 300)
+    widget.show()
+    qtbot.waitExposed(widget)
+    view.resetTransform()  # tiles of level 0 are read from the source
+    lazy.threads.clear()
+    view.viewport().grab()
+    assert len(view._tile_futures) > 0
+    qtbot.waitUntil(lambda: not view._tile_futures)
+    view.viewport().grab()
+    assert len(lazy.threads) > 0
+    assert threading.get_ident() not in lazy.threads
+    assert any(key[1] == 0 for key in view._tiles._data)
+
+
+def test_playback(qtbot):
+    arr = np.arange(30 * 4 * 5, dtype=np.uint16).reshape(2, 15, 4, 5)
+    widget = _image_view(qtbot, arr)
+    widget._fps_spin_box.setValue(50)
+    widget._play_buttons[1].setChecked(True)
+    assert widget.is_playing()
+    assert not widget._fps_label.isHidden()
+    qtbot.waitUntil(lambda: widget._sliders[1].value() > 3)
+    assert widget._sliders[0].value() == 0
+    # playing another axis stops the current one
+    widget._play_buttons[0].setChecked(True)
+    assert widget._playback.axis == 0
+    assert not widget._play_buttons[1].isChecked()
+    widget._play_buttons[0].setChecked(False)
+    assert not widget.is_playing()
+    assert widget._fps_label.isHidden()
+
+    # frames that cannot be rendered in time are dropped
+    lazy = _OutOfCoreArray(np.zeros((100, 4, 5), dtype=np.uint8), delay=0.05)
+    widget = _image_view(qtbot, lazy)
+    widget._fps_spin_box.setValue(100)
+    shown = []
+    widget._sliders[0].valueChanged.connect(shown.append)
+    widget.play(0)
+    qtbot.wait(1000)
+    playback = widget._playback
+    widget.stop()
+    assert len(shown) > 3
+    assert any(b - a > 1 for a, b in zip(shown, shown[1:]))
+    # the shown frame keeps up with the clock
+    assert playback.frame_at(time.perf_counter()) - playback.shown < 30
+    assert 0 < playback.achieved_fps() < 50
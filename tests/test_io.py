@@ -0,0 +1,537 @@
+import sys
+from pathlib import Path
+import pytest
+from qtpy.QtCore import Qt
+from himena import io
+from himena.io import (
+    get_readers,
+    get_writers,
+    register_reader_provider,
+    register_writer_provider,
+    reader_cache_info,
+    writer_cache_info,
+)
+from himena.types import LazyValue, WidgetDataModel
+
+@pytest.fixture
+def isolated_readers(monkeypatch):
+    monkeypatch.setattr(io, "_READER_PROVIDERS", [])
+    monkeypatch.setattr(io, "_READER_PROVIDER_INDEX", io._ReaderProviderIndex())
+    monkeypatch.setattr(io, "_WRITER_PROVIDERS", [])
+    monkeypatch.setattr(io, "_READER_CACHE", io._ResolutionCache())
+    monkeypatch.setattr(io, "_WRITER_CACHE", io._ResolutionCache())
+    monkeypatch.setattr(io, "_MODEL_CACHE", io._ModelCache(max_bytes=1000))
+
+def _reader(path):
+    raise NotImplementedError
+
+def _read_text_bytes(path):
+    return WidgetDataModel(value=path.read_bytes(), type="bytes")
+
+def provide_text_bytes(path):
+    return _read_text_bytes
+
+def test_suffix_index(isolated_readers):
+    called = []
+
+    @register_reader_provider(suffixes=[".abc", ".tar.gz", "SPECIAL", "*_meta.json"])
+    def declared(path):
+        called.append(path)
+        return _reader
+
+    assert len(get_readers(Path("x.abc"))) == 1
+    assert len(get_readers(Path("X.ABC"))) == 1
+    assert len(get_readers(Path("x.tar.gz"))) == 1
+    assert len(get_readers(Path("SPECIAL"))) == 1
+    assert len(get_readers(Path("run_meta.json"))) == 1
+    assert len(get_readers([Path("a.abc"), Path("b.abc")])) == 1
+    assert len(called) == 5  # "X.ABC" is resolved from cache
+    assert get_readers(Path("x.txt"), empty_ok=True) == []
+    assert get_readers([Path("a.abc"), Path("b.txt")], empty_ok=True) == []
+    assert len(called) == 5
+    with pytest.raises(ValueError):
+        get_readers(Path("x.def"))
+
+def test_undeclared_fallback(isolated_readers):
+    def _reader_declared(path):
+        raise NotImplementedError
+
+    @register_reader_provider(priority=1, suffixes=".abc")
+    def declared(path):
+        return _reader_declared
+
+    @register_reader_provider
+    def undeclared(path):
+        return _reader
+
+    assert [r.reader for r in get_readers(Path("x.abc"))] == [_reader_declared]
+    assert [r.reader for r in get_readers(Path("x.def"))] == [_reader]
+
+def test_reader_cache(isolated_readers):
+    called = []
+
+    @register_reader_provider
+    def provider(path):
+        called.append(path)
+        if path.suffix == ".abc":
+            return _reader
+
+    for i in range(5):
+        get_readers(Path(f"{i}.abc"))
+    assert len(called) == 1
+    assert reader_cache_info().hits == 4
+    assert reader_cache_info().misses == 1
+    get_readers(Path("x.def"), empty_ok=True)
+    get_readers(Path("y.def"), empty_ok=True)
+    assert len(called) == 2
+    get_readers([Path("a.abc"), Path("b.abc")], empty_ok=True)
+    assert len(called) == 3
+
+    @register_reader_provider(priority=1)
+    def provider_new(path):
+        return _reader
+
+    get_readers(Path("z.abc"))
+    assert len(called) == 4  # invalidated by registration
+
+def test_writer_cache(isolated_readers):
+    import numpy as np
+
+    called = []
+
+    def _writer(model, path):
+        raise NotImplementedError
+
+    @register_writer_provider
+    def provider(model: WidgetDataModel):
+        called.append(model)
+        if model.type == "text":
+            return _writer
+
+    assert get_writers(WidgetDataModel(value="a", type="text")) == [_writer]
+    assert get_writers(WidgetDataModel(value="b", type="text")) == [_writer]
+    assert len(called) == 1
+    assert get_writers(WidgetDataModel(value=1, type="text")) == [_writer]
+    assert len(called) == 2
+    with pytest.raises(ValueError):
+        get_writers(WidgetDataModel(value="a", type="table"))
+    assert writer_cache_info().hits == 1
+
+    # lazy values are not loaded to resolve writers
+    written = []
+
+    def typed_provider(model):
+        return lambda model, path: written.append(model.value)
+
+    io._WRITER_PROVIDERS.append((io.TypedWriterProvider(typed_provider, str), 1))
+    lazy = LazyValue(lambda: "lazy", value_type=str)
+    model = WidgetDataModel(value=lazy, type="text")
+    writer = get_writers(model)[0]
+    assert not lazy.is_loaded()
+    writer(model, Path("x.txt"))
+    assert written == ["lazy"]
+    model = WidgetDataModel(value=LazyValue(lambda: 1, value_type=str), type="text")
+    with pytest.raises(TypeError):
+        get_writers(model)[0](model, Path("x.txt"))
+    # typed writers are not chosen for lazy values of other or unknown types
+    for lazy in [
+        LazyValue(lambda: np.zeros((2, 2)), shape=(2, 2), dtype=np.float64),
+        LazyValue(lambda: "lazy"),
+    ]:
+        model = WidgetDataModel(value=lazy, type="text")
+        assert get_writers(model) == [_writer]
+        assert not lazy.is_loaded()
+
+def test_sniff(isolated_readers, tmpdir):
+    def _reader_png(path):
+        raise NotImplementedError
+
+    def _reader_pdf(path):
+        raise NotImplementedError
+
+    @register_reader_provider(suffixes=".dat", sniff=lambda h: h.startswith(b"\x89PNG"))
+    def png(path):
+        return _reader_png
+
+    @register_reader_provider(suffixes=".dat", sniff=lambda h: h.startswith(b"%PDF"))
+    def pdf(path):
+        return _reader_pdf
+
+    io._read_header_cached.cache_clear()
+    png_path = Path(tmpdir) / "x.dat"
+    png_path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 10000)
+    pdf_path = Path(tmpdir) / "y.dat"
+    pdf_path.write_bytes(b"%PDF-1.7\n")
+    assert [r.reader for r in get_readers(png_path)] == [_reader_png]
+    assert [r.reader for r in get_readers(pdf_path)] == [_reader_pdf]
+    assert [r.reader for r in get_readers(png_path)] == [_reader_png]
+    # one header read per file, no matter how many sniffers are registered
+    assert io._read_header_cached.cache_info().misses == 2
+    assert len(io.read_header(png_path)) == io.HEADER_SIZE
+    assert get_readers([png_path, pdf_path], empty_ok=True) == []
+
+def test_model_cache(isolated_readers, tmpdir):
+    import os
+
+    register_reader_provider(provide_text_bytes, suffixes=".bin")
+    path = Path(tmpdir) / "x.bin"
+    path.write_bytes(b"abc")
+    reader = get_readers(path)[0]
+    model0 = io._read_and_update_source(reader, path)
+    model1 = io._read_and_update_source(reader, path)
+    assert model1.value is model0.value
+    assert io.model_cache_info().hits == 1
+
+    # modification invalidates the cache
+    path.write_bytes(b"abcd")
+    os.utime(path, ns=(0, 10**9))
+    assert io._read_and_update_source(reader, path).value == b"abcd"
+
+    # evicted by the memory budget
+    big = Path(tmpdir) / "big.bin"
+    big.write_bytes(b"x" * 960)
+    io._read_and_update_source(reader, big)
+    assert io.model_cache_info().currsize == 1
+    io.set_model_cache_size(0)
+    assert io.model_cache_info().currsize == 0
+    model2 = io._read_and_update_source(reader, path)
+    assert io.model_cache_info().currsize == 0
+    assert model2.value == b"abcd"
+
+
+def _read_lazy(path):
+    import numpy as np
+
+    value = LazyValue(lambda: np.zeros(100, dtype=np.uint8))
+    return WidgetDataModel(value=value, type="array")
+
+def provide_lazy(path):
+    return _read_lazy
+
+def _read_array(path):
+    import numpy as np
+
+    return WidgetDataModel(value=np.zeros(3), type="array")
+
+def provide_array(path):
+    return _read_array
+
+def test_model_cache_values(isolated_readers, tmpdir):
+    import numpy as np
+
+    register_reader_provider(provide_lazy, suffixes=".lazy")
+    register_reader_provider(provide_array, suffixes=".arr")
+    lazy_path, arr_path = Path(tmpdir) / "x.lazy", Path(tmpdir) / "x.arr"
+    lazy_path.write_bytes(b"")
+    arr_path.write_bytes(b"")
+    lazy_reader, arr_reader = get_readers(lazy_path)[0], get_readers(arr_path)[0]
+
+    # cached values are copied on hits
+    io._read_and_update_source(arr_reader, arr_path).value[0] = 1
+    io._read_and_update_source(arr_reader, arr_path).value[1] = 1
+    assert io._read_and_update_source(arr_reader, arr_path).value.tolist() == [0, 0, 0]
+
+    # lazy values are measured again after they are loaded
+    model = io._read_and_update_source(lazy_reader, lazy_path)
+    nbytes = io.model_cache_info().nbytes
+    assert model.value.size == 100
+    assert io.model_cache_info().nbytes == nbytes - sys.getsizeof(model.raw_value) + 100
+    io._read_and_update_source(lazy_reader, lazy_path).value.fill(1)
+    assert io._read_and_update_source(lazy_reader, lazy_path).value.sum() == 0
+
+def test_chunk_buffer():
+    import numpy as np
+
+    buffer = io._ChunkBuffer()
+    first = np.arange(4)
+    arr = buffer.append(first, np.arange(4, 6))
+    data = buffer._data
+    arr = buffer.append(arr, np.arange(6, 8))
+    assert buffer._data is data  # extended in place
+    assert arr.tolist() == list(range(8))
+    assert first.tolist() == list(range(4))
+    # appending to an older array does not overwrite the rows of the last one
+    other = buffer.append(arr[:6], [-1])
+    assert other.tolist() == [0, 1, 2, 3, 4, 5, -1]
+    assert arr.tolist() == list(range(8))
+    arr = buffer.append(other, [0.5])
+    assert arr.dtype.kind == "f"
+    arr = buffer.append(np.array(["a"]), np.array([True]))
+    assert arr.tolist() == ["a", "True"]
+
+
+def test_npy_npz(ui, tmpdir):
+    import numpy as np
+
+    stack = np.arange(3 * 4 * 5, dtype=np.uint16).reshape(3, 4, 5)
+    np.save(Path(tmpdir) / "stack.npy", stack)
+    win = ui.read_file(Path(tmpdir) / "stack.npy")
+    assert win.model_type() == "image"
+    assert not win.widget._arr.flags.owndata  # view of the memory-mapped file
+    win.widget._sliders[0].setValue(2)
+
+    np.savez(Path(tmpdir) / "columns.npz", x=np.arange(4), y=np.arange(4) * 0.5)
+    win = ui.read_file(Path(tmpdir) / "columns.npz")
+    assert win.model_type() == "table"
+    assert win.widget.model().rowCount() == 4
+    assert win.widget.model().headerData(1, Qt.Orientation.Horizontal) == "y"
+    assert win.widget.model().cell_text(3, 1) == "1.5"
+
+    np.savez(Path(tmpdir) / "single.npz", stack)
+    win = ui.read_file(Path(tmpdir) / "single.npz")
+    assert win.model_type() == "image"
+
+    # writers
+    model = ui.tabs[0][0].to_model()
+    for ext in [".npy", ".npz"]:
+        path = Path(tmpdir) / f"out{ext}"
+        get_writers(model)[0](model, path)
+        out = ui.read_file(path).to_model().value
+        np.testing.assert_array_equal(out, stack)
+    model = WidgetDataModel(
+        value={"x": np.arange(3), "y": np.array(["a", "b", "c"])}, type="table"
+    )
+    get_writers(model)[0](model, Path(tmpdir) / "table.npy")
+    table = np.load(Path(tmpdir) / "table.npy")
+    assert table.dtype.names == ("x", "y")
+    get_writers(model)[0](model, Path(tmpdir) / "table.csv")
+    assert (Path(tmpdir) / "table.csv").read_text().splitlines()[:2] == ["x,y", "0,a"]
+
+def test_columnar_csv(ui, tmpdir, monkeypatch):
+    import numpy as np
+    from himena.builtins import io as _io
+    from himena.types import TableMeta
+
+    monkeypatch.setattr(_io, "_TABLE_CHUNK_ROWS", 2)
+    path = Path(tmpdir) / "table.csv"
+    path.write_text(
+        "id,score,name,flag\n1,0.5,a,True\n2,,b,False\n3,2.0,c,True\n4,3.5,\"d,e\",False\n"
+    )
+    model = io.get_readers(path)[0].read(path)
+    assert isinstance(model.additional_data, TableMeta)
+    assert model.additional_data.header
+    value = model.value
+    assert list(value) == ["id", "score", "name", "flag"]
+    assert value["id"].dtype == np.int64
+    np.testing.assert_array_equal(value["score"], [0.5, np.nan, 2, 3.5])
+    assert value["name"].tolist() == ["a", "b", "c", "d,e"]
+    assert value["flag"].tolist() == [True, False, True, False]
+
+    win = ui.read_file(path)
+    assert win.widget.model().headerData(2, Qt.Orientation.Horizontal) == "name"
+    assert win.widget.model().cell_text(3, 2) == "d,e"
+    out = Path(tmpdir) / "out.csv"
+    get_writers(model)[0](model, out)
+    assert out.read_text() == path.read_text()
+
+    # table without header
+    path.write_text("1,2\n3,4\n5\n")
+    model = io.get_readers(path)[0].read(path)
+    assert not model.additional_data.header
+    assert model.value["0"].tolist() == [1, 3, 5]
+    assert model.value["1"].tolist() == ["2", "4", ""]
+
+def test_csv_round_trip(ui, tmpdir, monkeypatch):
+    import numpy as np
+    from himena.builtins import io as _io
+
+    monkeypatch.setattr(_io, "_TABLE_CHUNK_ROWS", 2)
+    path = Path(tmpdir) / "table.csv"
+    out = Path(tmpdir) / "out.csv"
+    for text in [
+        "foo,1,2.5\nbar,,3.0\nbaz,3,\n",
+        "x,y,z\n007,1,true\n8,1.5,false\n9,nan,True\n",
+        "x,y\n1,0.5\n2,1.0\n3,a\n4,\n",
+        "x,y\n0.10,1e3\n\n2,\"a\n\nb\"\n\n3,1E3",
+    ]:
+        path.write_text(text)
+        model = ui.read_file(path).to_model()
+        get_writers(model)[0](model, out)
+        assert out.read_text() == text
+
+    # valid numbers are parsed whatever the format is
+    path.write_text("x,y,z,w\n1,1.5,True,007\n,2.0,False,8\n\n3,1e3,True,9\n")
+    value = io.get_readers(path)[0].read(path).value
+    assert [arr.dtype.kind for arr in value.values()] == ["f", "f", "b", "i"]
+    np.testing.assert_array_equal(value["x"], [1, np.nan, 3])
+    assert value["y"].tolist() == [1.5, 2.0, 1000.0]
+    assert value["w"].tolist() == [7, 8, 9]
+
+    # only the edited rows are formatted
+    win = ui.read_file(path)
+    table = win.widget.model()
+    assert table.setData(table.index(1, 3), "10")
+    win.widget.append_rows({"x": [4.0], "y": [0.5], "z": [False], "w": [11]})
+    model = win.to_model()
+    get_writers(model)[0](model, out)
+    assert out.read_text() == (
+        "x,y,z,w\n1,1.5,True,007\n,2.0,False,10\n\n3,1e3,True,9\n4.0,0.5,False,11\n"
+    )
+
+    # the file was changed after reading
+    path.write_text("x,y,z,w\n0,0,False,0\n0,0,False,0\n0,0,False,0\n")
+    get_writers(model)[0](model, out)
+    assert out.read_text().splitlines()[1:3] == ["1.0,1.5,True,7", ",2.0,False,10"]
+
+def test_csv_read_speed(tmpdir):
+    import csv
+    import time
+    import numpy as np
+    from himena.builtins.io import _read_csv
+
+    # reading typed columns should not be slower than splitting the cells by csv
+    nrows = 200000
+    rng = np.random.default_rng(0)
+    path = Path(tmpdir) / "large.csv"
+    with open(path, "w") as f:
+        f.write("i,x,y,s\n")
+        for i, x, y in zip(
+            rng.integers(0, 10000, nrows).tolist(),
+            rng.random(nrows).tolist(),
+            np.round(rng.random(nrows) * 100, 2).tolist(),
+        ):
+            f.write(f"{i},{x!r},{y},name{i}\n")
+
+    def read_by_csv():
+        with open(path, newline="") as f:
+            return list(csv.reader(f))
+
+    def timeit(func) -> float:
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    value = io.collect_chunks(_read_csv(path)).value
+    assert [arr.dtype.kind for arr in value.values()] == ["i", "f", "f", "U"]
+    assert timeit(lambda: list(_read_csv(path))) < timeit(read_by_csv) * 1.25
+
+def test_incremental_csv_save(ui, tmpdir):
+    import numpy as np
+    from himena.io import _write_atomic
+
+    path = Path(tmpdir) / "log.csv"
+    path.write_bytes(b"t,event\r\n1,start\r\n2,run\r\n")
+    win = ui.read_file(path)
+    widget = win.widget
+    assert widget.model().changes().nrows_saved == 2
+
+    def save(path=path):
+        model = win.to_model()
+        state = win._begin_save()
+        _write_atomic(get_writers(model)[0], model, path)
+        win._end_save(state, path)
+        return model
+
+    inode = path.stat().st_ino
+    widget.append_rows({"t": np.array([3, 4]), "event": np.array(["x", "stop"])})
+    assert win.is_modified
+    model = save()
+    assert model.additional_data.changes.nrows_saved == 2
+    assert path.read_bytes() == b"t,event\r\n1,start\r\n2,run\r\n3,x\r\n4,stop\r\n"
+    assert path.stat().st_ino == inode  # appended in place
+    assert widget.model().changes().nrows_saved == 4
+
+    # editing a saved row rewrites the file
+    table = widget.model()
+    assert table.setData(table.index(1, 1), "walk")
+    assert table.setData(table.index(3, 1), "end")
+    widget.append_rows({"t": np.array([5]), "event": np.array(["y"])})
+    assert table.changes().edited_rows == [(1, 2), (3, 4)]
+    save()
+    assert path.read_text().splitlines()[2:] == ["2,walk", "3,x", "4,end", "5,y"]
+    assert path.stat().st_ino != inode
+
+    # the file was changed by another program
+    widget.append_rows({"t": np.array([6]), "event": np.array(["z"])})
+    path.write_text("t,event\n1,other\n")
+    save()
+    assert path.read_text().splitlines()[-2:] == ["5,y", "6,z"]
+
+    # saving as another existing file
+    other = Path(tmpdir) / "other.csv"
+    other.write_text("t,event\n6,z\n")  # ends with the last saved row
+    widget.append_rows({"t": np.array([7]), "event": np.array(["w"])})
+    save(other)
+    assert other.read_text() == path.read_text() + "7,w\n"
+    assert widget.model().changes().saved_file.path == other.resolve()
+
+def test_write_atomic(tmpdir):
+    import os
+    from himena.io import _write_atomic
+
+    tmpdir = Path(tmpdir)
+    model = WidgetDataModel(value="new", type="text")
+
+    def write_text(model, path):
+        path.write_text(model.value)
+
+    # the target of a symbolic link is replaced
+    target = tmpdir / "target.txt"
+    target.write_text("old")
+    link = tmpdir / "link.txt"
+    os.symlink(target, link)
+    _write_atomic(write_text, model, link)
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+
+    # writers that create a directory and additional files
+    def write_dir(model, path):
+        path.mkdir()
+        (path / "data").write_text(model.value)
+        path.with_suffix(".meta").write_text("meta")
+
+    store = tmpdir / "store.zarr"
+    store.mkdir()
+    (store / "stale").write_text("stale")
+    _write_atomic(write_dir, model, store)
+    assert sorted(p.name for p in store.iterdir()) == ["data"]
+    assert (tmpdir / "store.meta").read_text() == "meta"
+
+    # the destination is not touched if the writer failed
+    def write_fail(model, path):
+        path.write_text("partial")
+        raise OSError("failed")
+
+    with pytest.raises(OSError):
+        _write_atomic(write_fail, model, target)
+    assert target.read_text() == "new"
+    assert sorted(p.name for p in tmpdir.iterdir()) == [
+        "link.txt", "store.meta", "store.zarr", "target.txt"
+    ]
+
+def test_edit_during_background_save(ui, qtbot, tmpdir):
+    import numpy as np
+
+    path = Path(tmpdir) / "log.csv"
+    path.write_text("t,event\n1,start\n2,run\n")
+    win = ui.read_file(path)
+    table = win.widget.model()
+    assert table.setData(table.index(0, 1), "begin")
+    job = ui._save_models_async([(win, win.to_model(), path)])
+    # edited before the save finishes
+    assert table.setData(table.index(1, 1), "walk")
+    win.widget.append_rows({"t": np.array([3]), "event": np.array(["x"])})
+    qtbot.waitUntil(job.done)
+    assert path.read_text().splitlines()[1:] == ["1,begin", "2,run"]
+    assert win.is_modified
+    changes = table.changes()
+    assert (changes.nrows_saved, changes.edited_rows) == (2, [(1, 2)])
+
+    # changes are restored if the save failed
+    job = ui._save_models_async([(win, win.to_model(), Path(tmpdir) / "x" / "y.csv")])
+    assert win.is_modified
+    errors = []
+    job.add_error_callback(errors.append)
+    qtbot.waitUntil(job.done)
+    assert isinstance(errors[0], FileNotFoundError)
+    assert isinstance(job.exception(), FileNotFoundError)
+    assert win.is_modified
+    changes = table.changes()
+    assert (changes.nrows_saved, changes.edited_rows) == (2, [(1, 2)])
+    job = ui._save_models_async([(win, win.to_model(), path)])
+    qtbot.waitUntil(job.done)
+    assert not win.is_modified
+    assert path.read_text().splitlines()[1:] == ["1,begin", "2,walk", "3,x"]
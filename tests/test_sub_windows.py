@@ -156,3 +156,124 @@ def test_tile_window(ui: MainWindow):
     ui.tabs[0].tile_windows()
     ui.add_data("H", type="text")
     ui.tabs[0].tile_windows()
+
+def test_read_files_async(ui: MainWindow, sample_dir: Path, qtbot):
+    paths = [sample_dir / "text.txt", sample_dir / "json.json", sample_dir / "image.png"]
+    job = ui.read_files_async(paths)
+    qtbot.waitUntil(job.done, timeout=5000)
+    assert not job.cancelled()
+    assert job.progress == (3, 3)
+    assert ui.tabs[0].window_titles == ["text.txt", "json.json", "image.png"]
+    assert len(job.result()) == 3
+
+def test_run_tasks_error(ui: MainWindow, qtbot):
+    import time
+    import pytest
+    from himena.widgets._jobs import run_tasks
+
+    def _task(i):
+        time.sleep(0.05)
+        if i == 1:
+            raise ValueError("failed")
+        return i
+
+    # the job fails at the first error and the pending tasks are cancelled
+    tasks = [(_task, (i,)) for i in range(40)]
+    results = []
+    job = run_tasks(ui._backend_main_window, tasks, lambda i, r: results.append(r))
+    errors = []
+    job.add_error_callback(errors.append)
+    qtbot.waitUntil(job.done, timeout=5000)
+    assert isinstance(job.exception(), ValueError) and errors == [job.exception()]
+    assert any(future.cancelled() for future in job._futures)
+    with pytest.raises(ValueError):
+        job.result()
+
+    # errors in on_result are also passed to the callbacks
+    def _on_result(i, r):
+        raise RuntimeError("on_result")
+
+    job = run_tasks(ui._backend_main_window, tasks[:1], _on_result, fail_fast=False)
+    job.add_error_callback(errors.append)
+    qtbot.waitUntil(job.done, timeout=5000)
+    assert isinstance(errors[-1], RuntimeError)
+
+def test_read_files_async_cancel(ui: MainWindow, sample_dir: Path, qtbot):
+    job = ui.read_files_async([sample_dir / "text.txt"] * 20)
+    job.cancel()
+    assert job.done()
+    assert job.cancelled()
+    QApplication.processEvents()
+    assert len(ui.tabs[0]) < 20
+
+def test_read_file_async(ui: MainWindow, sample_dir: Path, qtbot):
+    job = ui.read_file_async(sample_dir / "text.txt")
+    assert ui.tabs[0].window_titles == ["Loading text.txt"]
+    done = []
+    job.add_done_callback(done.append)
+    qtbot.waitUntil(job.done, timeout=5000)
+    assert done == [job]
+    assert ui.tabs[0].window_titles == ["text.txt"]
+    assert type(ui.tabs[0][0].widget) is _qtw.QDefaultTextEdit
+
+    job = ui.read_file_async(sample_dir / "text.txt")
+    ui.tabs[0][-1]._close_me(ui)
+    assert job.cancelled()
+    QApplication.processEvents()
+    assert ui.tabs[0].window_titles == ["text.txt"]
+
+    # removing the placeholder in other ways also cancels the job
+    job = ui.read_file_async(sample_dir / "text.txt")
+    del ui.tabs[0][-1]
+    assert job.cancelled()
+    QApplication.processEvents()
+    assert ui.tabs[0].window_titles == ["text.txt"]
+    ui.add_tab("other")
+    job = ui.read_file_async(sample_dir / "text.txt")
+    del ui.tabs[-1]
+    assert job.cancelled()
+    QApplication.processEvents()
+    assert len(ui.tabs) == 1
+
+def test_read_file_async_streaming(ui: MainWindow, tmpdir, qtbot, monkeypatch):
+    from himena.builtins import io as _io
+
+    monkeypatch.setattr(_io, "_TABLE_CHUNK_ROWS", 3)
+    path = Path(tmpdir) / "table.csv"
+    path.write_text("\n".join(f"{i},{i * 2}" for i in range(10)) + "\n")
+    job = ui.read_file_async(path)
+    qtbot.waitUntil(job.done, timeout=5000)
+    QApplication.processEvents()
+    assert ui.tabs[0].window_titles == ["table.csv"]
+    widget = ui.tabs[0][0].widget
+    assert type(widget) is _qtw.QDefaultTableWidget
+    assert widget.model().rowCount() == 10
+    assert widget.model().cell_text(9, 1) == "18"
+    assert not widget.is_modified()
+
+    # synchronous reading collects all the chunks
+    win = ui.read_file(path)
+    assert win.widget.model().rowCount() == 10
+
+def test_save_async(ui: MainWindow, tmpdir, qtbot):
+    ui._instructions = ui._instructions.updated(confirm=False)
+    win0 = ui.add_data("Hello", type="text")
+    win1 = ui.add_data("World", type="text")
+    paths = iter([Path(tmpdir) / "a.txt", Path(tmpdir) / "b.txt"])
+    ui._instructions = ui._instructions.updated(
+        file_dialog_response=lambda: next(paths)
+    )
+    assert win0.is_modified and win1.is_modified
+    ui.exec_action("save-all")
+    qtbot.waitUntil(lambda: not win0.is_modified and not win1.is_modified)
+    assert (Path(tmpdir) / "a.txt").read_text() == "Hello"
+    assert (Path(tmpdir) / "b.txt").read_text() == "World"
+    assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["a.txt", "b.txt"]
+
+    # overwrite the file
+    win0.widget._main_text_edit.setPlainText("Hello!")
+    ui.tabs[0].current_index = 0
+    ui.exec_action("save")
+    qtbot.waitUntil(lambda: not win0.is_modified)
+    assert (Path(tmpdir) / "a.txt").read_text() == "Hello!"
+    assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["a.txt", "b.txt"]
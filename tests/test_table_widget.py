@@ -0,0 +1,259 @@
+import numpy as np
+from qtpy.QtCore import Qt
+from qtpy import QtWidgets as QtW
+from himena import MainWindow
+from himena.builtins.qt import widgets as _qtw
+
+
+def test_table_model_backing_data(ui: MainWindow):
+    arr = np.arange(12, dtype=np.int32).reshape(4, 3)
+    win = ui.add_data(arr, type="table")
+    widget: _qtw.QDefaultTableWidget = win.widget
+    table = widget.model()
+    assert (table.rowCount(), table.columnCount()) == (4, 3)
+    assert table.cell_text(3, 2) == "11"
+    assert widget.to_model().value is arr
+
+    # copy on write
+    assert table.setData(table.index(0, 0), "100")
+    assert not table.setData(table.index(0, 1), "x")
+    assert arr[0, 0] == 0
+    assert widget.to_model().value[0, 0] == 100
+    assert widget.is_modified()
+
+
+def test_table_model_memmap(ui: MainWindow, tmpdir, monkeypatch):
+    from pathlib import Path
+    from himena.builtins.qt.widgets import table as _table
+
+    monkeypatch.setattr(_table, "_BLOCK_ROWS", 4)
+    for i, shape in enumerate([(20,), (20, 3)]):
+        path = Path(tmpdir) / f"table{i}.npy"
+        np.save(path, np.arange(np.prod(shape)).reshape(shape) * 2)
+        arr = np.load(path, mmap_mode="r")
+        win = ui.add_data(arr, type="table")
+        table = win.widget.model()
+        first = [table.cell_text(r, 0) for r in range(20)]
+        # only the block of the edited rows is copied
+        assert table.setData(table.index(5, 0), "1")
+        data = table._data
+        assert data.value is arr and list(data._blocks) == [1]
+        assert data._blocks[1].shape[0] == 4
+        assert table.cell_text(5, 0) == "1"
+        assert data.full_column(0)[4:7].tolist() == [int(first[4]), 1, int(first[6])]
+        table.sort_by([(0, True)])
+        assert [table.cell_text(r, 0) for r in range(3)] == ["0", "1", first[1]]
+        table.sort_by([])
+        # pasting over two blocks
+        data.set_block(np.array([3, 4]), 0, [["7"], ["9"]])
+        assert sorted(data._blocks) == [0, 1]
+        assert [table.cell_text(r, 0) for r in (3, 4, 5)] == ["7", "9", "1"]
+        exported = win.to_model().value
+        assert type(exported) is np.ndarray
+        column = exported if exported.ndim == 1 else exported[:, 0]
+        assert column[3:6].tolist() == [7, 9, 1]
+        assert np.asarray(arr).reshape(20, -1)[5, 0] == int(first[5])  # not modified
+        assert table.cell_text(5, 0) == "1"
+        table.undo()
+        assert table.cell_text(5, 0) == first[5]
+
+def test_table_model_snapshot(ui: MainWindow):
+    for value in [
+        {"x": np.array([1, 2, 3])},
+        np.array([1, 2, 3]),
+        [["1"], ["2"], ["3"]],
+    ]:
+        win = ui.add_data(value, type="table")
+        table = win.widget.model()
+        assert table.setData(table.index(0, 0), "10")
+        exported = win.to_model().value
+        assert table.setData(table.index(1, 0), "20")
+        table.append_rows(exported)
+        new = ui.add_data(exported, type="table").widget.model()
+        assert [new.cell_text(i, 0) for i in range(3)] == ["10", "2", "3"]
+        assert table.cell_text(1, 0) == "20"
+        assert table.cell_text(4, 0) == "2"
+
+
+def test_table_model_columns(ui: MainWindow):
+    columns = {"a": np.array([1.5, 2.5]), "b": np.array(["x", "y"])}
+    win = ui.add_data(columns, type="table")
+    table = win.widget.model()
+    assert table.headerData(1, Qt.Orientation.Horizontal) == "b"
+    assert table.setData(table.index(1, 0), "")
+    assert table.setData(table.index(0, 1), "longer")
+    value = win.to_model().value
+    assert np.isnan(value["a"][1])
+    assert value["b"].tolist() == ["longer", "y"]
+    assert columns["b"].tolist() == ["x", "y"]
+    for i in range(3):
+        win.widget.append_chunk({"a": np.array([i]), "b": np.array(["z" * i])})
+    value = win.to_model().value
+    assert value["a"].tolist()[2:] == [0.0, 1.0, 2.0]
+    assert value["b"].tolist() == ["longer", "y", "", "z", "zz"]
+
+    win = ui.add_data([["a", "b"], ["c"]], type="table")
+    table = win.widget.model()
+    assert (table.rowCount(), table.columnCount()) == (2, 2)
+    assert table.cell_text(1, 1) == ""
+    win.widget.append_chunk([["d", "e", "f"]])
+    assert (table.rowCount(), table.columnCount()) == (3, 3)
+
+
+def test_table_fetch_more(ui: MainWindow, monkeypatch):
+    from qtpy.QtCore import QModelIndex
+    from himena.builtins.qt.widgets import table as _table
+
+    monkeypatch.setattr(_table, "_FETCH_ROWS", 10)
+    win = ui.add_data(np.arange(25), type="table")
+    widget: _qtw.QDefaultTableWidget = win.widget
+    table = widget.model()
+    assert (table.rowCount(), table.total_row_count()) == (10, 25)
+    assert table.canFetchMore(QModelIndex())
+    table.fetchMore(QModelIndex())
+    assert table.rowCount() == 20
+    assert widget.verticalScrollBar().toolTip() == "20 of 25 rows loaded"
+    widget.load_all()
+    assert table.rowCount() == 25
+    assert not table.canFetchMore(QModelIndex())
+    assert widget.verticalScrollBar().toolTip() == ""
+
+    # streamed rows only fill the first block
+    win = ui.add_data(np.arange(4), type="table")
+    win.widget.append_chunk(np.arange(20))
+    assert win.widget.model().rowCount() == 10
+    assert len(win.to_model().value) == 24
+
+
+def test_table_finder(ui: MainWindow, qtbot, monkeypatch):
+    from himena.builtins.qt.widgets import table as _table
+
+    monkeypatch.setattr(_table, "_FETCH_ROWS", 10)
+    columns = {
+        "name": np.array([f"Item{i}" for i in range(30)]),
+        "value": np.arange(30),
+    }
+    win = ui.add_data(columns, type="table")
+    widget: _qtw.QDefaultTableWidget = win.widget
+    widget._find_string()
+    finder = widget._finder_widget
+    finder.lineEdit().setText("item2")
+    # Item2, Item20, ..., Item29
+    qtbot.waitUntil(lambda: finder._count_label.text() == "1 / 11")
+    assert widget.currentIndex().row() == 2
+    finder._find_prev()
+    assert (widget.currentIndex().row(), widget.currentIndex().column()) == (29, 0)
+    assert finder._count_label.text() == "11 / 11"
+    assert widget.model().rowCount() == 30  # rows of the hit are fetched
+
+    finder._case_button.setChecked(True)
+    qtbot.waitUntil(lambda: finder._count_label.text() == "0 hits")
+    finder._regex_button.setChecked(True)
+    finder.lineEdit().setText(r"^Item\d$")
+    qtbot.waitUntil(lambda: finder._count_label.text().endswith("/ 10"))
+    finder.lineEdit().setText("(")
+    qtbot.waitUntil(lambda: finder._count_label.text() == "invalid")
+
+
+def test_table_copy_paste(ui: MainWindow):
+    from qtpy.QtCore import QItemSelection, QItemSelectionModel
+    from qtpy.QtWidgets import QApplication
+
+    columns = {
+        "a": np.arange(6),
+        "b": np.array([0.5, 1.5, 2.5, 3.5, 4.5, 5.5]),
+        "c": np.array(["p", "q", "r", "s", "t", "u"]),
+    }
+    win = ui.add_data(columns, type="table")
+    widget: _qtw.QDefaultTableWidget = win.widget
+    table = widget.model()
+    changed = []
+    table.dataChanged.connect(lambda *args: changed.append(args))
+
+    def select(*ranges):
+        selection = QItemSelection()
+        for r0, c0, r1, c1 in ranges:
+            selection.select(table.index(r0, c0), table.index(r1, c1))
+        widget.selectionModel().select(
+            selection, QItemSelectionModel.SelectionFlag.ClearAndSelect
+        )
+
+    select((0, 0, 1, 1), (4, 0, 4, 1))
+    widget._copy_to_clipboard()
+    assert QApplication.clipboard().text() == "0\t0.5\n1\t1.5\n4\t4.5"
+
+    # the cells between disjoint ranges are copied as empty cells
+    select((0, 0, 1, 0), (3, 1, 4, 2))
+    widget._copy_to_clipboard()
+    assert QApplication.clipboard().text() == "0\t\t\n1\t\t\n\t3.5\ts\n\t4.5\tt"
+
+    QApplication.clipboard().setText("10\tx\n11\tlonger\n")
+    select((2, 1, 2, 1))
+    widget._paste_from_clipboard()
+    assert len(changed) == 1
+    value = win.to_model().value
+    assert value["b"][2:4].tolist() == [10.0, 11.0]
+    assert value["c"][2:4].tolist() == ["x", "longer"]
+    assert columns["b"][2] == 2.5
+
+    # a single value fills all the selected ranges
+    QApplication.clipboard().setText("7")
+    select((0, 0, 1, 0), (5, 0, 5, 0))
+    widget._paste_from_clipboard()
+    assert win.to_model().value["a"].tolist() == [7, 7, 2, 3, 4, 7]
+
+
+def test_table_sort_filter(ui: MainWindow, monkeypatch):
+    import pytest
+
+    columns = {
+        "x": np.array([3, 1, 2, 1, 3]),
+        "y": np.array([0.5, 0.1, 0.3, 0.2, 0.4]),
+        "name": np.array(["a", "b", "c", "d", "e"]),
+    }
+    win = ui.add_data(columns, type="table")
+    widget: _qtw.QDefaultTableWidget = win.widget
+    table = widget.model()
+    assert table.rowCount() == 5
+
+    def names():
+        return [table.cell_text(r, 2) for r in range(table.rowCount())]
+
+    table.sort_by([(0, True)])
+    assert names() == ["b", "d", "c", "a", "e"]  # stable
+    table.sort_by([(0, False), (1, True)])
+    assert names() == ["e", "a", "c", "b", "d"]
+    assert table.headerData(0, Qt.Orientation.Vertical) == "5"
+    table.set_filter("x < 3 and name != 'b'")
+    assert names() == ["c", "d"]
+    with pytest.raises(ValueError):
+        table.set_filter("__import__('os')")
+    assert table.filter_expr() is None
+    table.set_filter("col[1] >= 0.3")
+    assert names() == ["e", "a", "c"]
+    with pytest.raises(ValueError):
+        table.set_filter("name > 1")
+    assert table.filter_expr() is None
+    assert table.rowCount() == 5
+
+    # errors in the dialog are shown as a message
+    messages = []
+    monkeypatch.setattr(
+        QtW.QInputDialog, "getText", lambda *_, **__: ("name > 1", True)
+    )
+    monkeypatch.setattr(
+        QtW.QMessageBox, "warning", lambda _, title, text: messages.append(text)
+    )
+    widget._filter_rows_with_dialog()
+    assert len(messages) == 1 and "name > 1" in messages[0]
+    table.set_filter("col[1] >= 0.3")
+    assert names() == ["e", "a", "c"]
+
+    # edits, copy and search go to the rows shown
+    assert table.setData(table.index(0, 2), "E")
+    assert table.to_tsv([0, 1], [2]) == "E\na"
+    assert table.find("a").tolist() == [1 * 3 + 2]
+    assert columns["name"][4] == "e"
+    widget.clear_sort_and_filter()
+    assert names() == ["a", "b", "c", "d", "E"]
+    assert win.to_model().value["x"] is columns["x"]  # never copied
@@ -0,0 +1,33 @@
+import numpy as np
+from himena.types import LazyValue, WidgetDataModel
+
+def test_lazy_value():
+    arr = np.arange(24).reshape(2, 3, 4)
+    loaded = []
+
+    def _load():
+        loaded.append(1)
+        return arr.copy()
+
+    lazy = LazyValue(_load, getitem=arr.__getitem__, shape=arr.shape, dtype=arr.dtype)
+    model = WidgetDataModel(value=lazy, type="image")
+    assert model.raw_value is lazy
+    assert lazy.ndim == 3
+    assert lazy[1].shape == (3, 4)
+    assert "LazyValue" in repr(model)
+    assert loaded == []
+    assert model.value.shape == (2, 3, 4)
+    assert model.value is model.value
+    assert loaded == [1]
+    assert lazy.is_loaded()
+
+def test_lazy_value_in_image_view(qtbot):
+    from himena.builtins.qt.widgets import QDefaultImageView
+
+    arr = np.zeros((5, 10, 10), dtype=np.uint8)
+    lazy = LazyValue(lambda: arr, getitem=arr.__getitem__, shape=arr.shape, dtype=arr.dtype)
+    widget = QDefaultImageView.from_model(WidgetDataModel(value=lazy, type="image"))
+    qtbot.addWidget(widget)
+    widget._sliders[0].setValue(3)
+    assert not lazy.is_loaded()
+    assert widget.to_model().raw_value is lazy
@@ -0,0 +1,124 @@
+import numpy as np
+from qtpy import QtCore, QtGui
+from qtpy.QtTest import QTest
+from himena import MainWindow
+from himena.builtins.qt.widgets._undo import UndoableEdit, UndoJournal
+
+
+class _ListEdit(UndoableEdit):
+    def _revert_segment(self, segment):
+        index, old = segment
+        current = self._target[index]
+        self._target[index] = old
+        return index, current
+
+    def _segment_nbytes(self, segment):
+        return 10
+
+
+def test_undo_journal():
+    values = [0, 0, 0, 0]
+    journal = UndoJournal(max_bytes=30, coalesce_seconds=0)
+    for i in range(4):
+        values[i] = i + 1
+        journal.push(_ListEdit(values, [(i, 0)]))
+    # the oldest edit was dropped
+    assert journal.nbytes == 30
+    assert journal.undo() and journal.undo() and journal.undo()
+    assert not journal.undo()
+    assert values == [1, 0, 0, 0]
+    assert journal.redo()
+    assert values == [1, 2, 0, 0]
+    values[3] = 5
+    journal.push(_ListEdit(values, [(3, 0)]))
+    assert not journal.can_redo()
+
+    # rapid edits are coalesced
+    journal = UndoJournal(coalesce_seconds=60)
+    for i in range(3):
+        values[i] = -1
+        journal.push(_ListEdit(values, [(i, 1)]))
+    assert journal.undo()
+    assert values == [1, 1, 1, 5]
+    assert not journal.can_undo()
+
+
+def test_table_undo(ui: MainWindow):
+    arr = np.zeros((1000, 100))
+    win = ui.add_data(arr, type="table")
+    table = win.widget.model()
+    table.undo_journal()._coalesce_seconds = 0
+    table.set_block(0, 0, [["1.5"] * 100] * 1000)
+    assert table.setData(table.index(0, 0), "2")
+    # only the old values are stored
+    assert table.undo_journal().nbytes < arr.nbytes * 1.1
+    assert table.undo()
+    assert table.cell_text(0, 0) == "1.5"
+    assert table.undo()
+    assert table.cell_text(999, 99) == "0.0"
+    assert not table.undo()
+    assert table.redo()
+    assert table.cell_text(999, 99) == "1.5"
+    assert arr.sum() == 0
+
+    win = ui.add_data({"a": np.array(["x", "y"])}, type="table")
+    table = win.widget.model()
+    assert table.setData(table.index(1, 0), "longer")
+    assert table.undo()
+    assert win.to_model().value["a"].tolist() == ["x", "y"]
+
+
+def test_text_undo(ui: MainWindow):
+    win = ui.add_data("hello\nworld", type="text")
+    text_edit = win.widget._main_text_edit
+    journal = text_edit.undo_journal()
+    cursor = text_edit.textCursor()
+    cursor.setPosition(5)
+    text_edit.setTextCursor(cursor)
+    QTest.keyClicks(text_edit, "abc")
+    cursor.setPosition(0)
+    cursor.setPosition(4, QtGui.QTextCursor.MoveMode.KeepAnchor)
+    text_edit.setTextCursor(cursor)
+    journal._last_push = -float("inf")
+    QTest.keyClick(text_edit, QtCore.Qt.Key.Key_Delete)
+    assert text_edit.toPlainText() == "oabc\nworld"
+    assert text_edit.document().availableUndoSteps() == 0
+    text_edit.undo()
+    assert text_edit.toPlainText() == "helloabc\nworld"
+    text_edit.undo()  # typing is coalesced
+    assert text_edit.toPlainText() == "hello\nworld"
+    text_edit.redo()
+    text_edit.redo()
+    assert text_edit.toPlainText() == "oabc\nworld"
+
+    # joining lines is recorded without changing the document again
+    changes = []
+    text_edit.document().contentsChange.connect(lambda *args: changes.append(args))
+    cursor.setPosition(5)
+    text_edit.setTextCursor(cursor)
+    journal._last_push = -float("inf")
+    QTest.keyClick(text_edit, QtCore.Qt.Key.Key_Backspace)
+    assert text_edit.toPlainText() == "oabcworld"
+    assert len(changes) == 1
+
+    # undo and redo of the context menu use the journal
+    def menu_actions():
+        menu = text_edit._context_menu(QtCore.QPoint(0, 0))
+        return {action.objectName(): action for action in menu.actions()}
+
+    actions = menu_actions()
+    assert actions["edit-undo"].isEnabled()
+    assert not actions["edit-redo"].isEnabled()
+    actions["edit-undo"].trigger()
+    assert text_edit.toPlainText() == "oabc\nworld"
+    actions = menu_actions()
+    assert actions["edit-redo"].isEnabled()
+    actions["edit-redo"].trigger()
+    assert text_edit.toPlainText() == "oabcworld"
+
+    # the text removed by other code is not known, so the edits cannot be undone
+    cursor = QtGui.QTextCursor(text_edit.document())
+    cursor.setPosition(0)
+    cursor.setPosition(1, QtGui.QTextCursor.MoveMode.KeepAnchor)
+    cursor.removeSelectedText()
+    assert not text_edit.undo_journal().can_undo()